@@ -11,6 +11,87 @@ import pandas as pd
 import json
 import os
 import shutil
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from listing_store import open_store, upsert_listings, sync_from_csv, apply_alert_events, EVENT_OWNED_COLUMNS
+import enrichment_backlog
+import failure_ledger
+import freshness_metrics
+import pdp_archive
+from zoneinfo import ZoneInfo
+from adb_backend import AdbDriver
+from command_executor import GuardedDriver, DEFAULT_DEADLINES
+from latency_model import LatencyModel
+from session_recorder import SessionRecorder
+from listing_parsing import (
+    generate_cache_key, extract_live_time, parse_alert_description,
+    extract_cache_keys_from_alerts, parse_header_texts, merge_listing_frames, HEADER_FIELDS,
+    parse_alert_events, parse_detail_texts, merge_snapshot, normalize_countdowns, PDP_DETAIL_FIELDS,
+    resolve_live_time,
+)
+
+# Startup milestones and the time budget are measured from here
+PROCESS_STARTED_AT = time.time()
+
+# =====================================================
+# COMMAND LINE
+# =====================================================
+parser = argparse.ArgumentParser(description="Scrape new 'is now Live' alerts from the dubizzle dealer app")
+parser.add_argument("--tune-profiles", action="store_true",
+                    help="Benchmark performance profiles on the current screens and save the fastest correct ones")
+parser.add_argument("--watch-notifications", action="store_true",
+                    help="Watch the notification shade for new 'is now Live' alerts instead of scrolling")
+parser.add_argument("--watch-minutes", type=float, default=60,
+                    help="How long the notification watcher runs (default: 60)")
+parser.add_argument("--watch-interval", type=float, default=5,
+                    help="Seconds between notification shade checks (default: 5)")
+parser.add_argument("--hot-top", action="store_true",
+                    help="Park at the top of Alerts and loop pull-to-refresh (for peak listing bursts)")
+parser.add_argument("--hot-minutes", type=float, default=30,
+                    help="How long hot top-of-list mode runs (default: 30)")
+parser.add_argument("--fresh", action="store_true",
+                    help="Ignore a crash checkpoint and start from the top")
+parser.add_argument("--time-budget", type=float, default=None,
+                    help="Seconds this run may use (device pool slot); the run ends cleanly before it")
+parser.add_argument("--discover-only", action="store_true",
+                    help="Tier 1: sweep the Alerts list and queue new alerts for PDP enrichment (no PDPs opened)")
+parser.add_argument("--drain-backlog", action="store_true",
+                    help="Tier 2: open PDPs for queued alerts, newest first (safe to run on several devices)")
+parser.add_argument("--backfill", action="store_true",
+                    help="Backfill older alerts: cross fully cached stretches in long strides, scrape the gaps")
+parser.add_argument("--backfill-screens", type=int, default=300,
+                    help="How many list windows a backfill looks through at most (default: 300)")
+parser.add_argument("--full-pdp", action="store_true",
+                    help="Scroll each PDP to capture fields below the fold (stops once all --pdp-fields are found)")
+parser.add_argument("--pdp-fields", default=None,
+                    help="Comma-separated fields a full PDP capture looks for (default: header + detail fields)")
+parser.add_argument("--device-timezone", default=None,
+                    help="IANA timezone the device shows live times in (default: read from the device, else this host's)")
+parser.add_argument("--record", action="store_true",
+                    help="Record every distinct screen and command timing to recordings/ (see session_recorder.py)")
+parser.add_argument("--device", default="RZ8R81C9GWH",
+                    help="Android device serial (default: galaxy A12S)")
+parser.add_argument("--appium-url", default="http://127.0.0.1:4723",
+                    help="Appium server for this device")
+parser.add_argument("--backend", choices=["appium", "adb"], default="appium",
+                    help="Driver backend: Appium server (default) or direct adb uiautomator dumps")
+parser.add_argument("--command-deadline", action="append", default=[], metavar="TYPE=SECONDS",
+                    help=f"Override a driver command deadline (types: {', '.join(DEFAULT_DEADLINES)}); repeatable")
+args = parser.parse_args()
+
+command_deadlines = {}
+for override in args.command_deadline:
+    command_type, _, seconds = override.partition("=")
+    if command_type not in DEFAULT_DEADLINES or not seconds:
+        parser.error(f"--command-deadline expects TYPE=SECONDS with TYPE in {', '.join(DEFAULT_DEADLINES)}")
+    command_deadlines[command_type] = float(seconds)
+
+if args.pdp_fields:
+    # A misspelt field is never found, so every PDP would scroll to the limit
+    unknown_fields = set(args.pdp_fields.split(",")) - set(HEADER_FIELDS + list(PDP_DETAIL_FIELDS))
+    if unknown_fields:
+        parser.error(f"--pdp-fields: unknown field(s) {', '.join(sorted(unknown_fields))} "
+                     f"(available: {', '.join(HEADER_FIELDS + list(PDP_DETAIL_FIELDS))})")
 
 # =====================================================
 # APPIUM SETUP
@@ -18,7 +99,7 @@ import shutil
 options = UiAutomator2Options()
 options.platform_name = "Android"
 #options.device_name = "94d371c9"
-options.device_name = "RZ8R81C9GWH"   # galaxy A12S
+options.device_name = args.device   # default: galaxy A12S
 options.automation_name = "UiAutomator2"
 options.app_package = "com.dubizzle.dealerapp"
 options.app_activity = "com.dubizzle.dealerapp.MainActivity"
@@ -26,6 +107,323 @@ options.no_reset = True
 options.full_reset = False
 options.auto_grant_permissions = True
 
+# =====================================================
+# PERFORMANCE PROFILES
+# =====================================================
+# UiAutomator2 settings that decide how fast find_elements / get_attribute answer.
+# Every profile lists the full set so switching never leaves a stale value behind.
+# Bump "version" whenever a profile's settings change - tuned picks saved for an
+# older version are ignored.
+PROFILE_BASE_SETTINGS = {
+    "waitForIdleTimeout": 10000,      # UiAutomator2 default
+    "ignoreUnimportantViews": False,  # compressed layout hierarchy off
+    "shouldUseCompactResponses": True,
+    "elementResponseAttributes": "",
+}
+
+PERFORMANCE_PROFILES = {
+    "baseline": {
+        "version": 1,
+        "settings": {},
+    },
+    "list_scan": {
+        "version": 1,
+        "settings": {
+            "waitForIdleTimeout": 0,
+            "ignoreUnimportantViews": True,
+        },
+    },
+    "list_scan_attrs": {
+        "version": 1,
+        "settings": {
+            "waitForIdleTimeout": 0,
+            "ignoreUnimportantViews": True,
+            "shouldUseCompactResponses": False,
+            "elementResponseAttributes": "text,content-desc",
+        },
+    },
+    "pdp_capture": {
+        "version": 1,
+        "settings": {
+            "waitForIdleTimeout": 500,  # PDP renders late, give it a short idle window
+            "ignoreUnimportantViews": True,
+        },
+    },
+    "pdp_capture_full_tree": {
+        "version": 1,
+        "settings": {
+            "waitForIdleTimeout": 500,
+        },
+    },
+}
+
+# Which profile each phase uses unless a tuned pick is saved
+PHASE_PROFILES = {
+    "list": "list_scan",
+    "pdp": "pdp_capture",
+}
+
+PROFILE_STORE_FILENAME = "performance_profile.json"
+
+# Name of the profile currently applied to the session
+active_profile = None
+
+# While True, phase switches are ignored (used when benchmarking one profile)
+profile_pinned = False
+
+
+def load_tuned_profiles():
+    """Override PHASE_PROFILES with tuned picks for this device (if still valid)"""
+    if not os.path.exists(PROFILE_STORE_FILENAME):
+        return
+    try:
+        with open(PROFILE_STORE_FILENAME, "r", encoding="utf-8") as f:
+            store = json.load(f)
+    except Exception as e:
+        print(f"⚠️ Could not read tuned profiles: {e}")
+        return
+
+    tuned = store.get(options.device_name, {}).get("phases", {})
+    for phase, pick in tuned.items():
+        profile = PERFORMANCE_PROFILES.get(pick.get("profile"))
+        if profile and profile["version"] == pick.get("version") and phase in PHASE_PROFILES:
+            PHASE_PROFILES[phase] = pick["profile"]
+            print(f"⚙️ Tuned profile for {phase}: {pick['profile']} (v{pick['version']})")
+        else:
+            print(f"⚠️ Tuned profile for {phase} is outdated, using {PHASE_PROFILES.get(phase)}")
+
+
+def apply_performance_profile(name):
+    """Apply a named profile's UiAutomator2 settings (no-op if already active)"""
+    global active_profile
+
+    if name == active_profile:
+        return True
+
+    settings = dict(PROFILE_BASE_SETTINGS)
+    settings.update(PERFORMANCE_PROFILES[name]["settings"])
+    try:
+        driver.update_settings(settings)
+        active_profile = name
+        return True
+    except Exception as e:
+        print(f"⚠️ Could not apply profile '{name}': {e}")
+        return False
+
+
+def use_phase_profile(phase):
+    """Switch the session to the profile configured for a phase ('list' or 'pdp')"""
+    if profile_pinned:
+        return True
+    return apply_performance_profile(PHASE_PROFILES[phase])
+
+# =====================================================
+# DEVICE LATENCY MODEL
+# =====================================================
+# Waits are polls against a condition instead of fixed sleeps (see latency_model.py).
+# Samples are persisted per device across runs.
+LATENCY_MODEL_FILENAME = "device_latency_model.json"
+
+# Hand-tuned waits (seconds, Galaxy A12s) used until enough samples exist
+LATENCY_DEFAULTS = {
+    "app_startup": 60.0,
+    "alerts_tab": 3.0,
+    "pdp_render": 5.0,
+    "back_navigation": 3.0,
+    "swipe_settle": 3.0,
+    "refresh": 6.0,
+    "pdp_scroll": 2.0,
+}
+
+IMPLICIT_WAIT = 7
+
+# action -> observed latencies (seconds) for this device
+latency_model = LatencyModel(LATENCY_DEFAULTS)
+
+
+def load_latency_model():
+    """Load this device's latency samples from disk"""
+    if not os.path.exists(LATENCY_MODEL_FILENAME):
+        print("📝 No latency model yet, using default waits")
+        return
+    try:
+        with open(LATENCY_MODEL_FILENAME, "r", encoding="utf-8") as f:
+            model = json.load(f)
+        latency_model.samples = model.get(options.device_name, {})
+        counts = ", ".join(f"{a}={len(s)}" for a, s in latency_model.samples.items())
+        print(f"✅ Loaded latency model for {options.device_name} ({counts})")
+    except Exception as e:
+        print(f"⚠️ Error loading latency model: {e}")
+        latency_model.samples = {}
+
+
+def save_latency_model():
+    """Persist this device's latency samples (other devices' entries are kept)"""
+    model = {}
+    if os.path.exists(LATENCY_MODEL_FILENAME):
+        try:
+            with open(LATENCY_MODEL_FILENAME, "r", encoding="utf-8") as f:
+                model = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Could not read latency model, overwriting: {e}")
+
+    model[options.device_name] = latency_model.samples
+    tmp_filename = LATENCY_MODEL_FILENAME + ".tmp"
+    with open(tmp_filename, "w", encoding="utf-8") as f:
+        json.dump(model, f)
+    os.replace(tmp_filename, LATENCY_MODEL_FILENAME)
+    print(f"💾 Latency model saved to {LATENCY_MODEL_FILENAME}")
+
+
+def wait_for(action, condition, scale=1.0, censor_on_timeout=True):
+    """Poll condition() until true or the learned deadline passes; record the latency
+    censor_on_timeout=False where "no change" is a valid result (see LatencyModel.wait_for)
+    """
+    driver.implicitly_wait(0)  # polls must not block on the implicit wait
+    try:
+        return latency_model.wait_for(action, condition, scale, censor_on_timeout)
+    finally:
+        driver.implicitly_wait(IMPLICIT_WAIT)
+
+
+# =====================================================
+# TIME BUDGET
+# =====================================================
+# With --time-budget the run spends its slot on the newest alerts first and
+# stops starting new work once the estimated cost no longer fits.
+FLUSH_RESERVE_SECONDS = 20  # kept back for the final CSV save and app shutdown
+
+# Absolute deadline for this run (None = no budget), counted from process start
+run_deadline = PROCESS_STARTED_AT + args.time_budget if args.time_budget else None
+
+
+def expected_latency(action):
+    """Typical (p50) latency for an action on this device, or the default wait"""
+    return latency_model.expected(action)
+
+
+def estimated_pdp_seconds(second_verification=True):
+    """Cost of opening, verifying, scraping and leaving one PDP"""
+    seconds = 1 + expected_latency("pdp_render") + expected_latency("back_navigation") + 2
+    if second_verification:
+        seconds += 2 + 1  # stabilization + blink re-check
+    return seconds
+
+
+def estimated_screen_seconds():
+    """Cost of one scroll step plus scanning the new screen"""
+    return 0.5 + expected_latency("swipe_settle") + 2
+
+
+def budget_remaining():
+    """Seconds left before the deadline (None without a budget)"""
+    if run_deadline is None:
+        return None
+    return run_deadline - time.time()
+
+
+def budget_allows(seconds):
+    """True if work costing `seconds` still fits before the flush reserve"""
+    remaining = budget_remaining()
+    return remaining is None or remaining - FLUSH_RESERVE_SECONDS >= seconds
+
+
+def budget_tight():
+    """Less than ~3 full PDPs left - drop the expensive second verification"""
+    return run_deadline is not None and not budget_allows(3 * estimated_pdp_seconds())
+
+
+def alerts_tab_visible():
+    """True if the Alerts tab is on screen (i.e. we are not inside a PDP)"""
+    return len(driver.find_elements(AppiumBy.ACCESSIBILITY_ID, "Alerts")) > 0
+
+
+def read_pdp_title():
+    """Title shown above the 'Ref#' line of the open PDP, or None"""
+    texts = driver.find_elements(AppiumBy.CLASS_NAME, "android.widget.TextView")
+    for i in range(len(texts)):
+        try:
+            if texts[i].text.strip().startswith("Ref") and i > 0:
+                return texts[i - 1].text.strip()
+        except:
+            continue
+    return None
+
+
+def alert_list_signature():
+    """Content-descs of the alert cards on screen, used to detect a settled/changed list
+    (compare via same_list - countdowns on the cards tick between reads)
+    """
+    cards = driver.find_elements(
+        AppiumBy.ANDROID_UIAUTOMATOR,
+        'new UiSelector().className("android.view.ViewGroup").clickable(true)'
+    )
+    signature = []
+    for card in cards:
+        try:
+            signature.append(card.get_attribute("content-desc"))
+        except:
+            continue
+    return tuple(signature)
+
+
+def same_list(signature, other):
+    """Two alert list signatures show the same cards (ticking countdowns aside)"""
+    return other is not None and normalize_countdowns(signature) == normalize_countdowns(other)
+
+
+def list_contains(signature, desc):
+    """Whether an alert list signature shows the card desc (ticking countdowns aside)"""
+    return normalize_countdowns([desc])[0] in normalize_countdowns(signature)
+
+
+def list_settled():
+    """Condition that is true once two consecutive polls see the same alert list"""
+    last = {"signature": None}
+
+    def check():
+        signature = alert_list_signature()
+        settled = bool(signature) and same_list(signature, last["signature"])
+        last["signature"] = signature
+        return settled
+
+    return check
+
+
+def list_changed_from(previous_signature):
+    """Condition that is true once the alert list differs from previous_signature"""
+    def check():
+        signature = alert_list_signature()
+        return bool(signature) and not same_list(signature, previous_signature)
+
+    return check
+
+
+# Pull-to-refresh spinner (SwipeRefreshLayout progress indicator)
+REFRESH_INDICATOR_SELECTOR = 'new UiSelector().className("android.widget.ProgressBar")'
+
+
+def refresh_indicator_visible():
+    """True while the pull-to-refresh spinner is on screen"""
+    return len(driver.find_elements(AppiumBy.ANDROID_UIAUTOMATOR, REFRESH_INDICATOR_SELECTOR)) > 0
+
+
+def refresh_finished(previous_signature):
+    """Condition that is true once the refresh spinner has come and gone, or the list changed
+    An idle refresh (nothing new) finishes when the spinner disappears, not at the deadline.
+    """
+    state = {"spinner_seen": False}
+
+    def check():
+        if refresh_indicator_visible():
+            state["spinner_seen"] = True
+            return False
+        if state["spinner_seen"]:
+            return True
+        return list_changed_from(previous_signature)()
+
+    return check
+
 
 # ENSURE APP IS READY
 
@@ -111,29 +509,66 @@ def ensure_app_ready(driver):
 # =====================================================
 # DRIVER CONNECTION
 # =====================================================
-driver = webdriver.Remote("http://127.0.0.1:4723", options=options)
-driver.implicitly_wait(7)
+UIAUTOMATOR2_SERVER_PACKAGES = ["io.appium.uiautomator2.server", "io.appium.uiautomator2.server.test"]
 
-# Ensure app is in foreground and ready to handle idle state
-if not ensure_app_ready(driver):
-    print("❌ Could not ensure app is ready, exiting...")
-    driver.quit()
-    exit(1)
+def connect_driver():
+    """Open a new session on the selected backend"""
+    if args.backend == "adb":
+        # Screen reads from one streamed uiautomator dump, gestures via adb shell input
+        return AdbDriver(serial=args.device)
+    return webdriver.Remote(args.appium_url, options=options)
 
-time.sleep(10)  # Basic initial wait
+def restart_uiautomator2_server():
+    """Kill a wedged UiAutomator2 server (or stuck uiautomator dump) on the device"""
+    adb = AdbDriver(serial=args.device)
+    if args.backend == "adb":
+        adb.shell("pkill", "-f", "uiautomator")
+    else:
+        for package in UIAUTOMATOR2_SERVER_PACKAGES:
+            adb.shell("am", "force-stop", package)
 
-print("⏳ Waiting for app to fully initialize...")
-try:
-    # Smart wait - wait up to 60 seconds for Alerts tab to appear
-    WebDriverWait(driver, 60).until(
-        EC.presence_of_element_located((AppiumBy.ACCESSIBILITY_ID, "Alerts"))
-    )
-    print("✅ App launched and ready")
-except Exception as e:
-    print(f"⚠️ App taking longer than expected: {e}")
-    print("⏳ Waiting additional 10 seconds...")
-    time.sleep(10)
-    print("✅ Continuing anyway...")
+# Created by start_session() - every helper below uses this global
+driver = None
+
+def start_session():
+    """Connect, apply settings and wait until the Alerts tab is usable
+    Returns False if the app could not be brought to a usable state.
+    """
+    global driver
+    # Every driver call gets a deadline per command type; hung calls are retried,
+    # then the UiAutomator2 server is restarted, then the session is rebuilt
+    driver = GuardedDriver(connect_driver(), rebuild_session=connect_driver,
+                           restart_server=restart_uiautomator2_server, deadlines=command_deadlines)
+    if args.record:
+        # Outermost, so recorded timings include the guard's retries and recoveries
+        driver = SessionRecorder(driver, metadata={"device": args.device, "backend": args.backend})
+        print(f"🎥 Recording session {driver.session_id}")
+    if args.backend == "adb":
+        print(f"🔌 Using adb backend ({args.device})")
+    driver.implicitly_wait(IMPLICIT_WAIT)
+    
+    # Apply the list-scanning performance profile from the first command on
+    load_tuned_profiles()
+    use_phase_profile("list")
+    
+    # Ensure app is in foreground and ready to handle idle state
+    if not ensure_app_ready(driver):
+        print("❌ Could not ensure app is ready, exiting...")
+        driver.quit()
+        return False
+    
+    load_latency_model()
+    
+    print("⏳ Waiting for app to fully initialize...")
+    # Smart wait - poll for the Alerts tab, deadline learned for this device (60s until trained)
+    if wait_for("app_startup", alerts_tab_visible):
+        print("✅ App launched and ready")
+    else:
+        print("⚠️ App taking longer than expected")
+        print("⏳ Waiting additional 10 seconds...")
+        time.sleep(10)
+        print("✅ Continuing anyway...")
+    return True
 
 # ==================================================
 # GLOBAL DATA STORE
@@ -152,12 +587,17 @@ pdp_data = {
     "auction_end_date": None,
     "live_time": None,  # NEW: capture when it went live
     "cache_key": None,  # NEW: composite key for caching
-    "scraped_at": None
+    "scraped_at": None,
+    "details": None,  # below-the-fold fields (--full-pdp)
+    "texts": None  # TextView texts the fields were parsed from (PDP archive)
 }
 
 # List to store all scraped listings
 all_listings = []
 
+# all_listings[:flushed_count] are already in the CSV / store; each flush persists only the rest
+flushed_count = 0
+
 # Set to track cache keys scraped in current run
 current_run_cache_keys = set()
 
@@ -197,101 +637,105 @@ def backup_existing_csv():
     return None
 
 # ==================================================
-# GENERATE CACHE KEY
+# STARTUP PIPELINE
 # ==================================================
-def generate_cache_key(title, live_time):
-    """Generate composite cache key from title and live time
-    Format: 2019_Lincoln_MKZ_Premiere_Tuesday_4:00PM
-    """
-    if not title or not live_time:
-        return None
-    
-    # Clean title: replace spaces with underscores, remove special chars
-    clean_title = re.sub(r'[^\w\s]', '', title.strip())  # Remove special chars
-    clean_title = re.sub(r'\s+', '_', clean_title)  # Replace spaces with underscores
-    
-    # Clean time: "Tuesday at 4:00 PM" -> "Tuesday_4:00PM"
-    clean_time = live_time.strip()
-    clean_time = clean_time.replace(' at ', '_')  # "Tuesday at 4:00 PM" -> "Tuesday_4:00 PM"
-    clean_time = clean_time.replace(' ', '')  # "Tuesday_4:00 PM" -> "Tuesday_4:00PM"
-    clean_time = clean_time.replace(':', '')  # "Tuesday_400PM" -> "Tuesday_400PM"
-    
-    return f"{clean_title}_{clean_time}"
+# Session bring-up runs on the main thread while the dedup index (CSV parse)
+# and the CSV backup run in the background; a mode starts on its first screen
+# as soon as both the Alerts tab and the dedup index are ready.
+STARTUP_TIMINGS_FILENAME = "startup_timings.jsonl"
+
+# Seconds since process start, filled in as each milestone is reached
+startup_timings = {"session_ready": None, "cache_ready": None, "backup_done": None, "first_listing": None}
+startup_tasks = {"cache": None, "backup": None}
+
+def _timed_task(milestone, func):
+    def run():
+        result = func()
+        startup_timings[milestone] = time.time() - PROCESS_STARTED_AT
+        return result
+    return run
+
+def start_startup_tasks(backup=True):
+    """Kick off the cache load (and CSV backup) on background threads"""
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup")
+    startup_tasks["cache"] = executor.submit(_timed_task("cache_ready", load_existing_cache))
+    if backup:
+        startup_tasks["backup"] = executor.submit(_timed_task("backup_done", backup_existing_csv))
+    executor.shutdown(wait=False)
+
+def startup_cache():
+    """(existing_df, existing_cache_keys) - the prefetched result the first time, a fresh load after"""
+    future, startup_tasks["cache"] = startup_tasks["cache"], None
+    if future is None:
+        return load_existing_cache()
+    if not future.done():
+        print("⏳ Waiting for the dedup index to finish loading...")
+    return future.result()
+
+def wait_for_backup():
+    """The CSV must not be rewritten before its backup copy is complete"""
+    future, startup_tasks["backup"] = startup_tasks["backup"], None
+    if future is None:
+        return
+    try:
+        future.result()
+    except Exception as e:
+        print(f"⚠️ Could not back up CSV: {e}")
+
+def record_first_listing():
+    if startup_timings["first_listing"] is None:
+        startup_timings["first_listing"] = time.time() - PROCESS_STARTED_AT
+        print(f"⏱️ Time to first listing: {startup_timings['first_listing']:.1f}s")
+
+def report_startup_timings():
+    """Print this run's startup milestones and append them to STARTUP_TIMINGS_FILENAME"""
+    print("\n⏱️ Startup: " + ", ".join(
+        f"{name.replace('_', ' ')} {seconds:.1f}s" if seconds is not None else f"{name.replace('_', ' ')} -"
+        for name, seconds in startup_timings.items()
+    ))
+    try:
+        with open(STARTUP_TIMINGS_FILENAME, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"started_at": datetime.fromtimestamp(PROCESS_STARTED_AT).isoformat(),
+                                **startup_timings}) + "\n")
+    except Exception as e:
+        print(f"⚠️ Could not save startup timings: {e}")
 
 # ==================================================
 # CAPTURE HEADER INFO
 # ==================================================
 def capture_header_info(alert_description=None):
     """Capture title, ref, location, specs, and all header details"""
+    use_phase_profile("pdp")
     try:
-        texts = driver.find_elements(AppiumBy.CLASS_NAME, "android.widget.TextView")
+        elements = driver.find_elements(AppiumBy.CLASS_NAME, "android.widget.TextView")
     except:
         return
 
-    for i in range(len(texts)):
+    # One read per TextView, then parse offline
+    texts = []
+    for element in elements:
         try:
-            txt = texts[i].text.strip()
+            texts.append(element.text)
         except:
-            continue
-
-        if not txt:
-            continue
+            texts.append(None)
 
-        # Title & Ref
-        if not pdp_data["title"] and txt.startswith("Ref") and i > 0:
-            pdp_data["ref"] = txt
-            pdp_data["title"] = texts[i - 1].text
-            print(f"   🐧Title: {pdp_data['title']}")
-            print(f"   🐧Ref: {pdp_data['ref']}")
-
-        # Location
-        if not pdp_data["location"] and txt in ["Dubai", "Abu Dhabi", "Sharjah", "Ajman", "Ras Al Khaimah", "Fujairah", "Umm Al Quwain"]:
-            pdp_data["location"] = txt
-            print(f"  📍 Location: {pdp_data['location']}")
-
-        # Mileage
-        if not pdp_data["mileage"] and "km" in txt and not txt.startswith("|"):
-            pdp_data["mileage"] = txt
-            print(f"  🚗 Mileage: {pdp_data['mileage']}")
-
-        # Specs
-        if not pdp_data["specs"] and ("GCC Specs" in txt or "American Specs" in txt or "European Specs" in txt or "others" in txt):
-            pdp_data["specs"] = txt.replace("|", "").strip()
-            print(f"   🐧Specs: {pdp_data['specs']}")
-
-        # Transmission
-        if not pdp_data["transmission"] and ("Automatic" in txt or "Manual" in txt) and "|" in txt:
-            pdp_data["transmission"] = txt.replace("|", "").strip()
-            print(f"  🐧 Transmission: {pdp_data['transmission']}")
-
-        # Engine Capacity
-        if not pdp_data["engine_capacity"] and "cc" in txt and "|" in txt:
-            pdp_data["engine_capacity"] = txt.replace("|", "").strip()
-            print(f"  🐧 Engine Capacity: {pdp_data['engine_capacity']}")
-
-        # Seller Expectation
-        if txt == "Seller Expectation" and i > 0:
-            pdp_data["seller_expectation"] = texts[i - 1].text
-            print(f"  🐧Seller Expectation: {pdp_data['seller_expectation']}")
-
-        # Current Bid
-        if txt == "Current Bid" and i > 0:
-            pdp_data["current_bid"] = texts[i - 1].text
-            print(f"  🐧Current Bid: {pdp_data['current_bid']}")
-
-        # Auction Status & End Date
-        if txt == "Auction ended" and i + 1 < len(texts):
-            pdp_data["auction_status"] = "Ended"
-            pdp_data["auction_end_date"] = texts[i + 1].text
-            print(f"  🐧Auction Status: {pdp_data['auction_status']}")
-            print(f"  🐧Auction End Date: {pdp_data['auction_end_date']}")
+    pdp_data["texts"] = texts
+    before = {name: pdp_data[name] for name in HEADER_FIELDS}
+    parse_header_texts(texts, pdp_data)
+    for name in HEADER_FIELDS:
+        if pdp_data[name] != before[name]:
+            print(f"  🐧 {name.replace('_', ' ').title()}: {pdp_data[name]}")
     
+    set_live_time_and_cache_key(alert_description)
+
+def set_live_time_and_cache_key(alert_description):
+    """Fill live_time from the alert text and derive the cache key"""
     # Extract live time from alert description
     if alert_description:
         # Extract time pattern like "Tuesday at 3:41 PM"
-        time_match = re.search(r'((?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\s+at\s+\d{1,2}:\d{2}\s+(?:AM|PM))', alert_description)
-        if time_match:
-            pdp_data["live_time"] = time_match.group(1)
+        live_time = extract_live_time(alert_description)
+        if live_time:
+            pdp_data["live_time"] = live_time
             print(f"  ⏰ Live Time: {pdp_data['live_time']}")
     
     # Generate cache key
@@ -299,6 +743,93 @@ def capture_header_info(alert_description=None):
         pdp_data["cache_key"] = generate_cache_key(pdp_data["title"], pdp_data["live_time"])
         print(f"  🔑 Cache Key: {pdp_data['cache_key']}")
 
+# ==================================================
+# FULL PDP CAPTURE
+# ==================================================
+# Header fields that every live auction shows (auction status / end date only appear once ended)
+FULL_PDP_DEFAULT_FIELDS = [
+    "title", "ref", "location", "mileage", "specs", "transmission", "engine_capacity",
+    "seller_expectation", "current_bid",
+] + list(PDP_DETAIL_FIELDS)
+
+PDP_SCROLL_STRIDE = (0.8, 0.25)  # drag from / to, fraction of screen height (overlap keeps merging safe)
+PDP_MAX_SCROLLS = 10
+
+def read_pdp_texts():
+    """TextView texts of the current PDP viewport, in screen order"""
+    texts = []
+    for element in driver.find_elements(AppiumBy.CLASS_NAME, "android.widget.TextView"):
+        try:
+            texts.append(element.text)
+        except:
+            texts.append(None)
+    return texts
+
+def settled_pdp_texts():
+    """Read the PDP until two consecutive reads agree (scroll momentum has stopped)
+    A ticking countdown does not count as movement.
+    """
+    last = {"texts": None}
+
+    def check():
+        texts = read_pdp_texts()
+        settled = last["texts"] is not None and normalize_countdowns(texts) == normalize_countdowns(last["texts"])
+        last["texts"] = texts
+        return settled
+
+    wait_for("pdp_scroll", check)
+    return last["texts"] or []
+
+def missing_pdp_fields(wanted):
+    return [name for name in wanted if not pdp_data.get(name) and not (pdp_data["details"] or {}).get(name)]
+
+def capture_full_pdp(alert_description=None):
+    """Capture header and detail fields from the whole PDP with as few scrolls as possible
+    Snapshots are merged into one de-duplicated text list; scrolling stops once every
+    wanted field is found or the page stops moving.
+    """
+    use_phase_profile("pdp")
+    wanted = args.pdp_fields.split(",") if args.pdp_fields else FULL_PDP_DEFAULT_FIELDS
+    size = driver.get_window_size()
+    
+    previous = read_pdp_texts()
+    merged = list(previous)
+    scrolls = 0
+    while True:
+        parse_header_texts(merged, pdp_data)
+        pdp_data["details"] = parse_detail_texts(merged, pdp_data["details"])
+        missing = missing_pdp_fields(wanted)
+        if not missing:
+            print(f"  ✅ All {len(wanted)} fields found after {scrolls} scroll(s)")
+            break
+        if scrolls == PDP_MAX_SCROLLS:
+            print(f"  ⚠️ Scroll limit reached, missing: {', '.join(missing)}")
+            break
+        
+        driver.swipe(
+            size["width"] // 2,
+            int(size["height"] * PDP_SCROLL_STRIDE[0]),
+            size["width"] // 2,
+            int(size["height"] * PDP_SCROLL_STRIDE[1]),
+            600
+        )
+        scrolls += 1
+        snapshot = settled_pdp_texts()
+        if merge_snapshot(merged, previous, snapshot) == 0:
+            print(f"  📄 End of page after {scrolls} scroll(s), missing: {', '.join(missing)}")
+            break
+        previous = snapshot
+    pdp_data["texts"] = merged
+    
+    for name in HEADER_FIELDS:
+        if pdp_data[name]:
+            print(f"  🐧 {name.replace('_', ' ').title()}: {pdp_data[name]}")
+    for name, value in pdp_data["details"].items():
+        if value:
+            print(f"  📋 {name.replace('_', ' ').title()}: {value}")
+    
+    set_live_time_and_cache_key(alert_description)
+
 # ==================================================
 # OPEN ALERTS TAB
 # ==================================================
@@ -311,7 +842,7 @@ def open_alerts_tab():
         try:
             print(f"  📍 Attempt {attempt}/{max_attempts}...")
             driver.find_element(AppiumBy.ACCESSIBILITY_ID, "Alerts").click()
-            time.sleep(3)
+            wait_for("alerts_tab", list_settled())
             print("✅ Alerts tab opened")
             return True
         except Exception as e:
@@ -347,7 +878,7 @@ def scroll_down_alerts():
             int(size["height"] * 0.3),
             1000
         )
-        time.sleep(3)
+        wait_for("swipe_settle", list_settled())
         
         # VERIFY we're still on alerts page (didn't accidentally open PDP)
         try:
@@ -530,21 +1061,35 @@ def scroll_to_top_alerts():
 # ==================================================
 # REFRESH ALERTS TAB
 # ==================================================
+def pull_to_refresh():
+    """Swipe down from the top and wait for the refresh to finish
+    Returns True if the list changed, False for an idle refresh (nothing new)
+    """
+    size = driver.get_window_size()
+    before = alert_list_signature()
+    # Swipe down from top to refresh
+    driver.swipe(
+        size["width"] // 2,
+        int(size["height"] * 0.3),
+        size["width"] // 2,
+        int(size["height"] * 0.7),
+        1000
+    )
+    # Refresh is complete once the spinner goes away (or the list changes).
+    # Timing out is not a slow refresh - the spinner may have gone before the
+    # first poll - so it must not be recorded as a censored sample
+    wait_for("refresh", refresh_finished(before), censor_on_timeout=False)
+    after = alert_list_signature()
+    return bool(after) and not same_list(after, before)
+
 def refresh_alerts_tab():
     """Refresh alerts tab by swiping down"""
     print("\n🔄 Refreshing Alerts tab...")
     try:
-        size = driver.get_window_size()
-        # Swipe down from top to refresh
-        driver.swipe(
-            size["width"] // 2,
-            int(size["height"] * 0.3),
-            size["width"] // 2,
-            int(size["height"] * 0.7),
-            1000
-        )
-        time.sleep(6)  # Wait for refresh to complete
-        print("✅ Alerts tab refreshed")
+        if pull_to_refresh():
+            print("✅ Alerts tab refreshed")
+        else:
+            print("✅ Alerts tab refreshed (no change in list)")
         return True
     except Exception as e:
         print(f"⚠️ Could not refresh: {e}")
@@ -553,8 +1098,14 @@ def refresh_alerts_tab():
 # ==================================================
 # GET ALL LIVE ALERTS
 # ==================================================
+# Other alert cards (outbid, auction ending, price updates, ...) seen while
+# scanning; applied to the listing store as typed events without opening PDPs
+harvested_alert_descs = []
+seen_alert_descs = set()
+
 def get_all_live_alerts():
     """Get all live alert cards with their descriptions"""
+    use_phase_profile("list")
     try:
         cards = driver.find_elements(
             AppiumBy.ANDROID_UIAUTOMATOR,
@@ -570,31 +1121,14 @@ def get_all_live_alerts():
             desc = card.get_attribute("content-desc")
             if desc and "is now Live" in desc:
                 live_alerts.append((card, desc))
+            elif desc and desc not in seen_alert_descs:
+                seen_alert_descs.add(desc)
+                harvested_alert_descs.append(desc)
         except:
             continue
     
     return live_alerts
 
-# ==================================================
-# EXTRACT CACHE KEYS FROM ALERTS
-# ==================================================
-def extract_cache_keys_from_alerts(live_alerts):
-    """Extract cache keys from alert descriptions without opening them"""
-    cache_keys = []
-    for _, alert_desc in live_alerts:
-        # Extract title (everything before "is now Live")
-        title_match = re.search(r'^(.+?)\s+is now Live', alert_desc)
-        # Extract time
-        time_match = re.search(r'((?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\s+at\s+\d{1,2}:\d{2}\s+(?:AM|PM))', alert_desc)
-        
-        if title_match and time_match:
-            title = title_match.group(1).strip()
-            live_time = time_match.group(1)
-            cache_key = generate_cache_key(title, live_time)
-            cache_keys.append((cache_key, alert_desc))
-    
-    return cache_keys
-
 # ==================================================
 # RESET PDP DATA
 # ==================================================
@@ -616,9 +1150,164 @@ def reset_pdp_data():
         "auction_end_date": None,
         "live_time": None,
         "cache_key": None,
-        "scraped_at": None
+        "scraped_at": None,
+        "details": None,
+        "texts": None
     }
 
+# ==================================================
+# CRASH-RESUMABLE RUN CHECKPOINTS
+# ==================================================
+CHECKPOINT_FILENAME = "run_checkpoint.json"
+CHECKPOINT_MAX_AGE_HOURS = 6  # older checkpoints are from another day's run - ignore
+
+# Phase 1 position, kept up to date by the scroll loop and scrape_new_alerts_on_screen
+run_progress = {
+    "active": False,
+    "scroll_count": 0,              # screen currently being processed
+    "consecutive_zero_count": 0,    # value at the start of that screen
+    "screen_fingerprint": [],       # alert descriptions visible on that screen
+    "last_alert_desc": None,        # last card a PDP was opened for
+}
+
+def save_checkpoint():
+    """Atomically write the Phase 1 position and everything scraped so far"""
+    if not run_progress["active"]:
+        return
+    
+    state = dict(run_progress)
+    state["saved_at"] = datetime.now().isoformat()
+    state["current_run_cache_keys"] = sorted(current_run_cache_keys)
+    state["all_listings"] = [
+        {**listing, "scraped_at": listing["scraped_at"].isoformat() if listing["scraped_at"] else None}
+        for listing in all_listings
+    ]
+    
+    try:
+        tmp_filename = CHECKPOINT_FILENAME + ".tmp"
+        with open(tmp_filename, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, CHECKPOINT_FILENAME)
+    except Exception as e:
+        print(f"⚠️ Could not write checkpoint: {e}")
+
+def clear_checkpoint():
+    """Remove the checkpoint once its listings are safely in the CSV"""
+    run_progress["active"] = False
+    if os.path.exists(CHECKPOINT_FILENAME):
+        os.remove(CHECKPOINT_FILENAME)
+        print("🧹 Run checkpoint cleared")
+
+def load_checkpoint():
+    """Restore listings/keys from an interrupted run; returns the checkpoint state or None"""
+    if not os.path.exists(CHECKPOINT_FILENAME):
+        return None
+    try:
+        with open(CHECKPOINT_FILENAME, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except Exception as e:
+        print(f"⚠️ Could not read checkpoint, starting fresh: {e}")
+        return None
+    
+    age_hours = (datetime.now() - datetime.fromisoformat(state["saved_at"])).total_seconds() / 3600
+    if age_hours > CHECKPOINT_MAX_AGE_HOURS:
+        print(f"⚠️ Checkpoint is {age_hours:.1f}h old, starting fresh")
+        return None
+    
+    for listing in state["all_listings"]:
+        if listing["scraped_at"]:
+            listing["scraped_at"] = datetime.fromisoformat(listing["scraped_at"])
+        all_listings.append(listing)
+    current_run_cache_keys.update(state["current_run_cache_keys"])
+    
+    print(f"♻️ Resuming interrupted run: screen #{state['scroll_count']}, "
+          f"{len(state['all_listings'])} listings recovered")
+    return state
+
+# Slow half-screen swipes back up when a fast-forward stride overshot the checkpoint
+FAST_FORWARD_MAX_BACKUPS = 4
+
+def alert_live_times(descs):
+    """Resolved live datetimes of alert card texts (cards without a live time are left out)"""
+    now = datetime.now(get_device_timezone())
+    live_times = [resolve_live_time(parse_alert_description(desc)[1], now) for desc in descs]
+    return [live_at for live_at in live_times if live_at]
+
+def fast_forward_to_checkpoint(state):
+    """Swipe down in long strides until a card from the checkpointed screen is visible
+    Each stride is shorter than one screen, so the checkpointed screen can't be skipped.
+    Cards are matched with countdowns ignored; once every visible card is older than the
+    checkpointed screen the list has gone past it, and it is approached back up slowly.
+    """
+    targets = list(state["screen_fingerprint"])
+    if state["last_alert_desc"]:
+        targets.append(state["last_alert_desc"])
+    if not targets:
+        return True
+    targets = set(normalize_countdowns(targets))
+    checkpoint_times = alert_live_times(targets)
+    oldest = min(checkpoint_times) if checkpoint_times else None
+    
+    print(f"\n⏩ Fast-forwarding to checkpoint (screen #{state['scroll_count']})...")
+    size = driver.get_window_size()
+    max_swipes = state["scroll_count"] + 5
+    
+    for swipe in range(max_swipes + 1):
+        visible = [desc for _, desc in get_all_live_alerts()]
+        if set(normalize_countdowns(visible)) & targets:
+            print(f"✅ Reached checkpoint after {swipe} swipe(s)")
+            return True
+        visible_times = alert_live_times(visible)
+        if oldest and visible_times and max(visible_times) < oldest:
+            print("⏪ Went past the checkpoint, backing up...")
+            return back_up_to_checkpoint(targets, oldest)
+        if swipe == max_swipes:
+            break
+        
+        # 70% stride, slow drag (no fling) - vs 40% in scroll_down_alerts
+        driver.swipe(
+            size["width"] // 2,
+            int(size["height"] * 0.85),
+            size["width"] // 2,
+            int(size["height"] * 0.15),
+            1000
+        )
+        wait_for("swipe_settle", list_settled())
+        if not alerts_tab_visible():
+            print("⚠️ Accidentally opened PDP during fast-forward, going back...")
+            go_back_to_alerts()
+    
+    print("⚠️ Checkpoint screen not found, continuing from here")
+    return False
+
+def back_up_to_checkpoint(targets, oldest):
+    """Swipe up slowly until a checkpointed card is visible again
+    Stops once the screen reaches cards newer than the checkpoint (the checkpoint
+    cards are gone), so Phase 1 resumes above rather than below the gap.
+    """
+    size = driver.get_window_size()
+    for backup in range(1, FAST_FORWARD_MAX_BACKUPS + 1):
+        driver.swipe(
+            size["width"] // 2,
+            int(size["height"] * 0.35),
+            size["width"] // 2,
+            int(size["height"] * 0.75),
+            1000
+        )
+        wait_for("swipe_settle", list_settled())
+        visible = [desc for _, desc in get_all_live_alerts()]
+        if set(normalize_countdowns(visible)) & targets:
+            print(f"✅ Reached checkpoint after backing up {backup} time(s)")
+            return True
+        visible_times = alert_live_times(visible)
+        if visible_times and min(visible_times) >= oldest:
+            break
+    
+    print("⚠️ Checkpoint cards are gone, continuing from just above where they were")
+    return False
+
 # ==================================================
 # SAVE CURRENT LISTING TO LIST
 # ==================================================
@@ -640,6 +1329,8 @@ def save_current_listing():
         "cache_key": pdp_data["cache_key"],
         "scraped_at": pdp_data["scraped_at"]
     }
+    if pdp_data["details"]:
+        listing_copy["details"] = json.dumps({k: v for k, v in pdp_data["details"].items() if v})
     
     all_listings.append(listing_copy)
     
@@ -648,6 +1339,10 @@ def save_current_listing():
         current_run_cache_keys.add(pdp_data["cache_key"])
     
     print(f"✅ Listing saved (Total: {len(all_listings)})")
+    record_first_listing()
+    archive_pdp_snapshot()
+    
+    save_checkpoint()
 
 # ==================================================
 # SCRAPE SINGLE PDP HEADER
@@ -661,8 +1356,12 @@ def scrape_pdp_header(alert_description):
     pdp_data["scraped_at"] = datetime.utcnow()
     
     # Capture header info
-    print("\n📊 Capturing header info...")
-    capture_header_info(alert_description)
+    if args.full_pdp:
+        print("\n📊 Capturing full PDP...")
+        capture_full_pdp(alert_description)
+    else:
+        print("\n📊 Capturing header info...")
+        capture_header_info(alert_description)
     
     # Print results
     print("\n" + "="*60)
@@ -695,7 +1394,7 @@ def go_back_to_alerts():
     print("\n⬅️ Going back to Alerts tab...")
     try:
         driver.back()
-        time.sleep(3)
+        wait_for("back_navigation", alerts_tab_visible)
         print("✅ Back to Alerts tab")
         return True
     except Exception as e:
@@ -703,36 +1402,136 @@ def go_back_to_alerts():
         return False
 
 # ==================================================
-# SAVE TO CSV
+# UPDATE INDEXED LISTING STORE
 # ==================================================
-def save_to_csv(existing_df=None):
-    """Save all listings to CSV file, merging with existing data if provided"""
-    if not all_listings:
-        print("⚠️ No new data to save")
+def update_listing_store(listings):
+    """Upsert listings flushed just now into the SQLite listing store (imports the CSV on first use).
+    Bids, expectations and statuses of listings already stored are left to the alert events.
+    """
+    try:
+        conn = open_store()
+        try:
+            if conn.execute("SELECT COUNT(*) FROM listings").fetchone()[0] == 0:
+                sync_from_csv(conn, CSV_FILENAME)
+            else:
+                changed = upsert_listings(conn, listings, preserve=EVENT_OWNED_COLUMNS)
+                print(f"🗃️ Listing store updated: {changed} new/changed")
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"⚠️ Could not update listing store: {e}")
+    apply_harvested_alert_events()
+
+def apply_harvested_alert_events():
+    """Turn the non-"Live" alert cards seen so far into typed events and apply them to the store"""
+    if not harvested_alert_descs:
         return
-    
-    # Create DataFrame from new listings
-    new_df = pd.DataFrame(all_listings)
-    
-    # Merge with existing data if provided
-    if existing_df is not None and not existing_df.empty:
-        # Combine old and new data
-        df = pd.concat([existing_df, new_df], ignore_index=True)
-        # Remove duplicates based on cache_key (keep first occurrence)
-        df = df.drop_duplicates(subset=['cache_key'], keep='first')
+    events = parse_alert_events(harvested_alert_descs)
+    del harvested_alert_descs[:]
+    typed = sum(1 for e in events if e["type"] not in ("unknown", "live"))
+    if not typed:
+        return
+    try:
+        conn = open_store()
+        try:
+            changed = apply_alert_events(conn, events)
+        finally:
+            conn.close()
+        print(f"🗞️ Alert events: {typed} harvested from the list, {changed} listing(s) updated")
+    except Exception as e:
+        print(f"⚠️ Could not apply alert events: {e}")
+
+# ==================================================
+# FRESHNESS METRICS
+# ==================================================
+device_tz = None
+
+def get_device_timezone():
+    """Timezone live times are shown in: --device-timezone, else the device's, else this host's
+    (a device on the desk shares the host's clock far more often than the app's market does)
+    """
+    global device_tz
+    if device_tz is None:
+        name = args.device_timezone
+        if not name:
+            try:
+                name = AdbDriver(serial=args.device).shell("getprop", "persist.sys.timezone").strip()
+            except Exception as e:
+                print(f"⚠️ Could not read device timezone: {e}")
+        try:
+            device_tz = ZoneInfo(name) if name else None
+        except Exception:
+            print(f"⚠️ Unknown timezone '{name}'")
+        if device_tz is None:
+            device_tz = datetime.now().astimezone().tzinfo
+            print(f"⚠️ Device timezone unknown, using this host's ({device_tz}); "
+                  f"pass --device-timezone if lags show up unresolved")
+    return device_tz
+
+def update_freshness_metrics(listings):
+    """Record go-live -> persisted lag for listings flushed just now and refresh the metrics file"""
+    new_listings = [l for l in listings if l["cache_key"]]
+    try:
+        conn = freshness_metrics.open_metrics()
+        try:
+            lags = freshness_metrics.record_persisted(conn, new_listings, get_device_timezone())
+            metrics = freshness_metrics.compute_metrics(conn)
+        finally:
+            conn.close()
+        freshness_metrics.write_metrics_file(metrics)
+    except Exception as e:
+        print(f"⚠️ Could not update freshness metrics: {e}")
+        return
+    if lags:
+        p95 = metrics["lag_p95_seconds"]
+        print(f"⏱️ Freshness: {len(lags)} listing(s), lag {min(lags) / 60:.1f}-{max(lags) / 60:.1f} min; "
+              f"rolling p95 {p95 / 60:.1f} min (SLO {metrics['slo_seconds'] / 60:.0f} min)")
+    if metrics["lag_unresolved"]:
+        print(f"⚠️ Freshness: {metrics['lag_unresolved']} listing(s) in the window with an unresolved lag "
+              f"(device timezone {get_device_timezone()})")
+
+# ==================================================
+# SAVE TO CSV
+# ==================================================
+def save_to_csv(existing_df=None):
+    """Save listings scraped since the last flush to CSV, merging with existing data if provided
+    existing_df must be the CSV as of the last flush (callers reload it after saving).
+    """
+    global flushed_count
+    pending = all_listings[flushed_count:]
+    if not pending:
+        print("⚠️ No new data to save")
+        return
+    wait_for_backup()
+    
+    # Create DataFrame from listings not flushed yet
+    new_df = pd.DataFrame(pending)
+    
+    # Merge with existing data if provided
+    if existing_df is not None and not existing_df.empty:
+        # Combine old and new data, removing duplicates based on cache_key (keep first occurrence)
+        df = merge_listing_frames(existing_df, new_df)
+        added = len(df) - len(existing_df)
         print(f"📊 Merged with existing data: {len(existing_df)} old + {len(new_df)} new = {len(df)} total")
     else:
         df = new_df
+        added = len(new_df)
     
     # Save to CSV
     df.to_csv(CSV_FILENAME, index=False, encoding='utf-8-sig')
     
+    flushed_count += len(pending)
+    
+    # Keep the indexed listing store (and its aggregates) in step
+    update_listing_store(pending)
+    update_freshness_metrics(pending)
+    
     print(f"\n{'='*60}")
     print(f"💾 DATA SAVED TO CSV")
     print(f"{'='*60}")
     print(f"📁 Filename: {CSV_FILENAME}")
     print(f"📊 Total listings: {len(df)}")
-    print(f"📋 New listings added: {len(new_df)}")
+    print(f"📋 New listings added: {added}")
     print(f"\n📝 Columns:")
     for col in df.columns:
         print(f"  *️⃣ {col}")
@@ -740,28 +1539,103 @@ def save_to_csv(existing_df=None):
     
     return CSV_FILENAME
 
+# ==================================================
+# PDP FAILURE LEDGER
+# ==================================================
+# Listings whose PDP keeps failing back off across runs, then get quarantined
+failure_ledger_db = failure_ledger.open_ledger()
+
+def record_pdp_failure(cache_key, alert_desc, reason):
+    """Record a failed PDP attempt and report when it will be tried again"""
+    try:
+        row = failure_ledger.record_failure(failure_ledger_db, cache_key, reason, alert_desc)
+    except Exception as e:
+        print(f"  ⚠️ Could not record PDP failure: {e}")
+        return
+    if row["quarantined"]:
+        print(f"  🚫 Quarantined after {row['attempts']} failures ({row['reasons']})")
+    else:
+        print(f"  ⏳ Failure #{row['attempts']} ({reason}), next try after {row['retry_after'][:16]} UTC")
+
+def record_pdp_success(cache_key):
+    """A listing that failed before scraped fine - drop it from the ledger"""
+    try:
+        failure_ledger.record_success(failure_ledger_db, cache_key)
+    except Exception as e:
+        print(f"  ⚠️ Could not update failure ledger: {e}")
+
+def blocked_cache_keys():
+    """Cache keys in backoff or quarantine - not opened this run"""
+    try:
+        return failure_ledger.blocked_keys(failure_ledger_db)
+    except Exception as e:
+        print(f"⚠️ Could not read failure ledger: {e}")
+        return set()
+
+def cache_key_blocked(cache_key):
+    """Whether one listing is in backoff or quarantine right now"""
+    try:
+        return failure_ledger.is_blocked(failure_ledger_db, cache_key)
+    except Exception as e:
+        print(f"⚠️ Could not read failure ledger: {e}")
+        return False
+
+def mark_screen(label):
+    """Label the current screen in the session recording (no-op unless --record)"""
+    if args.record:
+        try:
+            driver.mark(label)
+        except Exception as e:
+            print(f"  ⚠️ Could not record screen: {e}")
+
+# ==================================================
+# PDP SNAPSHOT ARCHIVE
+# ==================================================
+# Raw texts of every scraped PDP, so pdp_archive.py can re-extract fields offline
+pdp_archive_db, pdp_archive_blobs = pdp_archive.open_archive()
+
+def archive_pdp_snapshot():
+    """Archive the texts the current listing was parsed from under its cache key"""
+    if not pdp_data["cache_key"] or not pdp_data["texts"]:
+        return
+    try:
+        pdp_archive.archive_snapshot(pdp_archive_db, pdp_archive_blobs, pdp_data["cache_key"],
+                                     pdp_data["texts"], pdp_data["live_time"], pdp_data["scraped_at"])
+    except Exception as e:
+        print(f"  ⚠️ Could not archive PDP snapshot: {e}")
+
 # ==================================================
 # SCRAPE NEW ALERTS FROM CURRENT SCREEN
 # ==================================================
-def scrape_new_alerts_on_screen(existing_cache_keys):
+def scrape_new_alerts_on_screen(existing_cache_keys, only_keys=None):
     """
     Scrape new alerts visible on current screen
+    only_keys: if given, only these cache keys are opened (backlog draining)
     Returns: number of new alerts scraped
     """
     # Get current screen alerts
     live_alerts = get_all_live_alerts()
     print(f"📊 Found {len(live_alerts)} live alerts on screen")
     
+    # Checkpoint this screen's position before opening any PDP
+    run_progress["screen_fingerprint"] = [desc for _, desc in live_alerts]
+    save_checkpoint()
+    
     # Extract cache keys
     alert_cache_keys = extract_cache_keys_from_alerts(live_alerts)
     
     # Combined cache: CSV + current run
     combined_cache = existing_cache_keys.union(current_run_cache_keys)
+    blocked = blocked_cache_keys()
     
     # Find new alerts
     new_alerts = []
     for cache_key, alert_desc in alert_cache_keys:
-        if cache_key not in combined_cache:
+        if only_keys is not None and cache_key not in only_keys:
+            continue
+        if cache_key in blocked and cache_key not in combined_cache:
+            print(f"  🚫 Backing off (PDP failed before): {alert_desc}")
+        elif cache_key not in combined_cache:
             new_alerts.append((cache_key, alert_desc))
             print(f"  🆕 New: {alert_desc}")
         else:
@@ -773,6 +1647,12 @@ def scrape_new_alerts_on_screen(existing_cache_keys):
     alerts_scraped = 0
     if new_alerts:
         for cache_key, alert_desc in new_alerts:
+            # Under a time budget: cheap path when tight, stop before the deadline
+            skip_second_verification = budget_tight()
+            if not budget_allows(estimated_pdp_seconds(not skip_second_verification)):
+                print("\n⏰ Time budget nearly used up, leaving remaining alerts for the next run")
+                break
+            
             print(f"\n{'='*60}")
             print(f"📩 PROCESSING: {alert_desc}")
             print(f"{'='*60}")
@@ -783,6 +1663,7 @@ def scrape_new_alerts_on_screen(existing_cache_keys):
             
             # Find and click the matching alert
             found = False
+            failure_reason = None  # set when this listing's PDP fails (failure ledger)
             live_alerts = get_all_live_alerts()  # Refresh list
             
             for card, desc in live_alerts:
@@ -793,13 +1674,15 @@ def scrape_new_alerts_on_screen(existing_cache_keys):
                         time.sleep(1)
                         
                         # Click the alert
+                        use_phase_profile("pdp")
                         card.click()
-                        time.sleep(5)
+                        wait_for("pdp_render", lambda: read_pdp_title() is not None)
                         found = True
                         
                         # STEP 1: Extra stabilization delay (let PDP fully load and settle)
-                        print("  ⏳ Waiting for PDP to fully stabilize...")
-                        time.sleep(2)
+                        if not skip_second_verification:
+                            print("  ⏳ Waiting for PDP to fully stabilize...")
+                            time.sleep(2)
                         
                         # STEP 2: First title verification
                         print("  🔍 First verification - checking opened PDP...")
@@ -820,6 +1703,7 @@ def scrape_new_alerts_on_screen(existing_cache_keys):
                             #NEW: If title is None, PDP didn't load - retry click
                             if actual_title is None:
                                 print(f"  ⚠️ PDP did not load (title is None)")
+                                mark_screen("pdp_not_loaded")
                                 print(f"  🔄 Retrying click with longer wait...")
                                 
                                 # Go back first (in case we're stuck somewhere)
@@ -838,9 +1722,11 @@ def scrape_new_alerts_on_screen(existing_cache_keys):
                                         try:
                                             print("  👆 Attempting second click...")
                                             time.sleep(1)
+                                            use_phase_profile("pdp")
                                             card_retry.click()
-                                            time.sleep(7)  # Longer wait on retry
-                                            time.sleep(3)  # Extra stabilization
+                                            # Longer wait on retry
+                                            wait_for("pdp_render", lambda: read_pdp_title() is not None, scale=2)
+                                            time.sleep(1)  # Extra stabilization
                                             
                                             # Try to get title again
                                             texts_retry = driver.find_elements(AppiumBy.CLASS_NAME, "android.widget.TextView")
@@ -856,6 +1742,8 @@ def scrape_new_alerts_on_screen(existing_cache_keys):
                                                     continue
                                             
                                             if actual_title is None:
+                                                failure_reason = "pdp_not_loaded"
+                                                mark_screen(failure_reason)
                                                 print(f"  ❌ PDP still did not load after retry")
                                                 print(f"  ⬅️ Going back and skipping this listing...")
                                                 try:
@@ -874,11 +1762,14 @@ def scrape_new_alerts_on_screen(existing_cache_keys):
                                             break
                                 
                                 if not card_found or actual_title is None:
+                                    failure_reason = "pdp_not_loaded"
                                     break  # Skip to next alert in outer loop
                             
                             # Compare titles on first check (if we got a title)
                             if actual_title and expected_title:
                                 if actual_title != expected_title:
+                                    failure_reason = "wrong_pdp"
+                                    mark_screen(failure_reason)
                                     print(f"  ❌ WRONG PDP on first check!")
                                     print(f"     Expected: {expected_title}")
                                     print(f"     Got: {actual_title}")
@@ -905,43 +1796,48 @@ def scrape_new_alerts_on_screen(existing_cache_keys):
                             break  # Skip to next alert
                         
                         # STEP 3: Wait and re-verify (catch the "blink" issue)
-                        print("  🔍 Second verification - checking if PDP changed...")
-                        time.sleep(1)
+                        if skip_second_verification:
+                            print("  ⏰ Time budget tight, skipping second verification")
+                        else:
+                            print("  🔍 Second verification - checking if PDP changed...")
+                            time.sleep(1)
                         
-                        try:
-                            texts = driver.find_elements(AppiumBy.CLASS_NAME, "android.widget.TextView")
-                            actual_title_second = None
+                            try:
+                                texts = driver.find_elements(AppiumBy.CLASS_NAME, "android.widget.TextView")
+                                actual_title_second = None
                             
-                            # Find the actual title in PDP again
-                            for i in range(len(texts)):
-                                try:
-                                    txt = texts[i].text.strip()
-                                    if txt.startswith("Ref") and i > 0:
-                                        actual_title_second = texts[i - 1].text.strip()
-                                        break
-                                except:
-                                    continue
+                                # Find the actual title in PDP again
+                                for i in range(len(texts)):
+                                    try:
+                                        txt = texts[i].text.strip()
+                                        if txt.startswith("Ref") and i > 0:
+                                            actual_title_second = texts[i - 1].text.strip()
+                                            break
+                                    except:
+                                        continue
                             
-                            # Compare titles on second check
-                            if actual_title_second and expected_title:
-                                if actual_title_second != expected_title:
-                                    print(f"  ❌ PDP CHANGED after opening (blinked)!")
-                                    print(f"     Expected: {expected_title}")
-                                    print(f"     Got: {actual_title_second}")
-                                    print("  ⬅️ Going back and skipping this listing...")
-                                    go_back_to_alerts()
-                                    time.sleep(2)
-                                    break  # Skip to next alert in outer loop
+                                # Compare titles on second check
+                                if actual_title_second and expected_title:
+                                    if actual_title_second != expected_title:
+                                        failure_reason = "blink"
+                                        mark_screen(failure_reason)
+                                        print(f"  ❌ PDP CHANGED after opening (blinked)!")
+                                        print(f"     Expected: {expected_title}")
+                                        print(f"     Got: {actual_title_second}")
+                                        print("  ⬅️ Going back and skipping this listing...")
+                                        go_back_to_alerts()
+                                        time.sleep(2)
+                                        break  # Skip to next alert in outer loop
+                                    else:
+                                        print(f"  ✅ Second check passed: {actual_title_second}")
+                                        print("  ✅ PDP is stable and correct!")
                                 else:
-                                    print(f"  ✅ Second check passed: {actual_title_second}")
-                                    print("  ✅ PDP is stable and correct!")
-                            else:
-                                print(f"  ⚠️ Could not verify on second check (Expected: {expected_title}, Got: {actual_title_second})")
-                                print("  ℹ️ Proceeding with scraping anyway...")
+                                    print(f"  ⚠️ Could not verify on second check (Expected: {expected_title}, Got: {actual_title_second})")
+                                    print("  ℹ️ Proceeding with scraping anyway...")
                         
-                        except Exception as verify_error:
-                            print(f"  ⚠️ Error during second verification: {verify_error}")
-                            print("  ℹ️ Proceeding with scraping anyway...")
+                            except Exception as verify_error:
+                                print(f"  ⚠️ Error during second verification: {verify_error}")
+                                print("  ℹ️ Proceeding with scraping anyway...")
                         
                         break  # Exit the card search loop
                         
@@ -949,6 +1845,9 @@ def scrape_new_alerts_on_screen(existing_cache_keys):
                         print(f"❌ Could not click alert: {e}")
                         continue
             
+            if failure_reason:
+                record_pdp_failure(cache_key, alert_desc, failure_reason)
+            
             if not found:
                 # STEP 4: Check if we're stuck in a PDP instead of on alerts page
                 print(f"⚠️ Alert not found in list")
@@ -997,13 +1896,16 @@ def scrape_new_alerts_on_screen(existing_cache_keys):
             
             # Reset data for new listing
             reset_pdp_data()
+            run_progress["last_alert_desc"] = alert_desc
             
             # Scrape the PDP header
             try:
                 scrape_pdp_header(alert_desc)
                 alerts_scraped += 1
+                record_pdp_success(cache_key)
             except Exception as e:
                 print(f"❌ Error scraping PDP: {e}")
+                record_pdp_failure(cache_key, alert_desc, "scrape_error")
             
             # Go back to alerts tab
             if not go_back_to_alerts():
@@ -1025,11 +1927,10 @@ def run_scroll_based_scraping():
     4. Scroll to top and refresh for brand new listings
     """
     # Load existing cache
-    existing_df, existing_cache_keys = load_existing_cache()
+    existing_df, existing_cache_keys = startup_cache()
     
-    # Create backup if we have existing data
-    if not existing_df.empty:
-        backup_existing_csv()
+    # Recover an interrupted run (listings, per-run keys, position)
+    checkpoint = None if args.fresh else load_checkpoint()
     
     if not open_alerts_tab():
         return False
@@ -1043,13 +1944,28 @@ def run_scroll_based_scraping():
     consecutive_zero_count = 0  # Track consecutive screens with 0 new listings
     max_scrolls = 50  # Safety limit to prevent infinite scrolling
     
+    if checkpoint:
+        fast_forward_to_checkpoint(checkpoint)
+        # Re-scan the checkpointed screen; already scraped cards are deduped
+        scroll_count = checkpoint["scroll_count"] - 1
+        consecutive_zero_count = checkpoint["consecutive_zero_count"]
+        total_scraped = len(all_listings)
+    
+    # Under a time budget the newest alerts come first: refresh before the scroll pass
+    if run_deadline is not None and not checkpoint:
+        print(f"\n⏰ Time budget: {budget_remaining():.0f}s left, refreshing first for the newest alerts")
+        refresh_alerts_tab()
+    
     # Phase 1: Scroll and scrape
     print("\n" + "#"*60)
     print("📜 PHASE 1: SCROLL & SCRAPE")
     print("#"*60)
     
+    run_progress["active"] = True
     while scroll_count < max_scrolls and consecutive_zero_count < 2:  # Stop after 2 consecutive zeros
         scroll_count += 1
+        run_progress["scroll_count"] = scroll_count
+        run_progress["consecutive_zero_count"] = consecutive_zero_count
         print(f"\n{'='*60}")
         print(f"📄 SCREEN #{scroll_count}")
         print(f"{'='*60}")
@@ -1075,6 +1991,16 @@ def run_scroll_based_scraping():
             consecutive_zero_count = 0
             print(f"\n✅ Scraped {scraped} new listings from screen #{scroll_count}")
             print(f"✅ Resetting consecutive zero counter")
+            
+            # Under a time budget, flush every screen so an expired slot loses nothing
+            if run_deadline is not None:
+                save_to_csv(existing_df)
+                existing_df, existing_cache_keys = load_existing_cache()
+        
+        # Stop before the deadline rather than get killed mid-scroll
+        if not budget_allows(estimated_screen_seconds() + estimated_pdp_seconds(False)):
+            print(f"\n⏰ Time budget nearly used up ({budget_remaining():.0f}s left), stopping scroll pagination")
+            break
         
         # Scroll down for next batch (if not at the stopping condition)
         if consecutive_zero_count < 2 and scroll_count < max_scrolls:
@@ -1092,8 +2018,14 @@ def run_scroll_based_scraping():
         existing_df, existing_cache_keys = load_existing_cache()
     else:
         print(f"\nℹ️ No new listings scraped during scroll phase")
+    clear_checkpoint()
+    
+    # Phase 2: Scroll to top and refresh (~20s of swipes before the refresh)
+    if not budget_allows(20 + expected_latency("refresh") + estimated_pdp_seconds(False)):
+        print(f"\n⏰ Time budget nearly used up ({budget_remaining():.0f}s left), skipping Phase 2")
+        print(f"📊 Total listings scraped: {total_scraped}")
+        return True
     
-    # Phase 2: Scroll to top and refresh
     print("\n" + "#"*60)
     print("🔄 PHASE 2: REFRESH FOR NEW LISTINGS")
     print("#"*60)
@@ -1130,11 +2062,636 @@ def run_scroll_based_scraping():
     
     return True
 
+# ==================================================
+# BACKFILL FAST-FORWARD
+# ==================================================
+# Fully cached stretches are crossed in long drags without classifying cards.
+# A stride must keep the previous window's bottom card on screen, so nothing
+# between two windows is ever skipped; near a gap we drop back to normal steps.
+BACKFILL_STRIDE = (0.9, 0.15)  # drag from / to, fraction of screen height
+BACKFILL_FAST_DRAG_MS = 300
+BACKFILL_SLOW_DRAG_MS = 1000
+BACKFILL_MAX_BACKUPS = 3       # drags back up to find the anchor after an overshoot
+BACKFILL_GAP_MARGIN = 2        # normal-stepped windows after the last unknown alert
+
+def backfill_stride(anchor, fast):
+    """Drag most of a screen down the list, keeping `anchor` (previous bottom card) visible
+    Returns False if the anchor could not be brought back on screen.
+    """
+    size = driver.get_window_size()
+    driver.swipe(
+        size["width"] // 2,
+        int(size["height"] * BACKFILL_STRIDE[0]),
+        size["width"] // 2,
+        int(size["height"] * BACKFILL_STRIDE[1]),
+        BACKFILL_FAST_DRAG_MS if fast else BACKFILL_SLOW_DRAG_MS
+    )
+    wait_for("swipe_settle", list_settled())
+    
+    for _ in range(BACKFILL_MAX_BACKUPS):
+        if list_contains(alert_list_signature(), anchor):
+            return True
+        if not alerts_tab_visible():
+            print("⚠️ Accidentally opened PDP during stride, going back...")
+            go_back_to_alerts()
+            continue
+        # The drag carried the list past the anchor - back up slowly
+        driver.swipe(
+            size["width"] // 2,
+            int(size["height"] * 0.35),
+            size["width"] // 2,
+            int(size["height"] * 0.75),
+            BACKFILL_SLOW_DRAG_MS
+        )
+        wait_for("swipe_settle", list_settled())
+    return list_contains(alert_list_signature(), anchor)
+
+def run_backfill(max_screens):
+    """
+    Backfill older alerts (e.g. after downtime):
+    1. While every alert on screen is cached, stride down the list (continuity checked)
+    2. On a window with unknown alerts, scrape it and step normally for a few windows
+    3. Stop at the end of the list, after max_screens windows, or before the time budget runs out
+    """
+    existing_df, existing_cache_keys = startup_cache()
+    
+    if not open_alerts_tab():
+        return False
+    
+    print("\n" + "="*60)
+    print("⏩ BACKFILL (strides over cached alerts)")
+    print("="*60)
+    
+    start = time.time()
+    total_scraped = 0
+    screens = 0
+    strides = 0
+    gap_margin = 0
+    fast = True
+    previous_window = None
+    
+    while screens < max_screens:
+        screens += 1
+        window = extract_cache_keys_from_alerts(get_all_live_alerts())
+        descs = tuple(desc for _, desc in window)
+        if descs and same_list(descs, previous_window):
+            print(f"\n✅ Reached the end of the Alerts list at window #{screens}")
+            break
+        previous_window = descs
+        
+        combined_cache = existing_cache_keys | current_run_cache_keys | blocked_cache_keys()
+        unknown = [key for key, _ in window if key not in combined_cache]
+        if unknown:
+            print(f"\n🕳️ Gap at window #{screens}: {len(unknown)} unknown alert(s) "
+                  f"({time.time() - start:.0f}s in)")
+            scraped = scrape_new_alerts_on_screen(existing_cache_keys)
+            if scraped:
+                total_scraped += scraped
+                save_to_csv(existing_df)
+                existing_df, existing_cache_keys = load_existing_cache()
+            gap_margin = BACKFILL_GAP_MARGIN
+        elif gap_margin:
+            gap_margin -= 1
+        
+        if not budget_allows(estimated_screen_seconds()):
+            print(f"\n⏰ Time budget nearly used up ({budget_remaining():.0f}s left), stopping backfill")
+            break
+        
+        if gap_margin or not descs:
+            if not scroll_down_alerts():
+                print("⚠️ Could not scroll down, stopping")
+                break
+            continue
+        
+        strides += 1
+        if not backfill_stride(descs[-1], fast):
+            # Continuity not proven - go slower and step normally for a bit
+            print("⚠️ Lost the previous window during a stride, slowing down")
+            fast = False
+            gap_margin = BACKFILL_GAP_MARGIN
+    
+    elapsed = time.time() - start
+    print(f"\n{'='*60}")
+    print("✅ BACKFILL COMPLETE")
+    print(f"{'='*60}")
+    print(f"📊 Windows checked: {screens} ({strides} strides) in {elapsed:.0f}s")
+    print(f"📊 Listings scraped: {total_scraped}")
+    print(f"{'='*60}")
+    return True
+
+# ==================================================
+# TWO-TIER CRAWL: DISCOVERY SWEEP
+# ==================================================
+def run_discovery_sweep():
+    """
+    Tier 1: sweep the Alerts list at list speed, no PDPs:
+    1. Refresh at the top, then scroll down screen by screen
+    2. Queue every alert not in the CSV cache or backlog (title, live time, cache key)
+    3. Stop after 2 consecutive screens with nothing new
+    """
+    existing_df, existing_cache_keys = startup_cache()
+    backlog = enrichment_backlog.open_backlog()
+    known = existing_cache_keys | enrichment_backlog.known_keys(backlog)
+    sweep_id = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+    
+    if not open_alerts_tab():
+        return False
+    refresh_alerts_tab()
+    
+    print("\n" + "="*60)
+    print("🔭 DISCOVERY SWEEP (list only, PDPs queued)")
+    print("="*60)
+    
+    start = time.time()
+    queued = 0
+    position = 0
+    scroll_count = 0
+    consecutive_zero_count = 0
+    max_scrolls = 50
+    
+    while scroll_count < max_scrolls and consecutive_zero_count < 2:
+        scroll_count += 1
+        items = []
+        for cache_key, alert_desc in extract_cache_keys_from_alerts(get_all_live_alerts()):
+            if cache_key in known:
+                continue
+            title, live_time = parse_alert_description(alert_desc)
+            items.append({
+                "cache_key": cache_key,
+                "title": title,
+                "live_time": live_time,
+                "alert_desc": alert_desc,
+                "list_position": position,
+            })
+            known.add(cache_key)
+            position += 1
+        
+        added = enrichment_backlog.enqueue(backlog, items, sweep_id)
+        queued += added
+        print(f"📄 Screen #{scroll_count}: {added} new alert(s) queued")
+        
+        consecutive_zero_count = consecutive_zero_count + 1 if added == 0 else 0
+        if consecutive_zero_count < 2 and scroll_count < max_scrolls:
+            if not scroll_down_alerts():
+                print("⚠️ Could not scroll down, stopping")
+                break
+    
+    counts = enrichment_backlog.backlog_counts(backlog)
+    backlog.close()
+    
+    print(f"\n{'='*60}")
+    print("✅ DISCOVERY SWEEP COMPLETE")
+    print(f"{'='*60}")
+    print(f"📊 Screens swept: {scroll_count} in {time.time() - start:.0f}s")
+    print(f"📊 Alerts queued: {queued}")
+    print(f"📊 Backlog pending: {counts.get('pending', 0)}")
+    print(f"{'='*60}")
+    return True
+
+# ==================================================
+# TWO-TIER CRAWL: BACKLOG DRAIN
+# ==================================================
+# How far down the list a worker looks for a claimed alert before re-checking from the top
+DRAIN_MAX_SEARCH_SCREENS = 15
+DRAIN_FLUSH_EVERY = 5  # save CSV every N enriched listings
+
+def find_alert_on_list(cache_key):
+    """Scroll down until the alert with this cache key is visible; restart once from the top"""
+    for from_top in (False, True):
+        if from_top:
+            print("  🔄 Not found further down, searching again from the top...")
+            scroll_to_top_alerts()
+        for screen in range(DRAIN_MAX_SEARCH_SCREENS):
+            visible = {key for key, _ in extract_cache_keys_from_alerts(get_all_live_alerts())}
+            if cache_key in visible:
+                return True
+            if not scroll_down_alerts():
+                break
+    return False
+
+def run_backlog_drain():
+    """
+    Tier 2: enrich queued alerts, newest first:
+    claim -> find card on the list -> open & verify PDP -> mark done / failed
+    """
+    existing_df, existing_cache_keys = startup_cache()
+    backlog = enrichment_backlog.open_backlog()
+    worker = options.device_name
+    
+    if not open_alerts_tab():
+        return False
+    
+    print("\n" + "="*60)
+    print(f"🛠️ DRAINING ENRICHMENT BACKLOG (worker {worker})")
+    print("="*60)
+    
+    enriched = 0
+    failed = 0
+    unsaved = 0
+    skipped = 0
+    while True:
+        # Listings the failure ledger blocks stay pending - they are not this drain's failures
+        item = enrichment_backlog.claim_next(backlog, worker, skip=blocked_cache_keys())
+        if item is None:
+            waiting = enrichment_backlog.backlog_counts(backlog).get("pending", 0)
+            if waiting:
+                print(f"\n✅ Nothing to claim now ({waiting} item(s) waiting to retry)")
+            else:
+                print("\n✅ Backlog empty")
+            break
+        cache_key = item["cache_key"]
+        print(f"\n📥 Claimed: {item['title']} ({item['live_time']})")
+        
+        if cache_key in existing_cache_keys or cache_key in current_run_cache_keys:
+            enrichment_backlog.mark_done(backlog, cache_key)
+            continue
+        
+        if cache_key_blocked(cache_key):
+            # Blocked by another worker since the claim
+            print("  🚫 Backing off (PDP failed before), leaving it queued")
+            enrichment_backlog.release_claim(backlog, cache_key)
+            skipped += 1
+            continue
+        
+        if not find_alert_on_list(cache_key):
+            print("  ⚠️ Alert not found on the list")
+            enrichment_backlog.mark_failed(backlog, cache_key, "not found on list")
+            failed += 1
+            continue
+        
+        scrape_new_alerts_on_screen(existing_cache_keys, only_keys={cache_key})
+        if cache_key in current_run_cache_keys:
+            enrichment_backlog.mark_done(backlog, cache_key)
+            enriched += 1
+            unsaved += 1
+        else:
+            enrichment_backlog.mark_failed(backlog, cache_key, "PDP not scraped")
+            failed += 1
+        
+        if unsaved >= DRAIN_FLUSH_EVERY:
+            save_to_csv(existing_df)
+            existing_df, existing_cache_keys = load_existing_cache()
+            unsaved = 0
+    
+    if unsaved:
+        save_to_csv(existing_df)
+    backlog.close()
+    
+    print(f"\n{'='*60}")
+    print("✅ BACKLOG DRAIN COMPLETE")
+    print(f"{'='*60}")
+    print(f"📊 Enriched: {enriched}")
+    print(f"📊 Failed: {failed}")
+    if skipped:
+        print(f"📊 Left queued (backing off): {skipped}")
+    print(f"{'='*60}")
+    return True
+
+# ==================================================
+# NOTIFICATION SHADE WATCHER
+# ==================================================
+NOTIFICATION_ROW_ID = "com.android.systemui:id/expandableNotificationRow"
+
+def read_live_notifications():
+    """Open the notification shade and return [(cache_key, text)] for 'is now Live' notifications"""
+    live_notifications = []
+    try:
+        driver.open_notifications()
+        time.sleep(1)
+    except Exception as e:
+        print(f"⚠️ Could not open notifications: {e}")
+        return live_notifications
+
+    try:
+        driver.implicitly_wait(0)
+        rows = driver.find_elements(AppiumBy.ID, NOTIFICATION_ROW_ID)
+        # Title and body of one notification are separate TextViews - join them per row
+        if rows:
+            row_texts = []
+            for row in rows:
+                try:
+                    parts = [t.text for t in row.find_elements(AppiumBy.CLASS_NAME, "android.widget.TextView")]
+                    row_texts.append(" ".join(p.strip() for p in parts if p and p.strip()))
+                except:
+                    continue
+        else:
+            # Unknown shade layout - fall back to every TextView on its own
+            row_texts = [t.text for t in driver.find_elements(AppiumBy.CLASS_NAME, "android.widget.TextView")]
+
+        for text in row_texts:
+            if not text or "is now Live" not in text:
+                continue
+            title, live_time = parse_alert_description(text)
+            if title and live_time:
+                live_notifications.append((generate_cache_key(title, live_time), text))
+    except Exception as e:
+        print(f"⚠️ Could not read notifications: {e}")
+    finally:
+        driver.implicitly_wait(IMPLICIT_WAIT)
+        # Close the shade
+        try:
+            driver.back()
+            time.sleep(0.5)
+        except:
+            pass
+
+    return live_notifications
+
+
+# Refresh-and-look attempts for a notified listing that wasn't found / scraped
+NOTIFICATION_MAX_ATTEMPTS = 3
+
+def run_notification_watcher(watch_minutes, interval):
+    """
+    Watch push notifications for new listings:
+    1. Read 'is now Live' notifications from the shade (no scrolling)
+    2. Dedup against CSV cache + current run
+    3. Only when something new arrived: refresh Alerts and scrape the new PDPs
+    """
+    existing_df, existing_cache_keys = startup_cache()
+
+    if not open_alerts_tab():
+        return False
+
+    print("\n" + "="*60)
+    print(f"🔔 WATCHING NOTIFICATIONS for {watch_minutes:.0f} min (every {interval:.0f}s)")
+    print("="*60)
+
+    total_scraped = 0
+    checks = 0
+    # Notified keys not persisted yet -> times we looked for them on the Alerts list.
+    # Persisted keys drop out through the cache; the rest are retried a few times.
+    attempts = {}
+    end_time = time.time() + watch_minutes * 60
+
+    while time.time() < end_time:
+        checks += 1
+        notifications = read_live_notifications()
+        combined_cache = existing_cache_keys.union(current_run_cache_keys) | blocked_cache_keys()
+        new_keys = [(key, text) for key, text in notifications
+                    if key not in combined_cache and attempts.get(key, 0) < NOTIFICATION_MAX_ATTEMPTS]
+
+        if not new_keys:
+            time.sleep(interval)
+            continue
+
+        print(f"\n🆕 {len(new_keys)} new listing(s) from notifications (check #{checks}):")
+        for _, text in new_keys:
+            print(f"  📩 {text}")
+
+        # New alerts sit at the top of the Alerts list
+        if not alerts_tab_visible():
+            go_back_to_alerts()
+        refresh_alerts_tab()
+        notified_keys = {key for key, _ in new_keys}
+        scraped = scrape_new_alerts_on_screen(existing_cache_keys, only_keys=notified_keys)
+        total_scraped += scraped
+
+        if scraped > 0:
+            save_to_csv(existing_df)
+            existing_df, existing_cache_keys = load_existing_cache()
+
+        missed = notified_keys - existing_cache_keys - current_run_cache_keys
+        for key in missed:
+            attempts[key] = attempts.get(key, 0) + 1
+        if missed:
+            print(f"⚠️ {len(missed)} notified listing(s) not scraped yet, will retry "
+                  f"(up to {NOTIFICATION_MAX_ATTEMPTS} times)")
+
+    print(f"\n{'='*60}")
+    print("✅ NOTIFICATION WATCH COMPLETE")
+    print(f"{'='*60}")
+    print(f"📊 Notification checks: {checks}")
+    print(f"📊 Total listings scraped: {total_scraped}")
+    print(f"{'='*60}")
+
+    return True
+
+# ==================================================
+# HOT TOP-OF-LIST MODE
+# ==================================================
+# Only the first few cards can be new after a refresh - no need to look further
+HOT_TOP_CARDS = 5
+
+def new_top_alert_keys(existing_cache_keys):
+    """Cache keys of the top cards that are not in the CSV cache or current run
+    (nor backing off / quarantined in the failure ledger)
+    """
+    combined_cache = existing_cache_keys | current_run_cache_keys | blocked_cache_keys()
+    top_alerts = get_all_live_alerts()[:HOT_TOP_CARDS]
+    return [key for key, _ in extract_cache_keys_from_alerts(top_alerts) if key not in combined_cache]
+
+def run_hot_top_mode(hot_minutes):
+    """
+    Park at the top of the Alerts list during listing bursts:
+    1. Pull-to-refresh, finishing as soon as the spinner goes away (idle) or the list changes
+    2. Diff the top cards against the dedup index
+    3. Open only the new PDPs, straight away - never scroll down
+    """
+    existing_df, existing_cache_keys = startup_cache()
+
+    if not open_alerts_tab():
+        return False
+    scroll_to_top_alerts()
+
+    print("\n" + "="*60)
+    print(f"🔥 HOT TOP-OF-LIST MODE for {hot_minutes:.0f} min")
+    print("="*60)
+
+    total_scraped = 0
+    refreshes = 0
+    end_time = time.time() + hot_minutes * 60
+
+    while time.time() < end_time:
+        refreshes += 1
+        try:
+            changed = pull_to_refresh()
+        except Exception as e:
+            print(f"⚠️ Could not refresh: {e}")
+            if not alerts_tab_visible():
+                go_back_to_alerts()
+            continue
+
+        if not changed:
+            continue
+
+        new_keys = new_top_alert_keys(existing_cache_keys)
+        if not new_keys:
+            continue
+
+        print(f"\n🆕 {len(new_keys)} new listing(s) at the top after refresh #{refreshes}")
+        scraped = scrape_new_alerts_on_screen(existing_cache_keys, only_keys=set(new_keys))
+        total_scraped += scraped
+
+        if scraped > 0:
+            save_to_csv(existing_df)
+            existing_df, existing_cache_keys = load_existing_cache()
+
+        # Back navigation keeps the list position, so we are still parked at the top
+        if not alerts_tab_visible():
+            go_back_to_alerts()
+
+    print(f"\n{'='*60}")
+    print("✅ HOT TOP-OF-LIST MODE COMPLETE")
+    print(f"{'='*60}")
+    print(f"📊 Refreshes: {refreshes}")
+    print(f"📊 Total listings scraped: {total_scraped}")
+    print(f"{'='*60}")
+
+    return True
+
+# ==================================================
+# TUNE PERFORMANCE PROFILES
+# ==================================================
+def benchmark_profile(name, extract, rounds=3):
+    """Apply a profile, run extract() a few times and return (median seconds, last result)"""
+    global profile_pinned
+
+    if not apply_performance_profile(name):
+        return None, None
+
+    timings = []
+    result = None
+    profile_pinned = True
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            result = extract()
+            timings.append(time.perf_counter() - start)
+    finally:
+        profile_pinned = False
+
+    timings.sort()
+    return timings[len(timings) // 2], result
+
+
+def pick_fastest_profile(phase, candidates, extract):
+    """Benchmark candidates against 'baseline' and return the fastest one with identical output"""
+    print(f"\n⚙️ Tuning '{phase}' phase...")
+    baseline_time, expected = benchmark_profile("baseline", extract)
+    if baseline_time is None or not expected:
+        print(f"  ⚠️ Baseline produced no data on this screen, keeping {PHASE_PROFILES[phase]}")
+        return None
+    print(f"  ⏱️ baseline: {baseline_time * 1000:.0f} ms")
+
+    best_name, best_time = "baseline", baseline_time
+    for name in candidates:
+        elapsed, result = benchmark_profile(name, extract)
+        if elapsed is None:
+            continue
+        if result != expected:
+            print(f"  ❌ {name}: {elapsed * 1000:.0f} ms but extracted fields differ, rejected")
+            continue
+        print(f"  ⏱️ {name}: {elapsed * 1000:.0f} ms")
+        if elapsed < best_time:
+            best_name, best_time = name, elapsed
+
+    print(f"  🏆 Fastest correct profile for '{phase}': {best_name} ({best_time * 1000:.0f} ms)")
+    return {
+        "profile": best_name,
+        "version": PERFORMANCE_PROFILES[best_name]["version"],
+        "median_ms": round(best_time * 1000, 1),
+        "baseline_ms": round(baseline_time * 1000, 1),
+    }
+
+
+def capture_header_fields(alert_desc):
+    """Run capture_header_info on a clean pdp_data and return the extracted fields"""
+    reset_pdp_data()
+    capture_header_info(alert_desc)
+    return {k: v for k, v in pdp_data.items() if k not in ("scraped_at", "texts")}
+
+
+def tune_performance_profiles():
+    """Benchmark every profile on the live Alerts list and one PDP, save the winners per device"""
+    print("\n" + "="*60)
+    print("⚙️ TUNING PERFORMANCE PROFILES")
+    print("="*60)
+
+    if not open_alerts_tab():
+        return False
+
+    picks = {}
+    candidates = [name for name in PERFORMANCE_PROFILES if name != "baseline"]
+
+    # List scanning: card enumeration + cache key extraction
+    list_pick = pick_fastest_profile(
+        "list", candidates,
+        lambda: extract_cache_keys_from_alerts(get_all_live_alerts())
+    )
+    if list_pick:
+        picks["list"] = list_pick
+
+    # PDP capture: open the first live alert and time header extraction
+    live_alerts = get_all_live_alerts()
+    if live_alerts:
+        card, alert_desc = live_alerts[0]
+        try:
+            card.click()
+            if not wait_for("pdp_render", lambda: read_pdp_title() is not None):
+                raise RuntimeError("PDP did not load")
+            pdp_pick = pick_fastest_profile(
+                "pdp", candidates,
+                lambda: capture_header_fields(alert_desc)
+            )
+            if pdp_pick:
+                picks["pdp"] = pdp_pick
+        except Exception as e:
+            print(f"⚠️ Could not tune PDP phase: {e}")
+        finally:
+            go_back_to_alerts()
+            reset_pdp_data()
+    else:
+        print("⚠️ No live alerts on screen, PDP phase not tuned")
+
+    if not picks:
+        print("❌ Nothing tuned")
+        return False
+
+    store = {}
+    if os.path.exists(PROFILE_STORE_FILENAME):
+        try:
+            with open(PROFILE_STORE_FILENAME, "r", encoding="utf-8") as f:
+                store = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Could not read existing tuned profiles, overwriting: {e}")
+
+    device_entry = store.setdefault(options.device_name, {"phases": {}})
+    device_entry["phases"].update(picks)
+    device_entry["tuned_at"] = datetime.utcnow().isoformat()
+
+    with open(PROFILE_STORE_FILENAME, "w", encoding="utf-8") as f:
+        json.dump(store, f, indent=2)
+
+    print(f"\n💾 Tuned profiles saved to {PROFILE_STORE_FILENAME}")
+    return True
+
 # ==================================================
 # RUN THE SCRAPER
 # ==================================================
+if not args.tune_profiles:
+    # Modes that rewrite the CSV get a backup; discovery / drain only touch the backlog
+    start_startup_tasks(backup=not (args.discover_only or args.drain_backlog))
+
+if not start_session():
+    exit(1)
+startup_timings["session_ready"] = time.time() - PROCESS_STARTED_AT
+
 try:
-    run_scroll_based_scraping()
+    if args.tune_profiles:
+        tune_performance_profiles()
+    elif args.watch_notifications:
+        run_notification_watcher(args.watch_minutes, args.watch_interval)
+    elif args.hot_top:
+        run_hot_top_mode(args.hot_minutes)
+    elif args.backfill:
+        run_backfill(args.backfill_screens)
+    elif args.discover_only:
+        run_discovery_sweep()
+    elif args.drain_backlog:
+        run_backlog_drain()
+    else:
+        run_scroll_based_scraping()
 except Exception as e:
     print(f"\n❌ Error during scraping: {e}")
     import traceback
@@ -1148,5 +2705,13 @@ finally:
     except Exception as e:
         print(f"⚠️ Could not terminate app: {e}")
     
+    try:
+        save_latency_model()
+    except Exception as e:
+        print(f"⚠️ Could not save latency model: {e}")
+    
+    apply_harvested_alert_events()
+    driver.stats.report()
+    report_startup_timings()
     driver.quit()
     print("\n✅ Session closed")
\ No newline at end of file
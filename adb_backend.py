@@ -0,0 +1,304 @@
+"""
+Direct ADB driver backend - an alternative to Appium HTTP round trips.
+
+Reads the screen with one `uiautomator dump` streamed over `adb exec-out` and
+answers every .text / get_attribute from that snapshot locally, instead of one
+Python -> Appium -> UiAutomator2 round trip per attribute. Taps, swipes and
+back go through `adb shell input`.
+
+AdbDriver implements the subset of the Appium driver the scraper uses
+(find_element(s), swipe, back, get_window_size, app state, notifications), so
+capture_header_info, get_all_live_alerts and the scroll helpers run unchanged.
+
+Usage:
+    python 2901latest_working_poc.py --backend adb
+    python adb_backend.py record fixtures/alerts      # save the current screen as a dump fixture
+    ADB_PATH=benchmarks/fake_adb.py python benchmarks/bench_backends.py --backend adb
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+try:
+    from selenium.common.exceptions import NoSuchElementException
+except ImportError:  # keep the backend usable without selenium (fake adb / benchmarks)
+    class NoSuchElementException(Exception):
+        pass
+
+# Locator strategies (same strings as AppiumBy / selenium By)
+BY_ACCESSIBILITY_ID = "accessibility id"
+BY_CLASS_NAME = "class name"
+BY_ID = "id"
+BY_ANDROID_UIAUTOMATOR = "-android uiautomator"
+
+KEYCODE_BACK = 4
+
+# Appium attribute names -> uiautomator dump attribute names
+ATTRIBUTE_ALIASES = {
+    "content-desc": "content-desc",
+    "contentDescription": "content-desc",
+    "text": "text",
+    "resource-id": "resource-id",
+    "resourceId": "resource-id",
+    "className": "class",
+    "class": "class",
+}
+
+BOUNDS_PATTERN = re.compile(r'\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]')
+UISELECTOR_CALL_PATTERN = re.compile(r'\.(\w+)\((?:"((?:[^"\\]|\\.)*)"|(\w+))\)')
+
+
+# ==================================================
+# UISELECTOR MATCHING
+# ==================================================
+def parse_uiselector(selector):
+    """'new UiSelector().className("x").clickable(true)' -> [(method, value)]"""
+    calls = []
+    for method, quoted, bare in UISELECTOR_CALL_PATTERN.findall(selector):
+        calls.append((method, quoted if quoted or not bare else bare))
+    if not calls:
+        raise ValueError(f"Unsupported UiSelector: {selector}")
+    return calls
+
+
+def node_matches_uiselector(attrs, calls):
+    for method, value in calls:
+        if method == "className" and attrs.get("class") != value:
+            return False
+        elif method == "clickable" and attrs.get("clickable") != value:
+            return False
+        elif method == "description" and attrs.get("content-desc") != value:
+            return False
+        elif method == "descriptionContains" and value not in attrs.get("content-desc", ""):
+            return False
+        elif method == "descriptionMatches" and not re.fullmatch(value, attrs.get("content-desc", ""), re.S):
+            return False
+        elif method == "text" and attrs.get("text") != value:
+            return False
+        elif method == "textContains" and value not in attrs.get("text", ""):
+            return False
+        elif method == "resourceId" and attrs.get("resource-id") != value:
+            return False
+        elif method not in ("className", "clickable", "description", "descriptionContains",
+                            "descriptionMatches", "text", "textContains", "resourceId"):
+            raise ValueError(f"Unsupported UiSelector method: {method}")
+    return True
+
+
+def node_matches(attrs, by, value):
+    if by == BY_ACCESSIBILITY_ID:
+        return attrs.get("content-desc") == value
+    if by == BY_CLASS_NAME:
+        return attrs.get("class") == value
+    if by == BY_ID:
+        return attrs.get("resource-id") == value
+    raise ValueError(f"Unsupported locator strategy for adb backend: {by}")
+
+
+def find_in_tree(root, by, value):
+    """Matching <node> elements under root, in document (screen) order"""
+    calls = parse_uiselector(value) if by == BY_ANDROID_UIAUTOMATOR else None
+    matches = []
+    for node in root.iter("node"):
+        if node is root:
+            continue
+        attrs = node.attrib
+        if calls is not None:
+            if node_matches_uiselector(attrs, calls):
+                matches.append(node)
+        elif node_matches(attrs, by, value):
+            matches.append(node)
+    return matches
+
+
+# ==================================================
+# ELEMENTS
+# ==================================================
+class AdbElement:
+    """One node of a uiautomator dump; attribute reads are local, click is an adb tap"""
+
+    def __init__(self, driver, node):
+        self._driver = driver
+        self._node = node
+
+    @property
+    def text(self):
+        return self._node.attrib.get("text", "")
+
+    def get_attribute(self, name):
+        value = self._node.attrib.get(ATTRIBUTE_ALIASES.get(name, name))
+        return value if value != "" else None
+
+    @property
+    def rect(self):
+        match = BOUNDS_PATTERN.fullmatch(self._node.attrib.get("bounds", ""))
+        if not match:
+            return None
+        x1, y1, x2, y2 = map(int, match.groups())
+        return {"x": x1, "y": y1, "width": x2 - x1, "height": y2 - y1}
+
+    def click(self):
+        rect = self.rect
+        if rect is None:
+            raise NoSuchElementException("Element has no bounds")
+        self._driver.tap_point(rect["x"] + rect["width"] // 2, rect["y"] + rect["height"] // 2)
+
+    def find_elements(self, by, value):
+        return [AdbElement(self._driver, n) for n in find_in_tree(self._node, by, value)]
+
+    def find_element(self, by, value):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"No element for {by}={value}")
+        return elements[0]
+
+
+# ==================================================
+# DRIVER
+# ==================================================
+class AdbDriver:
+    """Appium-driver-compatible backend talking straight to adb"""
+
+    def __init__(self, serial=None, adb_path=None, compressed=False):
+        self.serial = serial
+        self.adb_path = adb_path or os.environ.get("ADB_PATH", "adb")
+        self.compressed = compressed  # like ignoreUnimportantViews
+        self._implicit_wait = 0
+        self._window_size = None
+
+    # ---------- adb plumbing ----------
+    def _adb(self, *args, timeout=30):
+        cmd = [self.adb_path]
+        if self.adb_path.endswith(".py"):
+            cmd = [sys.executable, self.adb_path]
+        if self.serial:
+            cmd += ["-s", self.serial]
+        result = subprocess.run(cmd + list(args), capture_output=True, timeout=timeout)
+        if result.returncode != 0:
+            raise RuntimeError(f"adb {' '.join(args)} failed: {result.stderr.decode(errors='replace').strip()}")
+        return result.stdout.decode("utf-8", errors="replace")
+
+    def shell(self, *args):
+        return self._adb("shell", *args)
+
+    def dump_hierarchy(self):
+        """Current screen as an XML string (streamed, nothing written on the device)"""
+        args = ["exec-out", "uiautomator", "dump"]
+        if self.compressed:
+            args.append("--compressed")
+        args.append("/dev/tty")
+        output = self._adb(*args)
+        end = output.rfind("</hierarchy>")
+        start = output.find("<?xml")
+        if start == -1:
+            start = output.find("<hierarchy")
+        if end == -1 or start == -1:
+            raise RuntimeError(f"uiautomator dump returned no hierarchy: {output[:200]!r}")
+        return output[start:end + len("</hierarchy>")]
+
+    @property
+    def page_source(self):
+        return self.dump_hierarchy()
+
+    # ---------- element lookup ----------
+    def implicitly_wait(self, seconds):
+        self._implicit_wait = seconds
+
+    def find_elements(self, by, value):
+        """Same semantics as Appium: with an implicit wait, retry until something matches"""
+        deadline = time.time() + self._implicit_wait
+        while True:
+            root = ET.fromstring(self.dump_hierarchy())
+            self._remember_window_size(root)
+            nodes = find_in_tree(root, by, value)
+            if nodes or time.time() >= deadline:
+                return [AdbElement(self, n) for n in nodes]
+            time.sleep(0.25)
+
+    def find_element(self, by, value):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"No element for {by}={value}")
+        return elements[0]
+
+    # ---------- gestures ----------
+    def tap_point(self, x, y):
+        self.shell("input", "tap", str(x), str(y))
+
+    def swipe(self, start_x, start_y, end_x, end_y, duration=0):
+        self.shell("input", "swipe", str(start_x), str(start_y), str(end_x), str(end_y), str(int(duration)))
+
+    def back(self):
+        self.shell("input", "keyevent", str(KEYCODE_BACK))
+
+    def open_notifications(self):
+        self.shell("cmd", "statusbar", "expand-notifications")
+
+    def get_window_size(self):
+        if self._window_size is None:
+            match = re.search(r'(\d+)x(\d+)', self.shell("wm", "size"))
+            self._window_size = {"width": int(match.group(1)), "height": int(match.group(2))}
+        return self._window_size
+
+    def _remember_window_size(self, root):
+        if self._window_size is None:
+            first = root.find("node")
+            match = BOUNDS_PATTERN.fullmatch(first.attrib.get("bounds", "")) if first is not None else None
+            if match:
+                x1, y1, x2, y2 = map(int, match.groups())
+                self._window_size = {"width": x2 - x1, "height": y2 - y1}
+
+    # ---------- app lifecycle ----------
+    def query_app_state(self, package):
+        """Appium app state codes: 1 not running, 3 background, 4 foreground (0 not installed)"""
+        if package not in self.shell("pm", "list", "packages", package):
+            return 0
+        if not self.shell("pidof", package).strip():
+            return 1
+        focus = self.shell("dumpsys", "window", "windows")
+        return 4 if re.search(rf'mCurrentFocus=.*{re.escape(package)}', focus) else 3
+
+    def activate_app(self, package):
+        self.shell("monkey", "-p", package, "-c", "android.intent.category.LAUNCHER", "1")
+
+    def terminate_app(self, package):
+        self.shell("am", "force-stop", package)
+        return True
+
+    def update_settings(self, settings):
+        # UiAutomator2 settings don't apply; only the compressed hierarchy has an adb equivalent
+        if "ignoreUnimportantViews" in settings:
+            self.compressed = bool(settings["ignoreUnimportantViews"])
+
+    def quit(self):
+        pass
+
+
+# ==================================================
+# CLI: RECORD DUMP FIXTURES
+# ==================================================
+def main():
+    parser = argparse.ArgumentParser(description="ADB backend utilities")
+    sub = parser.add_subparsers(dest="command", required=True)
+    record_parser = sub.add_parser("record", help="Save the current screen's hierarchy to a fixture directory")
+    record_parser.add_argument("directory")
+    record_parser.add_argument("--serial")
+    record_parser.add_argument("--name", help="File name (default: next number)")
+    cli = parser.parse_args()
+
+    driver = AdbDriver(serial=cli.serial)
+    os.makedirs(cli.directory, exist_ok=True)
+    name = cli.name or f"{len(os.listdir(cli.directory)):03d}.xml"
+    path = os.path.join(cli.directory, name)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(driver.dump_hierarchy())
+    print(f"💾 Saved {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
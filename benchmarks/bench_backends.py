@@ -0,0 +1,103 @@
+"""
+Benchmark the Appium and ADB driver backends on the reads the scraper does most.
+
+    list_scan    find the clickable alert cards + read every content-desc   (get_all_live_alerts)
+    header_scan  find every TextView + read every text                      (capture_header_info)
+
+Run it with the device parked on the screen to measure (Alerts list or a PDP);
+both backends then read the same screen. Against a fake adb serving recorded
+dumps only the adb backend is meaningful.
+
+Usage:
+    python benchmarks/bench_backends.py --backend appium --backend adb --serial RZ8R81C9GWH
+    ADB_PATH=benchmarks/fake_adb.py FAKE_ADB_DUMPS=fixtures/run1 python benchmarks/bench_backends.py --backend adb
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from adb_backend import AdbDriver, BY_ANDROID_UIAUTOMATOR, BY_CLASS_NAME  # noqa: E402
+
+CARD_SELECTOR = 'new UiSelector().className("android.view.ViewGroup").clickable(true)'
+
+
+def list_scan(driver):
+    cards = driver.find_elements(BY_ANDROID_UIAUTOMATOR, CARD_SELECTOR)
+    return [card.get_attribute("content-desc") for card in cards]
+
+
+def header_scan(driver):
+    texts = driver.find_elements(BY_CLASS_NAME, "android.widget.TextView")
+    return [t.text for t in texts]
+
+
+def connect(backend, cli):
+    if backend == "adb":
+        return AdbDriver(serial=cli.serial, adb_path=cli.adb_path)
+
+    from appium import webdriver
+    from appium.options.android import UiAutomator2Options
+
+    options = UiAutomator2Options()
+    options.platform_name = "Android"
+    options.device_name = cli.serial
+    options.automation_name = "UiAutomator2"
+    options.no_reset = True
+    options.auto_grant_permissions = True
+    driver = webdriver.Remote(cli.appium_url, options=options)
+    driver.implicitly_wait(0)
+    return driver
+
+
+def measure(func, driver, rounds):
+    func(driver)  # warm-up
+    timings = []
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func(driver)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[min(len(timings) - 1, int(0.95 * len(timings)))],
+        "items": len(result),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Appium vs ADB driver backends")
+    parser.add_argument("--backend", action="append", choices=["appium", "adb"])
+    parser.add_argument("--serial", default="RZ8R81C9GWH")
+    parser.add_argument("--appium-url", default="http://127.0.0.1:4723")
+    parser.add_argument("--adb-path", default=None, help="adb binary (default: $ADB_PATH or 'adb')")
+    parser.add_argument("--rounds", type=int, default=10)
+    cli = parser.parse_args()
+
+    results = {}
+    for backend in cli.backend or ["adb"]:
+        driver = connect(backend, cli)
+        try:
+            for name, func in [("list_scan", list_scan), ("header_scan", header_scan)]:
+                results[(backend, name)] = measure(func, driver, cli.rounds)
+        finally:
+            if backend == "appium":
+                driver.quit()
+
+    print(f"{'backend':<8} {'operation':<12} {'items':>6} {'median ms':>10} {'p95 ms':>10}")
+    for (backend, name), stats in results.items():
+        print(f"{backend:<8} {name:<12} {stats['items']:>6} {stats['median_ms']:>10.1f} {stats['p95_ms']:>10.1f}")
+
+    for name in ["list_scan", "header_scan"]:
+        if ("appium", name) in results and ("adb", name) in results:
+            speedup = results[("appium", name)]["median_ms"] / results[("adb", name)]["median_ms"]
+            print(f"⚡ {name}: adb is {speedup:.1f}x the speed of appium")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+"""
+Micro-benchmarks for the pure parsing and dedup functions, at production-plus scale.
+
+Inputs are generated (seeded, so every run sees the same data):
+    - 10k alert descriptions per screen sweep (cache keys / alert parsing)
+    - PDP hierarchies with hundreds of TextViews (header parsing)
+    - a 1M-row history for the CSV merge (needs pandas)
+
+Results are compared against benchmarks/baseline.json; a benchmark that got
+slower than the allowed tolerance fails the run (exit code 1). Timings are
+machine-specific, so the baseline is not committed: the first run on a machine
+(or of a new benchmark) records its timings as the baseline, later runs compare
+against it. Re-record after an intended speed change with --save-baseline.
+
+Only the selected benchmarks build their inputs (the 1M-row history is skipped
+unless 'merge' runs), and each benchmark has its own seeded RNG, so its inputs
+are the same whatever --only selects.
+
+Usage:
+    python benchmarks/bench_parsing.py                   # run + compare with baseline (first run: record it)
+    python benchmarks/bench_parsing.py --save-baseline   # re-record current timings as baseline
+    python benchmarks/bench_parsing.py --only header --history-rows 100000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from listing_parsing import (  # noqa: E402
+    EMIRATES, WEEKDAYS, extract_cache_keys_from_alerts, generate_cache_key, merge_listing_frames,
+    parse_alert_events, parse_header_texts,
+)
+
+BASELINE_FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+MAKES = ["Toyota", "Nissan", "Mercedes-Benz", "BMW", "Lexus", "Land Rover", "Kia", "Hyundai", "Porsche"]
+MODELS = ["Corolla", "X-Trail", "GL-Class Gl 500 4matic", "X5", "ES HYBRID 300h", "Range Rover Sport", "Rio"]
+
+
+# ==================================================
+# INPUT GENERATORS
+# ==================================================
+def random_title(rng):
+    return f"{rng.randint(2008, 2025)} {rng.choice(MAKES)} {rng.choice(MODELS)}"
+
+
+def random_live_time(rng):
+    hour = rng.randint(1, 12)
+    return f"{rng.choice(WEEKDAYS)} at {hour}:{rng.randint(0, 59):02d} {rng.choice(['AM', 'PM'])}"
+
+
+def generate_alert_descriptions(n, rng):
+    """'<title> is now Live ... <weekday> at <time>' plus some non-Live cards"""
+    descriptions = []
+    for i in range(n):
+        if i % 10 == 9:
+            descriptions.append(f"Auction for {random_title(rng)} ends in 10 minutes")
+        else:
+            descriptions.append(
+                f"{random_title(rng)} is now Live\nBid now before it ends\n{random_live_time(rng)}"
+            )
+    return descriptions
+
+
+def generate_pdp_texts(n_texts, rng):
+    """A PDP TextView list: header block first, then hundreds of filler / spec rows"""
+    header = [
+        "Back", random_title(rng), f"Ref# {rng.randint(400000, 430000)}", rng.choice(EMIRATES),
+        f"{rng.randint(1000, 250000):,} km", "| GCC Specs", "| Automatic", f"| {rng.choice([1600, 2000, 2500, 4700])} cc",
+        f"AED {rng.randint(20000, 200000):,}", "Seller Expectation",
+        f"AED {rng.randint(10000, 150000):,}", "Current Bid",
+        "Auction ended", f"Jan {rng.randint(1, 28)}, 2026  at 4:20 PM",
+    ]
+    filler = [f"Inspection item {i}: {rng.choice(['OK', 'Minor scratch', 'Replaced', 'Not checked'])}"
+              for i in range(max(0, n_texts - len(header)))]
+    return header + filler
+
+
+def generate_history(n_rows, n_new, rng):
+    """(existing_df, new_df) shaped like car_listings_cache.csv; new_df overlaps the history by half"""
+    import pandas as pd
+
+    keys = [f"{generate_cache_key(random_title(rng), random_live_time(rng))}_{i}" for i in range(n_rows)]
+    existing = pd.DataFrame({
+        "title": "2019 Toyota Corolla SE",
+        "current_bid": "AED 25,000",
+        "seller_expectation": "AED 41,420",
+        "cache_key": keys,
+    })
+    new_keys = keys[:n_new // 2] + [f"new_{i}" for i in range(n_new - n_new // 2)]
+    new = pd.DataFrame({
+        "title": "2023 Toyota Yaris Basic",
+        "current_bid": "AED 28,000",
+        "seller_expectation": "AED 44,690",
+        "cache_key": new_keys,
+    })
+    return existing, new
+
+
+# ==================================================
+# BENCHMARKS
+# ==================================================
+def setup_cache_key(cli, rng):
+    titles_times = [(random_title(rng), random_live_time(rng)) for _ in range(cli.alerts)]
+    return lambda: [generate_cache_key(t, lt) for t, lt in titles_times]
+
+
+def setup_alert_sweep(cli, rng):
+    pairs = [(None, d) for d in generate_alert_descriptions(cli.alerts, rng)]
+    return lambda: extract_cache_keys_from_alerts(pairs)
+
+
+def setup_alert_events(cli, rng):
+    descriptions = generate_alert_descriptions(cli.alerts, rng)
+    return lambda: parse_alert_events(descriptions)
+
+
+def setup_header(cli, rng):
+    pdps = [generate_pdp_texts(cli.pdp_texts, rng) for _ in range(cli.pdps)]
+    return lambda: [parse_header_texts(texts) for texts in pdps]
+
+
+def setup_merge(cli, rng):
+    existing_df, new_df = generate_history(cli.history_rows, cli.new_rows, rng)
+    return lambda: merge_listing_frames(existing_df, new_df)
+
+
+# name -> setup(cli, rng) building the inputs and returning one round of work
+BENCHMARKS = {
+    "cache_key": setup_cache_key,
+    "alert_sweep": setup_alert_sweep,
+    "alert_events": setup_alert_events,
+    "header": setup_header,
+    "merge": setup_merge,
+}
+
+
+def build_benchmarks(cli, only=None):
+    """name -> zero-argument callable doing one round of work, inputs built only for `only`"""
+    benchmarks = {}
+    for name, setup in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        try:
+            benchmarks[name] = setup(cli, random.Random(f"42:{name}"))
+        except ImportError:
+            print(f"⚠️ pandas not installed, skipping '{name}'")
+    return benchmarks
+
+
+def run_benchmark(func, rounds):
+    """Run func `rounds` times (after one warm-up) and return timing stats in ms"""
+    func()
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "rounds": rounds,
+    }
+
+
+# ==================================================
+# MAIN
+# ==================================================
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pure parsing and dedup functions")
+    parser.add_argument("--only", action="append", help="Run only these benchmarks (repeatable)")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--alerts", type=int, default=10_000, help="Alert descriptions per sweep")
+    parser.add_argument("--pdps", type=int, default=100, help="PDP hierarchies per round")
+    parser.add_argument("--pdp-texts", type=int, default=400, help="TextViews per PDP")
+    parser.add_argument("--history-rows", type=int, default=1_000_000)
+    parser.add_argument("--new-rows", type=int, default=200)
+    parser.add_argument("--tolerance", type=float, default=0.20,
+                        help="Allowed slowdown vs baseline median before failing (default 20%%)")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--json", help="Also write this run's results to a file")
+    cli = parser.parse_args()
+
+    unknown = set(cli.only or []) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))} (choose from {', '.join(BENCHMARKS)})")
+    benchmarks = build_benchmarks(cli, cli.only)
+
+    baseline = {}
+    if os.path.exists(BASELINE_FILENAME):
+        with open(BASELINE_FILENAME, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {}
+    regressions = []
+    print(f"{'benchmark':<14} {'min ms':>10} {'median ms':>10} {'baseline':>10} {'change':>8}")
+    for name, func in benchmarks.items():
+        stats = run_benchmark(func, cli.rounds)
+        results[name] = stats
+
+        base = baseline.get(name, {}).get("median_ms")
+        change = ""
+        if base:
+            ratio = stats["median_ms"] / base - 1
+            change = f"{ratio:+.0%}"
+            if ratio > cli.tolerance:
+                regressions.append(name)
+                change += " ❌"
+        print(f"{name:<14} {stats['min_ms']:>10.2f} {stats['median_ms']:>10.2f} "
+              f"{base if base else '-':>10} {change:>8}")
+
+    if cli.json:
+        with open(cli.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    # First run (or new benchmark): its timings become the baseline to compare against
+    recorded = results if cli.save_baseline else {name: r for name, r in results.items() if name not in baseline}
+    if recorded:
+        baseline.update(recorded)
+        with open(BASELINE_FILENAME, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"💾 Baseline for {', '.join(recorded)} saved to {BASELINE_FILENAME}")
+    if cli.save_baseline:
+        return 0
+
+    if regressions:
+        print(f"❌ Slower than baseline by more than {cli.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
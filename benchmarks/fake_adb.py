@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""
+Fake adb binary serving recorded uiautomator dumps (for the adb backend and its benchmark).
+
+Dumps are the *.xml files in $FAKE_ADB_DUMPS, served in name order. Every input
+command (tap / swipe / keyevent) moves on to the next dump, so a recorded
+sequence (Alerts list -> PDP -> Alerts list ...) replays like the real app.
+The app is reported installed, running and in the foreground, so the
+scraper's app-state checks pass.
+
+Environment:
+    FAKE_ADB_DUMPS   directory with recorded dumps (see `python adb_backend.py record`)
+    FAKE_ADB_STATE   file holding the current dump index (default: <dumps>/.fake_adb_state)
+    FAKE_ADB_DELAY   seconds added to every dump, to mimic device dump time (default 0)
+    FAKE_ADB_LOG     append every received command to this file
+    FAKE_ADB_PACKAGE package reported installed and focused (default: com.dubizzle.dealerapp)
+
+Usage:
+    ADB_PATH=benchmarks/fake_adb.py FAKE_ADB_DUMPS=fixtures/run1 python benchmarks/bench_backends.py --backend adb
+"""
+import os
+import sys
+import time
+
+DEFAULT_PACKAGE = "com.dubizzle.dealerapp"
+
+
+def dump_files(directory):
+    return sorted(f for f in os.listdir(directory) if f.endswith(".xml"))
+
+
+def read_index(state_file):
+    try:
+        with open(state_file, "r", encoding="utf-8") as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def write_index(state_file, index):
+    with open(state_file, "w", encoding="utf-8") as f:
+        f.write(str(index))
+
+
+def main(argv):
+    directory = os.environ.get("FAKE_ADB_DUMPS")
+    if not directory or not os.path.isdir(directory):
+        print("error: FAKE_ADB_DUMPS must point to a directory of recorded dumps", file=sys.stderr)
+        return 1
+    files = dump_files(directory)
+    if not files:
+        print(f"error: no *.xml dumps in {directory}", file=sys.stderr)
+        return 1
+    state_file = os.environ.get("FAKE_ADB_STATE", os.path.join(directory, ".fake_adb_state"))
+
+    if os.environ.get("FAKE_ADB_LOG"):
+        with open(os.environ["FAKE_ADB_LOG"], "a", encoding="utf-8") as f:
+            f.write(" ".join(argv) + "\n")
+
+    # Drop "-s <serial>"
+    if len(argv) >= 2 and argv[0] == "-s":
+        argv = argv[2:]
+
+    index = read_index(state_file)
+
+    if argv[:3] == ["exec-out", "uiautomator", "dump"]:
+        time.sleep(float(os.environ.get("FAKE_ADB_DELAY", "0")))
+        with open(os.path.join(directory, files[index % len(files)]), "r", encoding="utf-8") as f:
+            sys.stdout.write(f.read())
+        sys.stdout.write("\nUI hierchary dumped to: /dev/tty\n")
+        return 0
+
+    if argv[:2] == ["shell", "input"]:
+        write_index(state_file, (index + 1) % len(files))
+        return 0
+
+    if argv[:3] == ["shell", "wm", "size"]:
+        print("Physical size: 720x1600")
+        return 0
+
+    package = os.environ.get("FAKE_ADB_PACKAGE", DEFAULT_PACKAGE)
+    if argv[:4] == ["shell", "pm", "list", "packages"]:
+        # Like pm: the filter argument is a substring match
+        if not argv[4:] or argv[4] in package:
+            print(f"package:{package}")
+        return 0
+
+    if argv[:2] == ["shell", "pidof"]:
+        if argv[2:3] == [package]:
+            print("4242")
+        return 0
+
+    if argv[:3] == ["shell", "dumpsys", "window"]:
+        print(f"  mCurrentFocus=Window{{1a2b3c u0 {package}/{package}.MainActivity}}")
+        return 0
+
+    # Everything else (am, monkey, cmd statusbar ...) succeeds silently
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,354 @@
+"""
+Per-command deadlines and hedged recovery for driver calls.
+
+GuardedDriver wraps an Appium (or adb backend) driver. Every call runs with a
+client-side deadline for its command type, so a wedged UiAutomator2 server can
+no longer block a run indefinitely. Failures are classified (timeout, stale
+element, no such element, session lost, other) and timeouts escalate one level
+per consecutive failure:
+
+    1. retry the command once (read-only commands only - a click may have landed)
+    2. restart the UiAutomator2 server (then retry read-only commands)
+    3. rebuild the session and raise CommandTimeout to the caller
+
+A click or gesture that times out skips the retry, so its first failure restarts
+the server and raises; the session is only rebuilt if the next command fails
+too. Any command that succeeds resets the ladder. A lost session is rebuilt
+straight away.
+
+Calls run on one reused worker thread; a hung call leaves its worker behind and
+the next call starts a fresh one. Latency per command type is recorded so the
+run can report p50 / p99.
+"""
+import queue
+import threading
+import time
+
+try:
+    from selenium.common.exceptions import (
+        InvalidSessionIdException, NoSuchElementException, StaleElementReferenceException, WebDriverException,
+    )
+except ImportError:  # adb backend without selenium installed
+    from adb_backend import NoSuchElementException
+
+    class StaleElementReferenceException(Exception):
+        pass
+
+    class WebDriverException(Exception):
+        pass
+
+    class InvalidSessionIdException(WebDriverException):
+        pass
+
+
+# Seconds before a command of each type is considered hung.
+# find covers the driver's implicit wait (7s in the scraper), so it must stay above it.
+DEFAULT_DEADLINES = {
+    "find": 20,
+    "read": 10,
+    "click": 15,
+    "gesture": 20,
+    "navigation": 15,
+    "app": 60,
+    "default": 30,
+}
+
+COMMAND_TYPES = {
+    "find_element": "find",
+    "find_elements": "find",
+    "text": "read",
+    "get_attribute": "read",
+    "rect": "read",
+    "page_source": "read",
+    "get_window_size": "read",
+    "click": "click",
+    "swipe": "gesture",
+    "back": "navigation",
+    "open_notifications": "navigation",
+    "activate_app": "app",
+    "terminate_app": "app",
+    "query_app_state": "app",
+}
+
+# Safe to repeat after a timeout (no side effects on the device)
+RETRYABLE_TYPES = {"find", "read", "default"}
+
+# Session-level setters replayed on a rebuilt session
+REPLAYED_SETTERS = ("implicitly_wait", "update_settings")
+
+LATENCY_WINDOW = 2000
+
+
+class CommandTimeout(Exception):
+    """A driver command did not answer within its deadline"""
+
+
+def classify_error(error):
+    """Short label for an exception raised by a driver command"""
+    if isinstance(error, CommandTimeout):
+        return "timeout"
+    if isinstance(error, StaleElementReferenceException):
+        return "stale_element"
+    if isinstance(error, NoSuchElementException):
+        return "no_such_element"
+    if isinstance(error, InvalidSessionIdException):
+        return "session_lost"
+    if isinstance(error, WebDriverException):
+        return "webdriver"
+    return "other"
+
+
+class CommandWorker:
+    """Daemon thread running driver calls one after another"""
+
+    def __init__(self):
+        self._jobs = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            func, args, kwargs, outcome, done = self._jobs.get()
+            try:
+                outcome["value"] = func(*args, **kwargs)
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                done.set()
+
+    def submit(self, func, args, kwargs):
+        """Queue a call; returns (outcome dict, event set once it finished)"""
+        outcome = {}
+        done = threading.Event()
+        self._jobs.put((func, args, kwargs, outcome, done))
+        return outcome, done
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def call_with_deadline(func, args, kwargs, deadline):
+    """Run func on the shared worker thread; raise CommandTimeout if it doesn't return in time.
+    A hung call is abandoned together with its worker (blocked on the dead socket);
+    the next call gets a new one.
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = CommandWorker()
+        worker = _worker
+
+    outcome, done = worker.submit(func, args, kwargs)
+    if not done.wait(deadline):
+        with _worker_lock:
+            if _worker is worker:
+                _worker = None
+        raise CommandTimeout(f"{getattr(func, '__name__', func)} exceeded {deadline:g}s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome.get("value")
+
+
+class CommandStats:
+    """Latency samples and error counts per command type"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.recoveries = {"retry": 0, "server_restart": 0, "session_rebuild": 0}
+        self._lock = threading.Lock()
+
+    def record(self, command_type, seconds):
+        with self._lock:
+            samples = self.latencies.setdefault(command_type, [])
+            samples.append(seconds)
+            if len(samples) > LATENCY_WINDOW:
+                del samples[:len(samples) - LATENCY_WINDOW]
+
+    def record_error(self, command_type, label):
+        with self._lock:
+            key = (command_type, label)
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def percentile(self, command_type, pct):
+        samples = sorted(self.latencies.get(command_type, []))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))]
+
+    def report(self):
+        """Print count / p50 / p99 / max per command type, error classes and recoveries"""
+        print(f"\n{'='*60}")
+        print("⏱️ DRIVER COMMAND LATENCY")
+        print(f"{'='*60}")
+        print(f"  {'type':<12} {'count':>6} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for command_type in sorted(self.latencies):
+            samples = self.latencies[command_type]
+            print(f"  {command_type:<12} {len(samples):>6} "
+                  f"{self.percentile(command_type, 50) * 1000:>8.0f} "
+                  f"{self.percentile(command_type, 99) * 1000:>8.0f} "
+                  f"{max(samples) * 1000:>8.0f}")
+        if self.errors:
+            print("  Errors:")
+            for (command_type, label), count in sorted(self.errors.items()):
+                print(f"    {command_type:<12} {label:<16} {count}")
+        if any(self.recoveries.values()):
+            print(f"  Recoveries: {self.recoveries}")
+        print(f"{'='*60}")
+
+
+class GuardedElement:
+    """Element proxy whose reads and clicks go through the owning GuardedDriver"""
+
+    def __init__(self, guard, element):
+        self._guard = guard
+        self._element = element
+
+    @property
+    def text(self):
+        return self._guard.run_command("text", lambda: self._element.text)
+
+    @property
+    def rect(self):
+        return self._guard.run_command("rect", lambda: self._element.rect)
+
+    def get_attribute(self, name):
+        return self._guard.run_command("get_attribute", self._element.get_attribute, name)
+
+    def click(self):
+        return self._guard.run_command("click", self._element.click)
+
+    def find_element(self, by, value):
+        return self._guard.wrap(self._guard.run_command("find_element", self._element.find_element, by, value))
+
+    def find_elements(self, by, value):
+        return self._guard.wrap(self._guard.run_command("find_elements", self._element.find_elements, by, value))
+
+    def __getattr__(self, name):
+        return getattr(self._element, name)
+
+
+class GuardedDriver:
+    """Driver proxy adding per-command deadlines, error classification and recovery
+
+    driver: the real driver
+    rebuild_session: () -> new driver (level 3)
+    restart_server: () -> None, restarts the UiAutomator2 server (level 2)
+    deadlines: overrides for DEFAULT_DEADLINES
+    """
+
+    def __init__(self, driver, rebuild_session=None, restart_server=None, deadlines=None):
+        self._driver = driver
+        self._rebuild_session = rebuild_session
+        self._restart_server = restart_server
+        self.deadlines = dict(DEFAULT_DEADLINES)
+        self.deadlines.update(deadlines or {})
+        self.stats = CommandStats()
+        self._replay = {}
+        # Recovery level reached by consecutive failures; any success resets it
+        self._level = 0
+
+    # ---------- execution ----------
+    def run_command(self, command, func, *args, **kwargs):
+        command_type = COMMAND_TYPES.get(command, "default")
+        deadline = self.deadlines.get(command_type, self.deadlines["default"])
+
+        while True:
+            start = time.perf_counter()
+            try:
+                result = call_with_deadline(func, args, kwargs, deadline)
+                self.stats.record(command_type, time.perf_counter() - start)
+                self._level = 0
+                return result
+            except Exception as e:
+                elapsed = time.perf_counter() - start
+                label = classify_error(e)
+                self.stats.record(command_type, elapsed)
+                self.stats.record_error(command_type, label)
+                if label not in ("timeout", "session_lost"):
+                    raise
+
+                retryable = command_type in RETRYABLE_TYPES
+                self._level = self._next_level(label, retryable)
+                print(f"  ⏱️ {command} {label} after {elapsed:.1f}s (recovery level {self._level})")
+                if self._level == 1:
+                    self.stats.recoveries["retry"] += 1
+                    continue
+                if self._level == 2:
+                    self._recover_server()
+                    if retryable:
+                        continue
+                    raise
+                self._level = 0
+                self._recover_session()
+                raise
+
+    def _next_level(self, label, retryable):
+        """One rung up the ladder, skipping rungs that don't apply to this failure"""
+        if label == "session_lost":
+            return 3
+        level = self._level + 1
+        if level == 1 and not retryable:
+            level = 2
+        if level == 2 and not self._restart_server:
+            level = 3
+        return level
+
+    def _recover_server(self):
+        print("  🔄 Restarting UiAutomator2 server...")
+        self.stats.recoveries["server_restart"] += 1
+        try:
+            self._restart_server()
+        except Exception as e:
+            print(f"  ⚠️ Could not restart UiAutomator2 server: {e}")
+
+    def _recover_session(self):
+        if not self._rebuild_session:
+            return
+        print("  🔄 Rebuilding driver session...")
+        self.stats.recoveries["session_rebuild"] += 1
+        try:
+            old = self._driver
+            self._driver = call_with_deadline(self._rebuild_session, (), {}, self.deadlines["app"])
+            for name, (args, kwargs) in self._replay.items():
+                getattr(self._driver, name)(*args, **kwargs)
+            try:
+                threading.Thread(target=old.quit, daemon=True).start()
+            except Exception:
+                pass
+            print("  ✅ New session ready")
+        except Exception as e:
+            print(f"  ❌ Could not rebuild session: {e}")
+
+    def wrap(self, result):
+        """Wrap elements (or lists of elements) returned by the real driver"""
+        if isinstance(result, list):
+            return [GuardedElement(self, r) for r in result]
+        if hasattr(result, "get_attribute") and hasattr(result, "click"):
+            return GuardedElement(self, result)
+        return result
+
+    # ---------- proxying ----------
+    def quit(self):
+        # No recovery ladder on the way out - just don't hang the shutdown
+        try:
+            call_with_deadline(self._driver.quit, (), {}, self.deadlines["default"])
+        except CommandTimeout:
+            print("  ⚠️ driver.quit() timed out, abandoning session")
+
+    @property
+    def page_source(self):
+        return self.run_command("page_source", lambda: self._driver.page_source)
+
+    def __getattr__(self, name):
+        attr = getattr(self._driver, name)
+        if not callable(attr):
+            return attr
+
+        def guarded(*args, **kwargs):
+            if name in REPLAYED_SETTERS:
+                self._replay[name] = (args, kwargs)
+            return self.wrap(self.run_command(name, getattr(self._driver, name), *args, **kwargs))
+
+        return guarded
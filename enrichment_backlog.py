@@ -0,0 +1,203 @@
+"""
+Durable PDP-enrichment backlog for the two-tier crawl.
+
+Tier 1 (--discover-only) sweeps the Alerts list at list speed and enqueues every
+unseen alert with its title, live time and cache_key. Tier 2 (--drain-backlog)
+workers claim items - newest first - open the PDP and mark them done. Claims are
+atomic, so several devices can drain the same backlog in parallel. A failed item
+goes back to pending with an exponential backoff before it can be claimed again.
+
+Usage:
+    python enrichment_backlog.py status
+    python enrichment_backlog.py requeue-failed
+"""
+import argparse
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+from listing_store import DB_FILENAME
+
+# A claim not finished within this time is considered abandoned (worker died)
+CLAIM_TIMEOUT_MINUTES = 10
+
+# Failed enrichments go back to pending until they have failed this often
+MAX_ATTEMPTS = 3
+
+# A failed item is not claimed again before RETRY_BACKOFF_MINUTES x 2^(attempts - 1),
+# so newest-first claiming doesn't burn all its attempts on one broken card in a row
+RETRY_BACKOFF_MINUTES = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS enrichment_backlog (
+    cache_key TEXT PRIMARY KEY,
+    title TEXT,
+    live_time TEXT,
+    alert_desc TEXT,
+    sweep_id TEXT,                -- discovery sweep (later sweep = newer alerts)
+    list_position INTEGER,        -- position in that sweep (0 = top = newest)
+    discovered_at TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',  -- pending / claimed / done / failed
+    claimed_by TEXT,
+    claimed_at TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    next_attempt_at TEXT,         -- failed items wait until then before being claimed again
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_backlog_priority
+    ON enrichment_backlog (status, sweep_id DESC, list_position);
+"""
+
+
+def open_backlog(db_filename=DB_FILENAME):
+    """Open (and create if needed) the backlog table"""
+    conn = sqlite3.connect(db_filename, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    _migrate(conn)
+    return conn
+
+
+def _migrate(conn):
+    """Bring backlogs created by older versions up to the current schema"""
+    columns = {r["name"] for r in conn.execute("PRAGMA table_info(enrichment_backlog)")}
+    if "next_attempt_at" not in columns:
+        with conn:
+            conn.execute("ALTER TABLE enrichment_backlog ADD COLUMN next_attempt_at TEXT")
+
+
+def enqueue(conn, items, sweep_id):
+    """Add discovered alerts; items are dicts with cache_key, title, live_time, alert_desc, list_position.
+    Alerts already in the backlog are left alone. Returns the number added.
+    """
+    now = datetime.utcnow().isoformat()
+    added = 0
+    with conn:
+        for item in items:
+            cursor = conn.execute(
+                """
+                INSERT OR IGNORE INTO enrichment_backlog
+                    (cache_key, title, live_time, alert_desc, sweep_id, list_position, discovered_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (item["cache_key"], item["title"], item["live_time"], item["alert_desc"],
+                 sweep_id, item["list_position"], now),
+            )
+            added += cursor.rowcount
+    return added
+
+
+def known_keys(conn):
+    """Every cache_key in the backlog, whatever its status"""
+    return {row[0] for row in conn.execute("SELECT cache_key FROM enrichment_backlog")}
+
+
+def claim_next(conn, worker, now=None, skip=()):
+    """Atomically claim the newest pending (or abandoned) item for this worker; None if empty.
+    Pending items still backing off from a failure are skipped, as are the cache keys
+    in skip (e.g. listings the failure ledger blocks) - those stay pending, attempts untouched.
+    """
+    now = now or datetime.utcnow()
+    stale_before = (now - timedelta(minutes=CLAIM_TIMEOUT_MINUTES)).isoformat()
+    skip = list(skip)
+    row = conn.execute(
+        f"""
+        UPDATE enrichment_backlog
+        SET status = 'claimed', claimed_by = ?, claimed_at = ?, attempts = attempts + 1
+        WHERE cache_key = (
+            SELECT cache_key FROM enrichment_backlog
+            WHERE ((status = 'pending' AND (next_attempt_at IS NULL OR next_attempt_at <= ?))
+                   OR (status = 'claimed' AND claimed_at < ?))
+              AND cache_key NOT IN ({", ".join("?" for _ in skip)})
+            ORDER BY sweep_id DESC, list_position
+            LIMIT 1
+        )
+        RETURNING *
+        """,
+        [worker, now.isoformat(), now.isoformat(), stale_before] + skip,
+    ).fetchone()
+    conn.commit()
+    return row
+
+
+def release_claim(conn, cache_key):
+    """Hand a claimed item back untried: pending again, the claim's attempt not counted"""
+    with conn:
+        conn.execute(
+            """
+            UPDATE enrichment_backlog
+            SET status = 'pending', claimed_by = NULL, claimed_at = NULL, attempts = MAX(attempts - 1, 0)
+            WHERE cache_key = ? AND status = 'claimed'
+            """,
+            (cache_key,),
+        )
+
+
+def mark_done(conn, cache_key):
+    with conn:
+        conn.execute(
+            "UPDATE enrichment_backlog SET status = 'done', finished_at = ?, last_error = NULL WHERE cache_key = ?",
+            (datetime.utcnow().isoformat(), cache_key),
+        )
+
+
+def mark_failed(conn, cache_key, error, now=None):
+    """Record a failed enrichment; back to pending (after a backoff) unless it ran out of attempts"""
+    now = now or datetime.utcnow()
+    row = conn.execute("SELECT attempts FROM enrichment_backlog WHERE cache_key = ?", (cache_key,)).fetchone()
+    if row is None:
+        return
+    backoff = timedelta(minutes=RETRY_BACKOFF_MINUTES * 2 ** max(0, row["attempts"] - 1))
+    with conn:
+        conn.execute(
+            """
+            UPDATE enrichment_backlog
+            SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                claimed_by = NULL, claimed_at = NULL, last_error = ?, next_attempt_at = ?
+            WHERE cache_key = ?
+            """,
+            (MAX_ATTEMPTS, error, (now + backoff).isoformat(), cache_key),
+        )
+
+
+def backlog_counts(conn):
+    """status -> number of items"""
+    return {row["status"]: row["n"] for row in
+            conn.execute("SELECT status, COUNT(*) AS n FROM enrichment_backlog GROUP BY status")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the PDP enrichment backlog")
+    parser.add_argument("--db", default=DB_FILENAME)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="Items per status and the next items to drain")
+    sub.add_parser("requeue-failed", help="Put failed items back to pending with fresh attempts")
+    cli = parser.parse_args()
+
+    conn = open_backlog(cli.db)
+    if cli.command == "status":
+        counts = backlog_counts(conn)
+        for status in ["pending", "claimed", "done", "failed"]:
+            print(f"  {status:<8} {counts.get(status, 0)}")
+        rows = conn.execute(
+            "SELECT * FROM enrichment_backlog WHERE status = 'pending' "
+            "ORDER BY sweep_id DESC, list_position LIMIT 10"
+        ).fetchall()
+        if rows:
+            print("\n📋 Next up:")
+            for r in rows:
+                print(f"  {r['title']} ({r['live_time']})")
+    elif cli.command == "requeue-failed":
+        with conn:
+            n = conn.execute(
+                "UPDATE enrichment_backlog SET status = 'pending', attempts = 0, next_attempt_at = NULL "
+                "WHERE status = 'failed'"
+            ).rowcount
+        print(f"♻️ Requeued {n} failed item(s)")
+    conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
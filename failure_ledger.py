@@ -0,0 +1,160 @@
+"""
+Persistent ledger of listings whose PDP keeps failing.
+
+A PDP that doesn't load, opens the wrong listing or "blinks" to another one
+costs ~15s of device time per attempt. Every failure is recorded here by
+cache_key; the listing is then skipped for an exponentially growing backoff
+(across runs), and after QUARANTINE_AFTER failures it is quarantined until
+released by hand. A successful scrape clears the entry.
+
+Usage:
+    python failure_ledger.py status
+    python failure_ledger.py release <cache_key> [<cache_key> ...]
+    python failure_ledger.py release --all
+"""
+import argparse
+import json
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+from listing_store import DB_FILENAME
+
+# Failure reasons recorded by the scraper
+REASONS = ["pdp_not_loaded", "wrong_pdp", "blink", "scrape_error"]
+
+# Backoff after the n-th failure: BACKOFF_BASE_MINUTES * 2^(n-1), capped
+BACKOFF_BASE_MINUTES = 30
+BACKOFF_MAX_HOURS = 24
+
+# Failures before a listing is quarantined (no more automatic retries)
+QUARANTINE_AFTER = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pdp_failures (
+    cache_key TEXT PRIMARY KEY,
+    alert_desc TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    reasons TEXT NOT NULL DEFAULT '{}',   -- JSON: reason -> count
+    last_reason TEXT,
+    first_failed_at TEXT,
+    last_failed_at TEXT,
+    retry_after TEXT,
+    quarantined INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def open_ledger(db_filename=DB_FILENAME):
+    """Open (and create if needed) the failure ledger table"""
+    conn = sqlite3.connect(db_filename, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def backoff_delay(attempts):
+    """How long to leave a listing alone after its attempts-th failure"""
+    minutes = BACKOFF_BASE_MINUTES * 2 ** (attempts - 1)
+    return timedelta(minutes=min(minutes, BACKOFF_MAX_HOURS * 60))
+
+
+def record_failure(conn, cache_key, reason, alert_desc=None, now=None):
+    """Count a failed PDP attempt and schedule the next one. Returns the updated row.
+    reason must be one of REASONS.
+    """
+    if reason not in REASONS:
+        raise ValueError(f"Unknown failure reason '{reason}', expected one of {REASONS}")
+    now = now or datetime.utcnow()
+    row = conn.execute("SELECT * FROM pdp_failures WHERE cache_key = ?", (cache_key,)).fetchone()
+    attempts = (row["attempts"] if row else 0) + 1
+    reasons = json.loads(row["reasons"]) if row else {}
+    reasons[reason] = reasons.get(reason, 0) + 1
+    with conn:
+        conn.execute(
+            """
+            INSERT INTO pdp_failures
+                (cache_key, alert_desc, attempts, reasons, last_reason,
+                 first_failed_at, last_failed_at, retry_after, quarantined)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(cache_key) DO UPDATE SET
+                alert_desc = COALESCE(excluded.alert_desc, alert_desc),
+                attempts = excluded.attempts,
+                reasons = excluded.reasons,
+                last_reason = excluded.last_reason,
+                last_failed_at = excluded.last_failed_at,
+                retry_after = excluded.retry_after,
+                quarantined = excluded.quarantined
+            """,
+            (cache_key, alert_desc, attempts, json.dumps(reasons), reason,
+             now.isoformat(), now.isoformat(), (now + backoff_delay(attempts)).isoformat(),
+             int(attempts >= QUARANTINE_AFTER)),
+        )
+    return conn.execute("SELECT * FROM pdp_failures WHERE cache_key = ?", (cache_key,)).fetchone()
+
+
+def record_success(conn, cache_key):
+    """The listing scraped fine - forget its failures"""
+    with conn:
+        conn.execute("DELETE FROM pdp_failures WHERE cache_key = ?", (cache_key,))
+
+
+def blocked_keys(conn, now=None):
+    """Cache keys to skip right now: quarantined or still inside their backoff"""
+    now = (now or datetime.utcnow()).isoformat()
+    return {row[0] for row in conn.execute(
+        "SELECT cache_key FROM pdp_failures WHERE quarantined = 1 OR retry_after > ?", (now,)
+    )}
+
+
+def is_blocked(conn, cache_key, now=None):
+    """Whether one listing is to be skipped right now (see blocked_keys)"""
+    now = (now or datetime.utcnow()).isoformat()
+    return conn.execute(
+        "SELECT 1 FROM pdp_failures WHERE cache_key = ? AND (quarantined = 1 OR retry_after > ?)", (cache_key, now)
+    ).fetchone() is not None
+
+
+def release(conn, cache_keys=None):
+    """Clear quarantine and backoff (for the given keys, or all); returns how many were released"""
+    with conn:
+        if cache_keys is None:
+            return conn.execute("DELETE FROM pdp_failures").rowcount
+        return conn.executemany(
+            "DELETE FROM pdp_failures WHERE cache_key = ?", [(key,) for key in cache_keys]
+        ).rowcount
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or release listings with failing PDPs")
+    parser.add_argument("--db", default=DB_FILENAME)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="Quarantined listings and listings in backoff")
+    release_parser = sub.add_parser("release", help="Let listings be retried on the next run")
+    release_parser.add_argument("cache_keys", nargs="*")
+    release_parser.add_argument("--all", action="store_true", help="Release every listing in the ledger")
+    cli = parser.parse_args()
+
+    conn = open_ledger(cli.db)
+    if cli.command == "status":
+        now = datetime.utcnow().isoformat()
+        rows = conn.execute("SELECT * FROM pdp_failures ORDER BY quarantined DESC, last_failed_at DESC").fetchall()
+        quarantined = [r for r in rows if r["quarantined"]]
+        backing_off = [r for r in rows if not r["quarantined"] and r["retry_after"] > now]
+        print(f"🚫 Quarantined: {len(quarantined)}")
+        for r in quarantined:
+            print(f"  {r['cache_key']}  {r['attempts']} failures {r['reasons']}")
+        print(f"⏳ In backoff: {len(backing_off)}")
+        for r in backing_off:
+            print(f"  {r['cache_key']}  {r['attempts']} failure(s), last {r['last_reason']}, retry after {r['retry_after'][:16]}")
+    elif cli.command == "release":
+        if not cli.all and not cli.cache_keys:
+            parser.error("give cache keys to release, or --all")
+        n = release(conn, None if cli.all else cli.cache_keys)
+        print(f"♻️ Released {n} listing(s)")
+    conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
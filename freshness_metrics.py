@@ -0,0 +1,217 @@
+"""
+Freshness-lag metrics: how long from an alert going live to its listing being persisted.
+
+A card's live_time is only "Tuesday at 4:00 PM" in the device's local time.
+resolve_live_time() anchors it to the scrape time in the device timezone, so
+every persisted listing gets an absolute live_at and a lag. Lags that can't be
+right - live_at clearly after the scrape, or more than a day before it, both
+signs of a wrong device timezone - are stored as unresolved and counted apart
+instead of skewing the percentiles. Rolling p50 / p95 /
+p99 lag, the enrichment backlog size and listings-per-minute throughput are
+computed over a window and written to freshness_metrics.json after each flush;
+sync_server.py serves the same numbers at /metrics.
+
+The SLO is "p95 lag within --slo-seconds"; every scheduling or performance
+change can be judged by whether it moves these numbers.
+
+Usage:
+    python freshness_metrics.py report
+    python freshness_metrics.py report --window-minutes 240 --slo-seconds 900
+"""
+import argparse
+import json
+import math
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
+
+from listing_parsing import LIVE_TIME_CLOCK_SKEW, resolve_live_time
+from listing_store import DB_FILENAME
+
+METRICS_FILENAME = "freshness_metrics.json"
+
+DEFAULT_WINDOW_MINUTES = 60
+
+# Target: 95% of listings persisted within this many seconds of going live
+DEFAULT_SLO_SECONDS = 600
+SLO_PERCENTILE = 95
+
+# Longer lags are taken as a mis-resolved live time (alerts are scraped within hours)
+MAX_LAG_SECONDS = 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS freshness (
+    cache_key TEXT PRIMARY KEY,
+    live_at TEXT,             -- UTC, resolved from live_time
+    scraped_at TEXT,          -- UTC
+    persisted_at TEXT NOT NULL,  -- UTC, first time the listing reached the CSV / store
+    lag_seconds REAL          -- persisted_at - live_at, NULL if unresolved
+);
+CREATE INDEX IF NOT EXISTS idx_freshness_persisted ON freshness (persisted_at);
+"""
+
+
+def open_metrics(db_filename=DB_FILENAME):
+    """Open (and create if needed) the freshness table"""
+    conn = sqlite3.connect(db_filename, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _as_utc(value):
+    """Naive-UTC datetime or ISO string (as written by the scraper) -> aware UTC datetime"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def resolved_lag(live_at, persisted_at):
+    """Lag in seconds, or None when it can't be right (live time after persisting or over a day back)"""
+    if live_at is None:
+        return None
+    lag = (persisted_at - live_at).total_seconds()
+    if lag < -LIVE_TIME_CLOCK_SKEW.total_seconds() or lag > MAX_LAG_SECONDS:
+        return None
+    return max(0.0, lag)
+
+
+def record_persisted(conn, listings, device_tz, persisted_at=None):
+    """Record the lag of listings persisted for the first time; returns their resolved lags in seconds.
+    listings: scraper rows (live_time, cache_key, scraped_at as naive UTC).
+    device_tz: tzinfo the device shows live times in.
+    """
+    persisted_at = _as_utc(persisted_at or datetime.utcnow())
+    lags = []
+    with conn:
+        for listing in listings:
+            if not listing.get("cache_key"):
+                continue
+            scraped_at = _as_utc(listing.get("scraped_at")) or persisted_at
+            live_at = resolve_live_time(listing.get("live_time"), scraped_at.astimezone(device_tz))
+            lag = resolved_lag(live_at, persisted_at)
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO freshness (cache_key, live_at, scraped_at, persisted_at, lag_seconds) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (listing["cache_key"],
+                 live_at.astimezone(timezone.utc).replace(tzinfo=None).isoformat() if live_at else None,
+                 scraped_at.replace(tzinfo=None).isoformat(),
+                 persisted_at.replace(tzinfo=None).isoformat(),
+                 lag),
+            )
+            if cursor.rowcount and lag is not None:
+                lags.append(lag)
+    return lags
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a sorted list (None if empty)"""
+    if not values:
+        return None
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+
+def backlog_size(conn):
+    """Alerts discovered but not yet enriched (0 if the two-tier crawl was never used)"""
+    if not conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'enrichment_backlog'"
+    ).fetchone():
+        return 0
+    return conn.execute(
+        "SELECT COUNT(*) FROM enrichment_backlog WHERE status IN ('pending', 'claimed')"
+    ).fetchone()[0]
+
+
+def compute_metrics(conn, window_minutes=DEFAULT_WINDOW_MINUTES, slo_seconds=DEFAULT_SLO_SECONDS, now=None):
+    """Rolling freshness metrics over the last window_minutes"""
+    now = now or datetime.utcnow()
+    since = (now - timedelta(minutes=window_minutes)).isoformat()
+    persisted = conn.execute(
+        "SELECT COUNT(*) FROM freshness WHERE persisted_at >= ?", (since,)
+    ).fetchone()[0]
+    lags = [row[0] for row in conn.execute(
+        "SELECT lag_seconds FROM freshness WHERE persisted_at >= ? AND lag_seconds IS NOT NULL "
+        "ORDER BY lag_seconds", (since,)
+    )]
+    unresolved = conn.execute(
+        "SELECT COUNT(*) FROM freshness WHERE persisted_at >= ? AND lag_seconds IS NULL", (since,)
+    ).fetchone()[0]
+    slo_lag = percentile(lags, SLO_PERCENTILE)
+    return {
+        "generated_at": now.isoformat(),
+        "window_minutes": window_minutes,
+        "listings_persisted": persisted,
+        "lag_unresolved": unresolved,
+        "lag_p50_seconds": percentile(lags, 50),
+        "lag_p95_seconds": slo_lag,
+        "lag_p99_seconds": percentile(lags, 99),
+        "lag_max_seconds": lags[-1] if lags else None,
+        "throughput_per_minute": round(persisted / window_minutes, 3),
+        "backlog_size": backlog_size(conn),
+        "slo_seconds": slo_seconds,
+        "slo_within_ratio": round(sum(1 for lag in lags if lag <= slo_seconds) / len(lags), 4) if lags else None,
+        "slo_met": slo_lag <= slo_seconds if slo_lag is not None else None,
+    }
+
+
+def write_metrics_file(metrics, filename=METRICS_FILENAME):
+    """Atomically replace the metrics snapshot other tools read"""
+    tmp_filename = filename + ".tmp"
+    with open(tmp_filename, "w", encoding="utf-8") as f:
+        json.dump(metrics, f, indent=2)
+    os.replace(tmp_filename, filename)
+
+
+def prometheus_text(metrics):
+    """Metrics in Prometheus text exposition format"""
+    lines = []
+    for name, value in metrics.items():
+        if isinstance(value, bool):
+            value = int(value)
+        if isinstance(value, (int, float)):
+            lines.append(f"# TYPE freshness_{name} gauge")
+            lines.append(f"freshness_{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def _fmt_minutes(seconds):
+    return f"{seconds / 60:.1f} min" if seconds is not None else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Freshness-lag SLO metrics")
+    parser.add_argument("--db", default=DB_FILENAME)
+    sub = parser.add_subparsers(dest="command", required=True)
+    report_parser = sub.add_parser("report", help="Rolling lag percentiles, backlog and throughput")
+    report_parser.add_argument("--window-minutes", type=float, default=DEFAULT_WINDOW_MINUTES)
+    report_parser.add_argument("--slo-seconds", type=float, default=DEFAULT_SLO_SECONDS)
+    report_parser.add_argument("--json", action="store_true", help="Print the raw metrics JSON")
+    cli = parser.parse_args()
+
+    conn = open_metrics(cli.db)
+    metrics = compute_metrics(conn, cli.window_minutes, cli.slo_seconds)
+    conn.close()
+
+    if cli.json:
+        print(json.dumps(metrics, indent=2))
+        return 0
+    print(f"⏱️ Freshness over the last {cli.window_minutes:g} min")
+    print(f"  Listings persisted: {metrics['listings_persisted']} "
+          f"({metrics['throughput_per_minute']:.2f}/min)")
+    print(f"  Lag p50 / p95 / p99: {_fmt_minutes(metrics['lag_p50_seconds'])} / "
+          f"{_fmt_minutes(metrics['lag_p95_seconds'])} / {_fmt_minutes(metrics['lag_p99_seconds'])}")
+    if metrics["lag_unresolved"]:
+        print(f"  ⚠️ Unresolved lags: {metrics['lag_unresolved']} (check the device timezone)")
+    print(f"  Backlog: {metrics['backlog_size']}")
+    if metrics["slo_met"] is not None:
+        status = "✅ met" if metrics["slo_met"] else "❌ missed"
+        print(f"  SLO p{SLO_PERCENTILE} <= {_fmt_minutes(cli.slo_seconds)}: {status} "
+              f"({metrics['slo_within_ratio']:.0%} within)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Per-device latency model behind the scraper's waits.
+
+Waits are polls against a condition instead of fixed sleeps. Poll interval and
+deadline come from latencies observed on the device, persisted across runs by
+the scraper (device_latency_model.json). Only the most recent samples are kept
+so the model follows app updates.
+
+Nothing in here talks to Appium - conditions are plain callables, so the model
+can be unit tested with a fake clock.
+"""
+import time
+
+LATENCY_SAMPLE_WINDOW = 200
+LATENCY_MIN_SAMPLES = 5
+
+# Deadline = DEADLINE_FACTOR x p99, never above DEADLINE_CAP x the hand-tuned default
+DEADLINE_FACTOR = 1.5
+DEADLINE_CAP = 3
+
+
+class LatencyModel:
+    """Latency samples per action, with learned deadlines and poll intervals
+
+    defaults: action -> hand-tuned wait (seconds) used until enough samples exist
+    samples: action -> observed latencies (seconds), e.g. loaded from disk
+    """
+
+    def __init__(self, defaults, samples=None):
+        self.defaults = defaults
+        self.samples = samples if samples is not None else {}
+
+    def record(self, action, seconds):
+        """Add one observation, keeping only the most recent window"""
+        samples = self.samples.setdefault(action, [])
+        samples.append(round(seconds, 3))
+        if len(samples) > LATENCY_SAMPLE_WINDOW:
+            del samples[:len(samples) - LATENCY_SAMPLE_WINDOW]
+
+    def percentile(self, action, pct):
+        """Observed latency percentile for an action, or None if too few samples"""
+        samples = self.samples.get(action, [])
+        if len(samples) < LATENCY_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def deadline(self, action):
+        """How long to wait for an action before giving up: 1.5 x p99, capped at 3x the default"""
+        default = self.defaults[action]
+        p99 = self.percentile(action, 99)
+        if p99 is None:
+            return default
+        return min(max(p99 * DEADLINE_FACTOR, 0.5), default * DEADLINE_CAP)
+
+    def poll_interval(self, action):
+        """Poll often enough to notice completion within ~20% of the typical latency"""
+        p50 = self.percentile(action, 50)
+        if p50 is None:
+            p50 = self.defaults[action] / 2
+        return min(max(p50 / 5, 0.1), 1.0)
+
+    def expected(self, action):
+        """Typical (p50) latency for an action, or the default wait"""
+        p50 = self.percentile(action, 50)
+        return p50 if p50 is not None else self.defaults[action]
+
+    def wait_for(self, action, condition, scale=1.0, censor_on_timeout=True,
+                 clock=time.perf_counter, sleep=time.sleep):
+        """Poll condition() until true or the learned deadline passes; record the latency.
+        censor_on_timeout: on timeout, record the deadline as a (censored) sample so the
+        deadline can grow. Pass False where "nothing happened" is a normal outcome (an idle
+        refresh) - otherwise every such wait pushes the deadline up to its cap.
+        """
+        deadline = self.deadline(action) * scale
+        interval = self.poll_interval(action)
+        start = clock()
+
+        while True:
+            try:
+                if condition():
+                    self.record(action, clock() - start)
+                    return True
+            except Exception:
+                pass
+
+            if clock() - start + interval > deadline:
+                if censor_on_timeout:
+                    # Censored sample: it took at least this long, lets the deadline grow
+                    self.record(action, deadline)
+                print(f"  ⏱️ {action} not done after {deadline:.1f}s")
+                return False
+            sleep(interval)
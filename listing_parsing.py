@@ -0,0 +1,317 @@
+"""
+Driver-free parsing and dedup helpers shared by the scraper and the offline tools.
+
+Nothing in here talks to Appium - every function takes plain strings / lists
+so it can be benchmarked (benchmarks/bench_parsing.py) and re-run offline.
+"""
+import re
+from datetime import timedelta
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+EMIRATES = ["Dubai", "Abu Dhabi", "Sharjah", "Ajman", "Ras Al Khaimah", "Fujairah", "Umm Al Quwain"]
+
+# Fields filled from PDP TextViews by parse_header_texts
+HEADER_FIELDS = [
+    "title", "ref", "location", "mileage", "specs", "transmission", "engine_capacity",
+    "seller_expectation", "current_bid", "auction_status", "auction_end_date",
+]
+
+
+# ==================================================
+# GENERATE CACHE KEY
+# ==================================================
+def generate_cache_key(title, live_time):
+    """Generate composite cache key from title and live time
+    Format: 2019_Lincoln_MKZ_Premiere_Tuesday_4:00PM
+    """
+    if not title or not live_time:
+        return None
+
+    # Clean title: replace spaces with underscores, remove special chars
+    clean_title = re.sub(r'[^\w\s]', '', title.strip())  # Remove special chars
+    clean_title = re.sub(r'\s+', '_', clean_title)  # Replace spaces with underscores
+
+    # Clean time: "Tuesday at 4:00 PM" -> "Tuesday_4:00PM"
+    clean_time = live_time.strip()
+    clean_time = clean_time.replace(' at ', '_')  # "Tuesday at 4:00 PM" -> "Tuesday_4:00 PM"
+    clean_time = clean_time.replace(' ', '')  # "Tuesday_4:00 PM" -> "Tuesday_4:00PM"
+    clean_time = clean_time.replace(':', '')  # "Tuesday_400PM" -> "Tuesday_400PM"
+
+    return f"{clean_title}_{clean_time}"
+
+
+# ==================================================
+# ALERT DESCRIPTIONS
+# ==================================================
+def extract_live_time(text):
+    """Extract 'Tuesday at 3:41 PM' from alert / notification text (None if absent)"""
+    time_match = re.search(r'((?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\s+at\s+\d{1,2}:\d{2}\s+(?:AM|PM))', text)
+    return time_match.group(1) if time_match else None
+
+
+LIVE_TIME_PARTS_PATTERN = re.compile(r'(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\s+at\s+(\d{1,2}):(\d{2})\s+(AM|PM)')
+
+# Device clock vs scrape clock drift tolerated for a live time slightly after the scrape
+LIVE_TIME_CLOCK_SKEW = timedelta(minutes=5)
+
+# A live time up to this far after the reference is taken as (skewed or mis-zoned) today,
+# not as last week - wrapping it would turn minutes of lag into days
+LIVE_TIME_MAX_AHEAD = timedelta(hours=12)
+
+
+def parse_live_time_parts(live_time):
+    """'Tuesday at 4:00 PM' -> (weekday index, hour 0-23, minute), None if it doesn't parse"""
+    match = LIVE_TIME_PARTS_PATTERN.search(live_time or "")
+    if not match:
+        return None
+    weekday, hour, minute, meridiem = match.groups()
+    return WEEKDAYS.index(weekday), int(hour) % 12 + (12 if meridiem == "PM" else 0), int(minute)
+
+
+def resolve_live_time(live_time, reference):
+    """'Tuesday at 4:00 PM' -> the latest such moment not more than LIVE_TIME_MAX_AHEAD after reference
+    reference: timezone-aware datetime in the device's timezone (the scrape time).
+    Returns an aware datetime in the same timezone, None if live_time doesn't parse.
+    A live time a little after reference (clock skew, wrong timezone) resolves to that
+    near-future moment, not to last week; callers decide what a negative lag means.
+    """
+    parts = parse_live_time_parts(live_time)
+    if parts is None:
+        return None
+    weekday, hour, minute = parts
+
+    days_back = (reference.weekday() - weekday) % 7
+    candidate = (reference - timedelta(days=days_back)).replace(
+        hour=hour, minute=minute, second=0, microsecond=0)
+    if candidate > reference + LIVE_TIME_MAX_AHEAD:
+        candidate -= timedelta(days=7)
+    elif candidate + timedelta(days=7) <= reference + LIVE_TIME_MAX_AHEAD:
+        candidate += timedelta(days=7)
+    return candidate
+
+
+def parse_alert_description(alert_desc):
+    """Extract (title, live_time) from '<title> is now Live ... <weekday> at <time>' text
+    Works for alert card content-desc and push notification text alike.
+    Returns (None, None) if the text is not a "now Live" alert.
+    """
+    # Extract title (everything before "is now Live")
+    title_match = re.search(r'^(.+?)\s+is now Live', alert_desc)
+    # Extract time
+    live_time = extract_live_time(alert_desc)
+
+    if title_match and live_time:
+        return title_match.group(1).strip(), live_time
+    return None, None
+
+
+def extract_cache_keys_from_alerts(live_alerts):
+    """Extract cache keys from (card, description) pairs without opening them"""
+    cache_keys = []
+    for _, alert_desc in live_alerts:
+        title, live_time = parse_alert_description(alert_desc)
+        if title and live_time:
+            cache_key = generate_cache_key(title, live_time)
+            cache_keys.append((cache_key, alert_desc))
+
+    return cache_keys
+
+
+# ==================================================
+# ALERT EVENTS
+# ==================================================
+# Every alert card on the list becomes a typed event. Patterns are tried in
+# registration order; the first match wins. Named groups: title (required),
+# optional amount / live_time are picked up from the whole text.
+ALERT_EVENT_TYPES = []
+
+AMOUNT_PATTERN = re.compile(r'AED\s*([\d,]+)')
+
+
+def register_alert_type(event_type, pattern, flags=re.IGNORECASE):
+    """Add a parser for one alert card type (pattern must have a 'title' group)"""
+    compiled = re.compile(pattern, flags)
+    if "title" not in compiled.groupindex:
+        raise ValueError(f"Pattern for '{event_type}' needs a (?P<title>...) group")
+    ALERT_EVENT_TYPES.append((event_type, compiled))
+
+
+register_alert_type("live", r'^(?P<title>.+?)\s+is now Live', 0)
+register_alert_type("outbid", r"\boutbid on (?:the\s+)?(?P<title>.+?)(?=\s*[.,!:]\s|\s+-\s|\s*$)")
+register_alert_type("auction_ended", r'^(?P<title>.+?)\s+auction\s+(?:has\s+)?ended')
+register_alert_type("auction_ending", r'^Auction for (?P<title>.+?)\s+(?:ends in|is ending)\b')
+register_alert_type("auction_ending", r'^(?P<title>.+?)\s+(?:auction\s+)?(?:is\s+)?(?:ending soon|ends in)\b')
+register_alert_type("price_update", r'^(?P<title>.+?)\s+(?:price|seller expectation)\s+(?:has\s+)?(?:been\s+)?(?:changed|updated|reduced|dropped)')
+register_alert_type("bid_update", r'^(?P<title>.+?)\s+has a new (?:highest\s+)?bid')
+
+
+def parse_alert_event(alert_desc):
+    """Alert card text -> {"type", "title", "amount", "live_time", "alert_desc"}
+    type is "unknown" (title None) when no registered pattern matches.
+    """
+    event = {"type": "unknown", "title": None, "amount": None,
+             "live_time": extract_live_time(alert_desc), "alert_desc": alert_desc}
+    for event_type, pattern in ALERT_EVENT_TYPES:
+        match = pattern.search(alert_desc)
+        if match:
+            event["type"] = event_type
+            event["title"] = match.group("title").strip()
+            break
+    amount = AMOUNT_PATTERN.search(alert_desc)
+    if amount:
+        event["amount"] = int(amount.group(1).replace(",", ""))
+    return event
+
+
+def parse_alert_events(alert_descs):
+    """One pass over a screen's (or sweep's) card texts -> typed events, same order"""
+    return [parse_alert_event(desc) for desc in alert_descs if desc]
+
+
+# ==================================================
+# PDP HEADER
+# ==================================================
+def parse_header_texts(texts, fields=None):
+    """Fill header fields from the PDP's TextView texts (in screen order)
+    texts: raw .text values, None for views that could not be read.
+    fields: dict to fill (values already set are kept, like on a re-capture).
+    Returns the fields dict.
+    """
+    if fields is None:
+        fields = {name: None for name in HEADER_FIELDS}
+
+    for i in range(len(texts)):
+        txt = (texts[i] or "").strip()
+        if not txt:
+            continue
+
+        # Title & Ref
+        if not fields["title"] and txt.startswith("Ref") and i > 0:
+            fields["ref"] = txt
+            fields["title"] = texts[i - 1]
+
+        # Location
+        if not fields["location"] and txt in EMIRATES:
+            fields["location"] = txt
+
+        # Mileage
+        if not fields["mileage"] and "km" in txt and not txt.startswith("|"):
+            fields["mileage"] = txt
+
+        # Specs
+        if not fields["specs"] and ("GCC Specs" in txt or "American Specs" in txt or "European Specs" in txt or "others" in txt):
+            fields["specs"] = txt.replace("|", "").strip()
+
+        # Transmission
+        if not fields["transmission"] and ("Automatic" in txt or "Manual" in txt) and "|" in txt:
+            fields["transmission"] = txt.replace("|", "").strip()
+
+        # Engine Capacity
+        if not fields["engine_capacity"] and "cc" in txt and "|" in txt:
+            fields["engine_capacity"] = txt.replace("|", "").strip()
+
+        # Seller Expectation
+        if txt == "Seller Expectation" and i > 0:
+            fields["seller_expectation"] = texts[i - 1]
+
+        # Current Bid
+        if txt == "Current Bid" and i > 0:
+            fields["current_bid"] = texts[i - 1]
+
+        # Auction Status & End Date
+        if txt == "Auction ended" and i + 1 < len(texts):
+            fields["auction_status"] = "Ended"
+            fields["auction_end_date"] = texts[i + 1]
+
+    return fields
+
+
+# ==================================================
+# FULL PDP
+# ==================================================
+# Detail rows below the fold: field -> label TextView; the value is the TextView after it
+PDP_DETAIL_FIELDS = {
+    "body_type": "Body Type",
+    "exterior_color": "Exterior Color",
+    "interior_color": "Interior Color",
+    "fuel_type": "Fuel Type",
+    "cylinders": "Cylinders",
+    "doors": "Doors",
+    "number_of_keys": "Number of Keys",
+    "service_history": "Service History",
+    "accident_history": "Accident History",
+}
+
+
+def parse_detail_texts(texts, fields=None, labels=None):
+    """Fill detail fields from label / value TextView pairs (values already set are kept)"""
+    labels = labels or PDP_DETAIL_FIELDS
+    if fields is None:
+        fields = {name: None for name in labels}
+    by_label = {label: name for name, label in labels.items()}
+
+    for i in range(len(texts) - 1):
+        name = by_label.get((texts[i] or "").strip())
+        if name and not fields.get(name):
+            value = (texts[i + 1] or "").strip()
+            if value and value not in by_label:
+                fields[name] = value
+    return fields
+
+
+# Auction countdowns ("2h 10m 5s") tick between two reads of the same screen
+COUNTDOWN_PATTERN = re.compile(r'\b\d+[dhms]\b(?:[\s:]*\d+[dhms]\b)*')
+
+
+def normalize_countdowns(texts):
+    """Texts with every countdown replaced by a placeholder, for comparing two reads of a screen"""
+    return [COUNTDOWN_PATTERN.sub("#", text) if text else text for text in texts]
+
+
+def merge_snapshot(merged, previous, snapshot):
+    """Append the part of a scrolled PDP snapshot not already in `merged` (in place).
+    previous: the snapshot before this scroll. Texts shared at the same position from
+    the top / bottom of both snapshots are sticky bars, not content, and are skipped.
+    Countdowns are compared with their digits ignored, so a tick is not new content.
+    Returns the number of texts added - 0 means the page did not move (end of page).
+    """
+    merged_keys = normalize_countdowns(merged)
+    previous = normalize_countdowns(previous)
+    keys = normalize_countdowns(snapshot)
+    if keys == previous:
+        return 0
+
+    start = 0
+    while start < min(len(previous), len(keys)) and previous[start] == keys[start]:
+        start += 1
+    end = len(keys)
+    while (end > start and len(keys) - end < len(previous) - start
+           and previous[len(previous) - len(keys) + end - 1] == keys[end - 1]):
+        end -= 1
+    body = keys[start:end]
+    footer = keys[end:]
+    if footer and merged_keys[-len(footer):] == footer:
+        del merged[-len(footer):]
+        del merged_keys[-len(footer):]
+
+    # Longest tail of `merged` that the new body starts with = overlap with what we already have
+    overlap = 0
+    for k in range(min(len(merged_keys), len(body)), 0, -1):
+        if merged_keys[-k:] == body[:k]:
+            overlap = k
+            break
+    added = snapshot[start + overlap:end]
+    merged.extend(added)
+    return len(added)
+
+
+# ==================================================
+# MERGE WITH HISTORY
+# ==================================================
+def merge_listing_frames(existing_df, new_df):
+    """Append new listings to the history, keeping the first row per cache_key"""
+    import pandas as pd
+
+    df = pd.concat([existing_df, new_df], ignore_index=True)
+    return df.drop_duplicates(subset=['cache_key'], keep='first')
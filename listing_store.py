@@ -0,0 +1,485 @@
+"""
+Indexed local listing store and query CLI.
+
+Keeps every scraped listing in a SQLite database next to the CSV cache, with
+the price / mileage / year / end-date strings parsed once on insert, secondary
+indexes on the fields dashboards filter by, and per-make / location / year
+aggregates maintained incrementally as listings are upserted.
+
+Usage:
+    python listing_store.py sync                       # import new rows from the CSV cache
+    python listing_store.py find --make Toyota --min-year 2019 --max-bid 50000 --location Dubai
+    python listing_store.py stats --by make            # bid-to-expectation ratio by make
+"""
+import argparse
+import csv
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+from listing_parsing import generate_cache_key
+
+DB_FILENAME = "car_listings.db"
+CSV_FILENAME = "car_listings_cache.csv"
+
+# Columns as written by the scraper (same order as the CSV cache)
+LISTING_COLUMNS = [
+    "title", "ref", "location", "mileage", "specs", "transmission", "engine_capacity",
+    "seller_expectation", "current_bid", "auction_status", "auction_end_date",
+    "live_time", "cache_key", "scraped_at", "details",
+]
+
+# Values derived from the raw strings on insert
+PARSED_COLUMNS = [
+    "year", "make", "model", "mileage_km", "engine_cc",
+    "seller_expectation_aed", "current_bid_aed", "auction_end_at",
+]
+
+# Dimensions with precomputed aggregates
+AGGREGATE_DIMENSIONS = ["make", "location", "year"]
+
+# Makes whose name is more than one word in the listing title
+MULTI_WORD_MAKES = [
+    "Land Rover", "Alfa Romeo", "Aston Martin", "Rolls Royce", "Great Wall",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    cache_key TEXT PRIMARY KEY,
+    title TEXT, ref TEXT, location TEXT, mileage TEXT, specs TEXT, transmission TEXT,
+    engine_capacity TEXT, seller_expectation TEXT, current_bid TEXT, auction_status TEXT,
+    auction_end_date TEXT, live_time TEXT, scraped_at TEXT,
+    details TEXT,                     -- JSON of below-the-fold fields (--full-pdp)
+    year INTEGER, make TEXT, model TEXT, mileage_km INTEGER, engine_cc INTEGER,
+    seller_expectation_aed INTEGER, current_bid_aed INTEGER, auction_end_at TEXT,
+    seq INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_listings_make_model_year ON listings (make, model, year);
+CREATE INDEX IF NOT EXISTS idx_listings_year ON listings (year);
+CREATE INDEX IF NOT EXISTS idx_listings_location ON listings (location);
+CREATE INDEX IF NOT EXISTS idx_listings_current_bid ON listings (current_bid_aed);
+CREATE INDEX IF NOT EXISTS idx_listings_seller_expectation ON listings (seller_expectation_aed);
+CREATE INDEX IF NOT EXISTS idx_listings_auction_end ON listings (auction_end_at);
+CREATE INDEX IF NOT EXISTS idx_listings_title ON listings (title);
+
+CREATE TABLE IF NOT EXISTS alert_events (
+    alert_desc TEXT PRIMARY KEY,      -- card text; an event is applied once
+    event_type TEXT NOT NULL,
+    title TEXT,
+    amount_aed INTEGER,
+    cache_key TEXT,                   -- listing it was applied to
+    applied_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS aggregates (
+    dimension TEXT NOT NULL,
+    key TEXT NOT NULL,
+    listing_count INTEGER NOT NULL DEFAULT 0,
+    bid_count INTEGER NOT NULL DEFAULT 0,
+    bid_sum INTEGER NOT NULL DEFAULT 0,
+    expectation_count INTEGER NOT NULL DEFAULT 0,
+    expectation_sum INTEGER NOT NULL DEFAULT 0,
+    ratio_count INTEGER NOT NULL DEFAULT 0,
+    ratio_sum REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (dimension, key)
+);
+"""
+
+
+# ==================================================
+# FIELD PARSING
+# ==================================================
+def parse_aed(value):
+    """'AED 49,050' -> 49050 (None if no number)"""
+    if not value:
+        return None
+    digits = re.sub(r'[^\d]', '', str(value))
+    return int(digits) if digits else None
+
+
+def parse_number(value):
+    """'56,766 km' / '2000 cc' -> int (None if no number)"""
+    if not value:
+        return None
+    match = re.search(r'\d[\d,]*', str(value))
+    return int(match.group(0).replace(",", "")) if match else None
+
+
+def parse_title(title):
+    """'2019 Lincoln MKZ Premiere' -> (2019, 'Lincoln', 'MKZ')"""
+    if not title:
+        return None, None, None
+    words = str(title).split()
+    year = None
+    if words and re.fullmatch(r'(19|20)\d{2}', words[0]):
+        year = int(words[0])
+        words = words[1:]
+    if not words:
+        return year, None, None
+
+    for make in MULTI_WORD_MAKES:
+        n = len(make.split())
+        if " ".join(words[:n]).lower() == make.lower():
+            return year, " ".join(words[:n]), (words[n] if len(words) > n else None)
+
+    # Hyphenated makes ("Mercedes-Benz") are a single word already
+    return year, words[0], (words[1] if len(words) > 1 else None)
+
+
+def parse_auction_end(value):
+    """'Jan 27, 2026  at 4:20 PM' -> '2026-01-27T16:20:00' (None if unparseable)"""
+    if not value:
+        return None
+    cleaned = re.sub(r'\s+', ' ', str(value)).strip()
+    try:
+        return datetime.strptime(cleaned, "%b %d, %Y at %I:%M %p").isoformat()
+    except ValueError:
+        return None
+
+
+def parse_listing(listing):
+    """Raw scraper row -> dict with raw and parsed columns"""
+    row = {col: listing.get(col) for col in LISTING_COLUMNS}
+    for col in LISTING_COLUMNS:
+        value = row[col]
+        if value is None or (isinstance(value, float) and value != value):  # NaN from pandas
+            row[col] = None
+        else:
+            row[col] = str(value)
+
+    year, make, model = parse_title(row["title"])
+    row.update({
+        "year": year,
+        "make": make,
+        "model": model,
+        "mileage_km": parse_number(row["mileage"]),
+        "engine_cc": parse_number(row["engine_capacity"]),
+        "seller_expectation_aed": parse_aed(row["seller_expectation"]),
+        "current_bid_aed": parse_aed(row["current_bid"]),
+        "auction_end_at": parse_auction_end(row["auction_end_date"]),
+    })
+    return row
+
+
+# ==================================================
+# STORE
+# ==================================================
+def open_store(db_filename=DB_FILENAME, create=True):
+    """Open the listing store; create=True also creates / migrates the schema"""
+    conn = sqlite3.connect(db_filename, timeout=30)
+    conn.row_factory = sqlite3.Row
+    if create:
+        conn.executescript(SCHEMA)
+        _migrate(conn)
+    return conn
+
+
+def _migrate(conn):
+    """Bring stores created by older versions up to the current schema"""
+    columns = {r["name"] for r in conn.execute("PRAGMA table_info(listings)")}
+    if "seq" not in columns:
+        # Change sequence for incremental sync - existing rows keep insertion order
+        with conn:
+            conn.execute("ALTER TABLE listings ADD COLUMN seq INTEGER")
+            conn.execute("UPDATE listings SET seq = rowid")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_listings_seq ON listings (seq)")
+    if "details" not in columns:
+        with conn:
+            conn.execute("ALTER TABLE listings ADD COLUMN details TEXT")
+
+
+def current_seq(conn):
+    """Highest change sequence number in the store (0 if empty) - an index lookup, no scan"""
+    return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM listings").fetchone()[0]
+
+
+def _aggregate_delta(conn, row, sign):
+    """Add (sign=1) or remove (sign=-1) one listing's contribution to the aggregates"""
+    bid = row["current_bid_aed"]
+    expectation = row["seller_expectation_aed"]
+    ratio = bid / expectation if bid is not None and expectation else None
+
+    for dimension in AGGREGATE_DIMENSIONS:
+        key = row[dimension]
+        if key is None:
+            continue
+        conn.execute(
+            """
+            INSERT INTO aggregates (dimension, key) VALUES (?, ?)
+            ON CONFLICT (dimension, key) DO NOTHING
+            """,
+            (dimension, str(key)),
+        )
+        conn.execute(
+            """
+            UPDATE aggregates SET
+                listing_count = listing_count + ?,
+                bid_count = bid_count + ?, bid_sum = bid_sum + ?,
+                expectation_count = expectation_count + ?, expectation_sum = expectation_sum + ?,
+                ratio_count = ratio_count + ?, ratio_sum = ratio_sum + ?
+            WHERE dimension = ? AND key = ?
+            """,
+            (
+                sign,
+                sign if bid is not None else 0, sign * (bid or 0),
+                sign if expectation is not None else 0, sign * (expectation or 0),
+                sign if ratio is not None else 0, sign * (ratio or 0.0),
+                dimension, str(key),
+            ),
+        )
+
+
+def upsert_listings(conn, listings, preserve=()):
+    """Insert or update listings by cache_key, keeping aggregates in step.
+    Every inserted or changed row gets the next change sequence number.
+    preserve: raw columns to keep from the stored row when the listing exists already
+    (EVENT_OWNED_COLUMNS for scraper / CSV rows, which may predate applied alert events).
+    Returns the number of rows inserted or changed.
+    """
+    columns = LISTING_COLUMNS + PARSED_COLUMNS
+    placeholders = ", ".join("?" for _ in columns)
+    updates = ", ".join(f"{c} = excluded.{c}" for c in columns + ["seq"] if c != "cache_key")
+
+    changed = 0
+    with conn:
+        # Take the write lock before reading MAX(seq): in a deferred transaction two
+        # writers (startup pipeline, drain, sync server) could read the same MAX
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        seq = current_seq(conn)
+        for listing in listings:
+            row = parse_listing(listing)
+            if not row["cache_key"]:
+                continue
+
+            old = conn.execute("SELECT * FROM listings WHERE cache_key = ?", (row["cache_key"],)).fetchone()
+            if old is not None:
+                if preserve:
+                    row = parse_listing({**row, **{c: old[c] for c in preserve}})
+                if all(old[c] == row[c] for c in columns):
+                    continue
+                _aggregate_delta(conn, old, -1)
+
+            seq += 1
+            conn.execute(
+                f"INSERT INTO listings ({', '.join(columns)}, seq) VALUES ({placeholders}, ?) "
+                f"ON CONFLICT (cache_key) DO UPDATE SET {updates}",
+                [row[c] for c in columns] + [seq],
+            )
+            _aggregate_delta(conn, row, 1)
+            changed += 1
+
+    return changed
+
+
+def sync_from_csv(conn, csv_filename=CSV_FILENAME):
+    """Upsert CSV cache rows the store does not have yet (or that changed).
+    Values alert events own (EVENT_OWNED_COLUMNS) are kept for listings already in the store.
+    """
+    if not os.path.exists(csv_filename):
+        print(f"⚠️ {csv_filename} not found")
+        return 0
+
+    with open(csv_filename, newline="", encoding="utf-8-sig") as f:
+        rows = [{k: (v if v != "" else None) for k, v in row.items()} for row in csv.DictReader(f)]
+
+    changed = upsert_listings(conn, rows, preserve=EVENT_OWNED_COLUMNS)
+    print(f"✅ Synced {csv_filename}: {changed} new/changed of {len(rows)} rows")
+    return changed
+
+
+# ==================================================
+# ALERT EVENTS
+# ==================================================
+# Raw column updates per alert event type (see listing_parsing.ALERT_EVENT_TYPES)
+EVENT_EFFECTS = {
+    "outbid": lambda e: {"current_bid": f"AED {e['amount']:,}"} if e["amount"] else {},
+    "bid_update": lambda e: {"current_bid": f"AED {e['amount']:,}"} if e["amount"] else {},
+    "price_update": lambda e: {"seller_expectation": f"AED {e['amount']:,}"} if e["amount"] else {},
+    "auction_ending": lambda e: {"auction_status": "Ending soon"},
+    "auction_ended": lambda e: {"auction_status": "Ended"},
+}
+
+# Columns alert events keep moving after the scrape; a re-upsert of an older scrape
+# of a listing the store already has must not revert them
+EVENT_OWNED_COLUMNS = sorted({col for effect in EVENT_EFFECTS.values() for col in effect({"amount": 1})})
+
+
+def _event_listing(conn, event):
+    """The listing an alert event refers to: by cache key if it has a live time, else latest with that title"""
+    if event["live_time"]:
+        row = conn.execute("SELECT * FROM listings WHERE cache_key = ?",
+                           (generate_cache_key(event["title"], event["live_time"]),)).fetchone()
+        if row is not None:
+            return row
+    return conn.execute("SELECT * FROM listings WHERE title = ? ORDER BY seq DESC LIMIT 1",
+                        (event["title"],)).fetchone()
+
+
+def apply_alert_events(conn, events):
+    """Apply typed alert events (newest first, as on the list) to their listings.
+    Each card text is applied once; events whose listing isn't in the store yet
+    are left for a later sweep. Returns the number of listings changed.
+    """
+    changed = 0
+    for event in reversed(events):  # oldest first, so the newest state wins
+        effect = EVENT_EFFECTS.get(event["type"])
+        if effect is None:
+            continue
+        if conn.execute("SELECT 1 FROM alert_events WHERE alert_desc = ?", (event["alert_desc"],)).fetchone():
+            continue
+        old = _event_listing(conn, event)
+        if old is None:
+            continue
+
+        listing = {col: old[col] for col in LISTING_COLUMNS}
+        listing.update(effect(event))
+        changed += upsert_listings(conn, [listing])
+        with conn:
+            conn.execute(
+                "INSERT INTO alert_events (alert_desc, event_type, title, amount_aed, cache_key, applied_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (event["alert_desc"], event["type"], event["title"], event["amount"],
+                 old["cache_key"], datetime.utcnow().isoformat()),
+            )
+    return changed
+
+
+# ==================================================
+# QUERIES
+# ==================================================
+def listings_since(conn, cursor=0, limit=500):
+    """Listings added or changed after a sequence cursor, oldest change first.
+    Returns (rows, next_cursor, has_more); cost depends on the page size, not the history size.
+    """
+    rows = conn.execute(
+        "SELECT * FROM listings WHERE seq > ? ORDER BY seq LIMIT ?",
+        (cursor, limit + 1),
+    ).fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = rows[-1]["seq"] if rows else cursor
+    return rows, next_cursor, has_more
+
+
+def find_listings(conn, make=None, model=None, min_year=None, max_year=None, location=None,
+                  min_bid=None, max_bid=None, min_expectation=None, max_expectation=None,
+                  ends_after=None, ends_before=None, limit=100):
+    """Filter listings using the secondary indexes; returns sqlite3.Row objects"""
+    clauses = []
+    params = []
+
+    def add(clause, value):
+        if value is not None:
+            clauses.append(clause)
+            params.append(value)
+
+    add("make = ? COLLATE NOCASE", make)
+    add("model = ? COLLATE NOCASE", model)
+    add("year >= ?", min_year)
+    add("year <= ?", max_year)
+    add("location = ? COLLATE NOCASE", location)
+    add("current_bid_aed >= ?", min_bid)
+    add("current_bid_aed <= ?", max_bid)
+    add("seller_expectation_aed >= ?", min_expectation)
+    add("seller_expectation_aed <= ?", max_expectation)
+    add("auction_end_at >= ?", ends_after)
+    add("auction_end_at <= ?", ends_before)
+
+    sql = "SELECT * FROM listings"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY auction_end_at DESC LIMIT ?"
+    params.append(limit)
+    return conn.execute(sql, params).fetchall()
+
+
+def aggregate_stats(conn, dimension):
+    """Precomputed per-key stats for a dimension: count, avg bid/expectation, bid-to-expectation ratio"""
+    if dimension not in AGGREGATE_DIMENSIONS:
+        raise ValueError(f"Unknown dimension '{dimension}', expected one of {AGGREGATE_DIMENSIONS}")
+
+    rows = conn.execute(
+        "SELECT * FROM aggregates WHERE dimension = ? AND listing_count > 0 ORDER BY listing_count DESC",
+        (dimension,),
+    ).fetchall()
+    return [
+        {
+            "key": r["key"],
+            "listings": r["listing_count"],
+            "avg_bid": r["bid_sum"] / r["bid_count"] if r["bid_count"] else None,
+            "avg_expectation": r["expectation_sum"] / r["expectation_count"] if r["expectation_count"] else None,
+            "bid_to_expectation": r["ratio_sum"] / r["ratio_count"] if r["ratio_count"] else None,
+        }
+        for r in rows
+    ]
+
+
+# ==================================================
+# CLI
+# ==================================================
+def _fmt(value, pattern="{:,.0f}"):
+    return pattern.format(value) if value is not None else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the local listing store")
+    parser.add_argument("--db", default=DB_FILENAME)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = sub.add_parser("sync", help="Import new/changed rows from the CSV cache")
+    sync_parser.add_argument("--csv", default=CSV_FILENAME)
+
+    find_parser = sub.add_parser("find", help="Filter listings")
+    find_parser.add_argument("--make")
+    find_parser.add_argument("--model")
+    find_parser.add_argument("--min-year", type=int)
+    find_parser.add_argument("--max-year", type=int)
+    find_parser.add_argument("--location")
+    find_parser.add_argument("--min-bid", type=int)
+    find_parser.add_argument("--max-bid", type=int)
+    find_parser.add_argument("--min-expectation", type=int)
+    find_parser.add_argument("--max-expectation", type=int)
+    find_parser.add_argument("--ends-after", help="ISO date/time, e.g. 2026-01-27")
+    find_parser.add_argument("--ends-before", help="ISO date/time, e.g. 2026-01-31")
+    find_parser.add_argument("--limit", type=int, default=100)
+
+    stats_parser = sub.add_parser("stats", help="Precomputed aggregates")
+    stats_parser.add_argument("--by", choices=AGGREGATE_DIMENSIONS, default="make")
+
+    cli = parser.parse_args()
+    conn = open_store(cli.db)
+    start = time.perf_counter()
+
+    if cli.command == "sync":
+        sync_from_csv(conn, cli.csv)
+
+    elif cli.command == "find":
+        rows = find_listings(
+            conn, make=cli.make, model=cli.model, min_year=cli.min_year, max_year=cli.max_year,
+            location=cli.location, min_bid=cli.min_bid, max_bid=cli.max_bid,
+            min_expectation=cli.min_expectation, max_expectation=cli.max_expectation,
+            ends_after=cli.ends_after, ends_before=cli.ends_before, limit=cli.limit,
+        )
+        for r in rows:
+            print(f"  {r['title']:<45} {r['location'] or '-':<10} bid {_fmt(r['current_bid_aed']):>8}"
+                  f"  exp {_fmt(r['seller_expectation_aed']):>8}  ends {r['auction_end_at'] or '-'}")
+        print(f"📊 {len(rows)} listing(s)")
+
+    elif cli.command == "stats":
+        stats = aggregate_stats(conn, cli.by)
+        print(f"  {cli.by:<20} {'listings':>8} {'avg bid':>10} {'avg exp':>10} {'bid/exp':>8}")
+        for s in stats:
+            print(f"  {s['key']:<20} {s['listings']:>8} {_fmt(s['avg_bid']):>10} "
+                  f"{_fmt(s['avg_expectation']):>10} {_fmt(s['bid_to_expectation'], '{:.2f}'):>8}")
+
+    print(f"⏱️ {(time.perf_counter() - start) * 1000:.1f} ms")
+    conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
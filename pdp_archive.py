@@ -0,0 +1,199 @@
+"""
+Raw PDP snapshot archive and offline bulk re-extraction.
+
+Every scraped PDP's TextView texts (the exact input of parse_header_texts /
+parse_detail_texts, merged across scrolls for --full-pdp) are archived by
+cache_key: the texts live gzip-compressed and content-addressed in
+pdp_archive/ (the session recorder's BlobStore, so identical snapshots are
+stored once) and the pdp_snapshots table indexes them.
+
+When a parsing rule changes (a new spec variant, a location outside EMIRATES,
+a new detail field), reextract re-runs the parsers over the latest snapshot
+of every listing on all CPU cores and upserts the changed rows into the
+listing store in batches - no device time, and auctions that already ended
+are fixed too. Fields that alert events keep updating after the scrape
+(listing_store.EVENT_OWNED_COLUMNS: current bid, seller expectation, auction
+status) are only rewritten when asked for explicitly.
+
+Usage:
+    python pdp_archive.py stats
+    python pdp_archive.py reextract                        # default fields, all cores
+    python pdp_archive.py reextract --fields specs,location --dry-run
+    python pdp_archive.py reextract --fields details --workers 4
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from multiprocessing import Pool
+
+from listing_parsing import HEADER_FIELDS, parse_detail_texts, parse_header_texts
+from listing_store import DB_FILENAME, EVENT_OWNED_COLUMNS, LISTING_COLUMNS, open_store, upsert_listings
+from session_recorder import BlobStore
+
+ARCHIVE_DIR = "pdp_archive"
+BLOB_SUFFIX = ".json.gz"
+
+# Re-extracted unless --fields says otherwise; event-owned columns and auction_end_date
+# are left alone since alert events move them on after the scrape
+REEXTRACT_DEFAULT_FIELDS = [
+    name for name in HEADER_FIELDS + ["details"]
+    if name not in EVENT_OWNED_COLUMNS and name != "auction_end_date"
+]
+
+BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pdp_snapshots (
+    cache_key TEXT NOT NULL,
+    blob TEXT NOT NULL,               -- sha256 of the texts JSON in ARCHIVE_DIR
+    live_time TEXT,
+    scraped_at TEXT,
+    archived_at TEXT NOT NULL,
+    PRIMARY KEY (cache_key, blob)
+);
+"""
+
+
+def open_archive(db_filename=DB_FILENAME, archive_dir=ARCHIVE_DIR):
+    """Open (and create if needed) the snapshot index; returns (conn, blob store)"""
+    conn = sqlite3.connect(db_filename, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn, BlobStore(archive_dir, suffix=BLOB_SUFFIX)
+
+
+def archive_snapshot(conn, blobs, cache_key, texts, live_time=None, scraped_at=None):
+    """Archive a PDP's texts under its cache key; returns the blob digest"""
+    digest = blobs.put(json.dumps(texts, ensure_ascii=False))
+    with conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO pdp_snapshots (cache_key, blob, live_time, scraped_at, archived_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (cache_key, digest, live_time, scraped_at.isoformat() if isinstance(scraped_at, datetime) else scraped_at,
+             datetime.utcnow().isoformat()),
+        )
+    return digest
+
+
+def latest_snapshots(conn):
+    """Newest snapshot per cache key"""
+    # SQLite returns the other columns from the row holding MAX(scraped_at)
+    return conn.execute(
+        "SELECT cache_key, blob, live_time, MAX(scraped_at) AS scraped_at FROM pdp_snapshots GROUP BY cache_key"
+    ).fetchall()
+
+
+def extract_fields(texts):
+    """Header and detail fields from archived texts, exactly as the scraper parses them"""
+    fields = parse_header_texts(texts)
+    fields["details"] = parse_detail_texts(texts)
+    return fields
+
+
+def _extract_job(job):
+    """Worker: (cache_key, digest, archive_dir) -> (cache_key, fields)"""
+    cache_key, digest, archive_dir = job
+    blobs = BlobStore(archive_dir, suffix=BLOB_SUFFIX)
+    return cache_key, extract_fields(json.loads(blobs.get(digest)))
+
+
+def _updated_listing(old, snapshot, fields, wanted):
+    """Store row (or a fresh one from the snapshot) with the wanted fields re-extracted.
+    Values the parsers no longer find are kept rather than blanked.
+    """
+    if old is not None:
+        listing = {col: old[col] for col in LISTING_COLUMNS}
+    else:
+        listing = {col: None for col in LISTING_COLUMNS}
+        listing.update(cache_key=snapshot["cache_key"], live_time=snapshot["live_time"],
+                       scraped_at=snapshot["scraped_at"])
+    for name in wanted:
+        if name == "details":
+            details = json.loads(listing["details"]) if listing["details"] else {}
+            details.update({k: v for k, v in fields["details"].items() if v})
+            listing["details"] = json.dumps(details) if details else None
+        elif fields.get(name):
+            listing[name] = fields[name]
+    return listing
+
+
+def reextract(conn, store, blobs, wanted=None, workers=None, batch_size=BATCH_SIZE, dry_run=False):
+    """Re-run the parsers over the archive and upsert changed listings batch by batch.
+    conn: archive index; store: listing store connection.
+    Returns (snapshots parsed, listings changed, changes per field).
+    """
+    wanted = wanted or REEXTRACT_DEFAULT_FIELDS
+    snapshots = {row["cache_key"]: row for row in latest_snapshots(conn)}
+    jobs = [(key, row["blob"], blobs.root) for key, row in snapshots.items()]
+
+    changed = 0
+    field_changes = {name: 0 for name in wanted}
+    batch = []
+    with Pool(processes=workers or os.cpu_count()) as pool:
+        for cache_key, fields in pool.imap_unordered(_extract_job, jobs, chunksize=64):
+            old = store.execute("SELECT * FROM listings WHERE cache_key = ?", (cache_key,)).fetchone()
+            listing = _updated_listing(old, snapshots[cache_key], fields, wanted)
+            differs = [name for name in wanted if old is None or old[name] != listing[name]]
+            if not differs:
+                continue
+            for name in differs:
+                field_changes[name] += 1
+            changed += 1
+            batch.append(listing)
+            if len(batch) >= batch_size:
+                if not dry_run:
+                    upsert_listings(store, batch)
+                batch = []
+    if batch and not dry_run:
+        upsert_listings(store, batch)
+    return len(jobs), changed, field_changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDP snapshot archive and offline re-extraction")
+    parser.add_argument("--db", default=DB_FILENAME)
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Archived listings, snapshots and disk use")
+    reextract_parser = sub.add_parser("reextract", help="Re-parse every listing's latest snapshot into the store")
+    reextract_parser.add_argument("--fields", default=None,
+                                  help=f"Comma-separated fields to rewrite (default: {','.join(REEXTRACT_DEFAULT_FIELDS)}; "
+                                       f"available: {','.join(HEADER_FIELDS + ['details'])})")
+    reextract_parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: all cores)")
+    reextract_parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    reextract_parser.add_argument("--dry-run", action="store_true", help="Count what would change, write nothing")
+    cli = parser.parse_args()
+
+    conn, blobs = open_archive(cli.db, cli.archive_dir)
+    if cli.command == "stats":
+        listings, snapshots = conn.execute(
+            "SELECT COUNT(DISTINCT cache_key), COUNT(*) FROM pdp_snapshots"
+        ).fetchone()
+        count, total = blobs.size_on_disk()
+        print(f"🗄️ {listings} listing(s), {snapshots} snapshot(s), {count} distinct blob(s), {total / 1024:.0f} KiB")
+    elif cli.command == "reextract":
+        wanted = cli.fields.split(",") if cli.fields else None
+        unknown = set(wanted or []) - set(HEADER_FIELDS + ["details"])
+        if unknown:
+            parser.error(f"unknown field(s): {', '.join(sorted(unknown))}")
+        start = time.perf_counter()
+        store = open_store(cli.db)
+        parsed, changed, field_changes = reextract(conn, store, blobs, wanted, cli.workers, cli.batch_size,
+                                                   cli.dry_run)
+        store.close()
+        verb = "would change" if cli.dry_run else "changed"
+        print(f"♻️ Re-extracted {parsed} snapshot(s): {changed} listing(s) {verb} "
+              f"in {time.perf_counter() - start:.1f}s")
+        for name, n in field_changes.items():
+            if n:
+                print(f"  {name:<20} {n}")
+    conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
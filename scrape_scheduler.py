@@ -0,0 +1,324 @@
+"""
+History-driven scrape scheduler.
+
+Builds an arrival-rate model per weekday and time slot from the live_time /
+scraped_at history in car_listings_cache.csv, plans scrape cycles densely around
+predicted bursts and sparsely elsewhere, and reports the expected freshness lag
+and device-minutes against fixed-interval polling.
+
+Everything runs on the device's local clock (the one live times are shown in):
+scraped_at (UTC) is converted with --timezone, default the host's timezone.
+A slot is "hot" when its rate is at least --burst-factor x the median rate of
+occupied slots, so the threshold follows however much history there is.
+
+Usage:
+    python scrape_scheduler.py plan                  # print model, plan and report
+    python scrape_scheduler.py plan --json plan.json # also save the planned cycles
+    python scrape_scheduler.py run                   # launch the scraper on the plan
+"""
+import argparse
+import csv
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from listing_parsing import WEEKDAYS, parse_live_time_parts, resolve_live_time
+
+CSV_FILENAME = "car_listings_cache.csv"
+SCRAPER_SCRIPT = "2901latest_working_poc.py"
+
+MINUTES_PER_WEEK = 7 * 24 * 60
+
+# Gap between two scraped_at values that separates one run from the next
+RUN_GAP_MINUTES = 10
+
+
+# ==================================================
+# PARSE HISTORY
+# ==================================================
+def local_timezone(name=None):
+    """Named IANA timezone, or the host's local timezone"""
+    return ZoneInfo(name) if name else datetime.now().astimezone().tzinfo
+
+
+def live_time_to_week_minute(live_time):
+    """'Tuesday at 4:00 PM' -> minutes since Monday 00:00 (None if unparseable)"""
+    parts = parse_live_time_parts(live_time)
+    if parts is None:
+        return None
+    weekday, hour, minute = parts
+    return weekday * 1440 + hour * 60 + minute
+
+
+def parse_scraped_at(value):
+    """Parse a scraped_at cell ('2026-01-27 10:51:55.096511') or return None"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+
+
+def load_history(csv_filename=CSV_FILENAME, tz=None):
+    """Return (arrival week-minutes, scraped_at datetimes, local calendar weeks) from the listing cache.
+    Weeks are those the listings went live in, on the same local clock as the week-minutes.
+    """
+    tz = tz or local_timezone()
+    arrivals = []
+    scraped = []
+    weeks = set()
+    if not os.path.exists(csv_filename):
+        print(f"⚠️ {csv_filename} not found")
+        return arrivals, scraped, weeks
+
+    with open(csv_filename, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            minute = live_time_to_week_minute(row.get("live_time"))
+            if minute is not None:
+                arrivals.append(minute)
+            scraped_at = parse_scraped_at(row.get("scraped_at"))
+            if scraped_at:
+                scraped.append(scraped_at)
+                local_scraped = scraped_at.replace(tzinfo=timezone.utc).astimezone(tz)
+                live_at = resolve_live_time(row.get("live_time"), local_scraped)
+                weeks.add((live_at or local_scraped).isocalendar()[:2])
+
+    print(f"✅ Loaded history: {len(arrivals)} arrivals, {len(scraped)} scrape timestamps")
+    return arrivals, scraped, weeks
+
+
+# ==================================================
+# ARRIVAL-RATE MODEL
+# ==================================================
+def build_arrival_model(arrivals, weeks, slot_minutes):
+    """Expected listings per week for each (weekday, slot).
+
+    Counts are divided by the number of distinct local calendar weeks in the
+    history, so a slot that bursts every week outranks one that burst once.
+    """
+    n_weeks = len(weeks) or 1
+
+    slots_per_week = MINUTES_PER_WEEK // slot_minutes
+    rates = [0.0] * slots_per_week
+    for minute in arrivals:
+        rates[minute // slot_minutes] += 1.0 / n_weeks
+
+    return rates, n_weeks
+
+
+def estimate_cycle_minutes(scraped):
+    """Median scrape-run duration from scraped_at gaps (fallback 3 minutes)"""
+    if len(scraped) < 2:
+        return 3.0
+
+    ordered = sorted(scraped)
+    durations = []
+    run_start = prev = ordered[0]
+    for ts in ordered[1:]:
+        if ts - prev > timedelta(minutes=RUN_GAP_MINUTES):
+            durations.append((prev - run_start).total_seconds() / 60)
+            run_start = ts
+        prev = ts
+    durations.append((prev - run_start).total_seconds() / 60)
+
+    durations = sorted(d for d in durations if d > 0)
+    if not durations:
+        return 3.0
+    # A run also pays startup and the final refresh pass, not just the listings
+    return round(durations[len(durations) // 2] + 1.5, 1)
+
+
+# ==================================================
+# PLAN CYCLES
+# ==================================================
+def burst_threshold(rates, burst_factor):
+    """Rate that makes a slot hot: burst_factor x the median rate of occupied slots"""
+    occupied = [rate for rate in rates if rate > 0]
+    if not occupied:
+        return float("inf")
+    return burst_factor * statistics.median(occupied)
+
+
+def hot_slots(rates, burst_rate):
+    """Slots predicted to carry a burst, plus the slot right after each (late stragglers)"""
+    hot = set()
+    for i, rate in enumerate(rates):
+        if rate >= burst_rate:
+            hot.add(i)
+            hot.add((i + 1) % len(rates))
+    return hot
+
+
+def plan_cycles(rates, slot_minutes, burst_rate, dense_interval, sparse_interval):
+    """Cycle start times (week-minutes): dense inside hot slots, sparse elsewhere.
+
+    A sparse step never jumps over the start of a hot slot.
+    """
+    hot = hot_slots(rates, burst_rate)
+    hot_starts = sorted(i * slot_minutes for i in hot)
+
+    cycles = []
+    t = 0
+    while t < MINUTES_PER_WEEK:
+        cycles.append(t)
+        if (t // slot_minutes) in hot:
+            step = dense_interval
+        else:
+            step = sparse_interval
+            next_hot = next((s for s in hot_starts if s > t), None)
+            if next_hot is not None:
+                step = min(step, next_hot - t)
+        t += step
+    return cycles
+
+
+def fixed_cycles(interval):
+    """Fixed-interval polling over one week"""
+    return list(range(0, MINUTES_PER_WEEK, interval))
+
+
+def expected_lag(arrivals, cycles):
+    """Mean minutes from going live to the next cycle start (week wraps around)"""
+    if not arrivals or not cycles:
+        return None
+
+    total = 0.0
+    for minute in arrivals:
+        next_cycle = next((c for c in cycles if c >= minute), cycles[0] + MINUTES_PER_WEEK)
+        total += next_cycle - minute
+    return total / len(arrivals)
+
+
+# ==================================================
+# REPORT
+# ==================================================
+def format_week_minute(minute):
+    """Week-minute -> 'Tuesday 4:00 PM'"""
+    day, rest = divmod(minute, 1440)
+    hour, mins = divmod(rest, 60)
+    return f"{WEEKDAYS[day]} {datetime(2000, 1, 1, hour, mins).strftime('%I:%M %p').lstrip('0')}"
+
+
+def print_model(rates, slot_minutes, n_weeks, burst_rate):
+    print(f"\n{'='*60}")
+    print(f"📈 ARRIVAL MODEL ({slot_minutes}-minute slots, {n_weeks} week(s) of history)")
+    print(f"{'='*60}")
+    print(f"  🔥 = at least {burst_rate:.2f} listings/week")
+    for i, rate in enumerate(rates):
+        if rate <= 0:
+            continue
+        marker = "🔥" if rate >= burst_rate else "  "
+        print(f"  {marker} {format_week_minute(i * slot_minutes):<24} {rate:5.2f} listings/week")
+
+
+def build_report(arrivals, rates, cycles, baseline, cycle_minutes):
+    """Lag and device-minutes for the plan vs fixed polling"""
+    plan_lag = expected_lag(arrivals, cycles)
+    fixed_lag = expected_lag(arrivals, baseline)
+    return {
+        "cycles_per_week": len(cycles),
+        "fixed_cycles_per_week": len(baseline),
+        "cycle_minutes": cycle_minutes,
+        "expected_lag_minutes": round(plan_lag, 1) if plan_lag is not None else None,
+        "fixed_expected_lag_minutes": round(fixed_lag, 1) if fixed_lag is not None else None,
+        "device_minutes_per_week": round(len(cycles) * cycle_minutes, 1),
+        "fixed_device_minutes_per_week": round(len(baseline) * cycle_minutes, 1),
+        "device_minutes_saved_per_week": round((len(baseline) - len(cycles)) * cycle_minutes, 1),
+        "predicted_listings_per_week": round(sum(rates), 1),
+    }
+
+
+def print_report(report, fixed_interval):
+    print(f"\n{'='*60}")
+    print("📊 SCHEDULE REPORT")
+    print(f"{'='*60}")
+    print(f"🗓️ Planned cycles/week: {report['cycles_per_week']} (fixed every {fixed_interval} min: {report['fixed_cycles_per_week']})")
+    print(f"⏱️ Expected freshness lag: {report['expected_lag_minutes']} min (fixed: {report['fixed_expected_lag_minutes']} min)")
+    print(f"📱 Device-minutes/week: {report['device_minutes_per_week']} (fixed: {report['fixed_device_minutes_per_week']})")
+    print(f"💰 Device-minutes saved/week: {report['device_minutes_saved_per_week']}")
+    print(f"{'='*60}")
+
+
+# ==================================================
+# RUN ON THE PLAN
+# ==================================================
+def current_week_minute(now=None, tz=None):
+    now = now or datetime.now(tz)
+    return now.weekday() * 1440 + now.hour * 60 + now.minute
+
+
+def run_schedule(cycles, tz=None):
+    """Sleep until each planned cycle (device-local clock) and launch the scraper (one run at a time)"""
+    print(f"\n🚀 Running scraper on plan ({len(cycles)} cycles/week), Ctrl+C to stop")
+    while True:
+        now = current_week_minute(tz=tz)
+        next_cycle = next((c for c in cycles if c > now), cycles[0] + MINUTES_PER_WEEK)
+        wait_seconds = (next_cycle - now) * 60 - datetime.now().second
+        print(f"⏳ Next cycle at {format_week_minute(next_cycle % MINUTES_PER_WEEK)} (in {wait_seconds // 60:.0f} min)")
+        time.sleep(max(wait_seconds, 0))
+
+        print(f"\n▶️ Starting scrape cycle at {datetime.now():%Y-%m-%d %H:%M:%S}")
+        result = subprocess.run([sys.executable, SCRAPER_SCRIPT])
+        print(f"⏹️ Scrape cycle finished (exit code {result.returncode})")
+
+
+# ==================================================
+# MAIN
+# ==================================================
+def main():
+    parser = argparse.ArgumentParser(description="Plan scrape cycles from live_time arrival history")
+    parser.add_argument("command", choices=["plan", "run"])
+    parser.add_argument("--csv", default=CSV_FILENAME)
+    parser.add_argument("--slot-minutes", type=int, default=15)
+    parser.add_argument("--burst-factor", type=float, default=1.0,
+                        help="A slot is 'hot' at this multiple of the median occupied-slot rate")
+    parser.add_argument("--burst-rate", type=float, default=None,
+                        help="Absolute listings/week that make a slot 'hot' (overrides --burst-factor)")
+    parser.add_argument("--timezone", default=None,
+                        help="IANA timezone the device shows live times in (default: the host's)")
+    parser.add_argument("--dense-interval", type=int, default=5, help="Minutes between cycles in hot slots")
+    parser.add_argument("--sparse-interval", type=int, default=120, help="Minutes between cycles elsewhere")
+    parser.add_argument("--fixed-interval", type=int, default=30, help="Fixed cron interval to compare against")
+    parser.add_argument("--cycle-minutes", type=float, default=None,
+                        help="Device-minutes per cycle (default: estimated from scraped_at history)")
+    parser.add_argument("--json", help="Write the plan and report to this file")
+    cli = parser.parse_args()
+
+    tz = local_timezone(cli.timezone)
+    arrivals, scraped, weeks = load_history(cli.csv, tz)
+    if not arrivals:
+        print("❌ No live_time history to plan from")
+        return 1
+
+    rates, n_weeks = build_arrival_model(arrivals, weeks, cli.slot_minutes)
+    burst_rate = cli.burst_rate if cli.burst_rate is not None else burst_threshold(rates, cli.burst_factor)
+    cycles = plan_cycles(rates, cli.slot_minutes, burst_rate, cli.dense_interval, cli.sparse_interval)
+    baseline = fixed_cycles(cli.fixed_interval)
+    cycle_minutes = cli.cycle_minutes or estimate_cycle_minutes(scraped)
+    report = build_report(arrivals, rates, cycles, baseline, cycle_minutes)
+
+    print_model(rates, cli.slot_minutes, n_weeks, burst_rate)
+    print_report(report, cli.fixed_interval)
+
+    if cli.json:
+        with open(cli.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "generated_at": datetime.now().isoformat(),
+                "cycles": [format_week_minute(c) for c in cycles],
+                "report": report,
+            }, f, indent=2)
+        print(f"💾 Plan saved to {cli.json}")
+
+    if cli.command == "run":
+        run_schedule(cycles, tz)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
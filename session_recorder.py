@@ -0,0 +1,380 @@
+"""
+Opt-in recorder for live scraper sessions: real screens and real command timings.
+
+SessionRecorder wraps the driver (python 2901latest_working_poc.py --record).
+Every driver command is timed into recordings/sessions/<session>.jsonl (flushed
+per event, so a crashed run keeps its log), and after a command that changed the
+UI (click / swipe / back ...) the next lookup also captures the hierarchy.
+Polling an unchanged screen captures nothing. The log holds exactly one screen
+step per input command - even an input that left the screen as it was, such as
+an idle pull-to-refresh - because benchmarks/fake_adb.py moves to the next dump
+on every input; other changes update the current step instead. Screens are
+labelled (alerts_list, pdp, loading, ... or an explicit mark such as wrong_pdp /
+blink) and stored content-addressed and gzip-compressed in recordings/blobs,
+so a screen seen a thousand times is stored once.
+
+Export turns a session into a replay corpus: numbered *.xml dumps in screen
+order (served as-is by benchmarks/fake_adb.py), a manifest with labels and the
+commands between screens, and per-command latency percentiles. Export
+anonymizes by default: Ref numbers, phone numbers, e-mails and any --replace
+strings are rewritten consistently across all screens.
+
+Usage:
+    python 2901latest_working_poc.py --record
+    python session_recorder.py list
+    python session_recorder.py export <session> fixtures/run1 --replace "Al Something Motors=Dealer"
+    ADB_PATH=benchmarks/fake_adb.py FAKE_ADB_DUMPS=fixtures/run1 python benchmarks/bench_backends.py --backend adb
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from datetime import datetime
+
+RECORDINGS_DIR = "recordings"
+
+# Commands after which the screen may look different
+SCREEN_CHANGING_COMMANDS = {
+    "click", "swipe", "back", "tap_point", "open_notifications", "activate_app", "terminate_app",
+}
+
+# Screen-changing commands the adb backend sends as `adb shell input` - each one is a
+# replay step, since fake_adb serves the next dump after every input
+INPUT_COMMANDS = {"click", "swipe", "back", "tap_point"}
+
+# Commands that look at the screen - a pending capture happens just before them
+SCREEN_READING_COMMANDS = {"find_element", "find_elements"}
+
+
+# ==================================================
+# CONTENT-ADDRESSED BLOB STORE
+# ==================================================
+class BlobStore:
+    """gzip-compressed texts stored under their sha256 - identical screens are stored once"""
+
+    def __init__(self, root=os.path.join(RECORDINGS_DIR, "blobs"), suffix=".xml.gz"):
+        self.root = root
+        self.suffix = suffix
+
+    def _path(self, digest):
+        return os.path.join(self.root, digest[:2], digest + self.suffix)
+
+    def put(self, text):
+        """Store text (if new) and return its digest"""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(gzip.compress(data, compresslevel=6))
+            os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest):
+        with open(self._path(digest), "rb") as f:
+            return gzip.decompress(f.read()).decode("utf-8")
+
+    def __contains__(self, digest):
+        return os.path.exists(self._path(digest))
+
+    def size_on_disk(self):
+        """(blob count, total compressed bytes)"""
+        count = total = 0
+        for folder, _, files in os.walk(self.root):
+            for name in files:
+                if name.endswith(self.suffix):
+                    count += 1
+                    total += os.path.getsize(os.path.join(folder, name))
+        return count, total
+
+
+def classify_screen(xml):
+    """Rough screen label from a hierarchy dump"""
+    on_alerts = 'content-desc="Alerts"' in xml
+    if 'text="Ref' in xml:
+        return "pdp"
+    if on_alerts and "is now Live" in xml:
+        return "alerts_list"
+    if on_alerts:
+        return "alerts_other"
+    return "loading"
+
+
+# ==================================================
+# RECORDER
+# ==================================================
+class RecordedElement:
+    """Element proxy that times reads and clicks through the recorder"""
+
+    def __init__(self, recorder, element):
+        self._recorder = recorder
+        self._element = element
+
+    @property
+    def text(self):
+        return self._recorder.run_command("text", lambda: self._element.text)
+
+    @property
+    def rect(self):
+        return self._recorder.run_command("rect", lambda: self._element.rect)
+
+    def get_attribute(self, name):
+        return self._recorder.run_command("get_attribute", self._element.get_attribute, name)
+
+    def click(self):
+        return self._recorder.run_command("click", self._element.click)
+
+    def find_element(self, by, value):
+        return self._recorder.wrap(self._recorder.run_command("find_element", self._element.find_element, by, value))
+
+    def find_elements(self, by, value):
+        return self._recorder.wrap(self._recorder.run_command("find_elements", self._element.find_elements, by, value))
+
+    def __getattr__(self, name):
+        return getattr(self._element, name)
+
+
+class SessionRecorder:
+    """Driver proxy that logs command timings and captures each distinct screen"""
+
+    def __init__(self, driver, directory=RECORDINGS_DIR, session_id=None, metadata=None):
+        self._driver = driver
+        self.blobs = BlobStore(os.path.join(directory, "blobs"))
+        self.session_id = session_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        sessions_dir = os.path.join(directory, "sessions")
+        os.makedirs(sessions_dir, exist_ok=True)
+        self.log_path = os.path.join(sessions_dir, self.session_id + ".jsonl")
+        self._log = open(self.log_path, "a", encoding="utf-8")
+        self._started = time.perf_counter()
+        self._dirty = True
+        self._pending_inputs = 0
+        self._last_digest = None
+        self.screens_seen = 0
+        self._write({"session": self.session_id, "started_at": datetime.now().isoformat(), **(metadata or {})})
+
+    def _write(self, event):
+        self._log.write(json.dumps(event) + "\n")
+        self._log.flush()
+
+    def _now(self):
+        return round(time.perf_counter() - self._started, 3)
+
+    # ---------- screens ----------
+    def capture(self, label=None):
+        """Store the current hierarchy and log it: one step per input since the last capture,
+        else (screen changed by itself, or an explicit label) an update of the current step
+        """
+        start = time.perf_counter()
+        try:
+            xml = self._driver.page_source
+        except Exception as e:
+            self._write({"t": self._now(), "capture_error": str(e)[:200]})
+            return None
+        self._dirty = False
+        digest = self.blobs.put(xml)
+        event = {"t": self._now(), "screen": digest, "label": label or classify_screen(xml),
+                 "capture_ms": round((time.perf_counter() - start) * 1000, 1)}
+        if self._pending_inputs:
+            for _ in range(self._pending_inputs):
+                self._write(event)
+            self.screens_seen += self._pending_inputs
+            self._pending_inputs = 0
+        elif self._last_digest is None:
+            self._write(event)
+            self.screens_seen += 1
+        elif digest != self._last_digest or label:
+            self._write({**event, "same_step": True})
+        self._last_digest = digest
+        return digest
+
+    def mark(self, label):
+        """Capture the current screen under an explicit label (e.g. wrong_pdp, blink)"""
+        return self.capture(label)
+
+    # ---------- commands ----------
+    def run_command(self, command, func, *args, **kwargs):
+        if command in SCREEN_READING_COMMANDS and self._dirty:
+            self.capture()
+        start = time.perf_counter()
+        error = None
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            event = {"t": self._now(), "cmd": command, "ms": round((time.perf_counter() - start) * 1000, 1)}
+            if error:
+                event["error"] = error
+            self._write(event)
+            if command in SCREEN_CHANGING_COMMANDS and not error:
+                self._dirty = True
+                if command in INPUT_COMMANDS:
+                    self._pending_inputs += 1
+
+    def wrap(self, result):
+        if isinstance(result, list):
+            return [RecordedElement(self, r) for r in result]
+        if hasattr(result, "get_attribute") and hasattr(result, "click"):
+            return RecordedElement(self, result)
+        return result
+
+    # ---------- proxying ----------
+    @property
+    def page_source(self):
+        return self.run_command("page_source", lambda: self._driver.page_source)
+
+    def quit(self):
+        self._write({"t": self._now(), "end": True, "screens": self.screens_seen})
+        self._log.close()
+        print(f"🎥 Session recorded: {self.log_path} ({self.screens_seen} screen changes)")
+        return self._driver.quit()
+
+    def __getattr__(self, name):
+        attr = getattr(self._driver, name)
+        if not callable(attr):
+            return attr
+
+        def recorded(*args, **kwargs):
+            return self.wrap(self.run_command(name, getattr(self._driver, name), *args, **kwargs))
+
+        return recorded
+
+
+# ==================================================
+# ANONYMIZATION
+# ==================================================
+class Anonymizer:
+    """Consistent replacements across every screen of a corpus (same input -> same output)"""
+
+    REF_PATTERN = re.compile(r'Ref#?\s*(\d+)')
+    PHONE_PATTERN = re.compile(r'(?:\+971|00971|\b0)[\s-]?5\d(?:[\s-]?\d){7}\b')
+    EMAIL_PATTERN = re.compile(r'[\w.+-]+@[\w-]+\.[\w.]+')
+
+    def __init__(self, replacements=None):
+        self.replacements = replacements or {}
+        self._refs = {}
+
+    def _ref(self, match):
+        ref = self._refs.setdefault(match.group(1), str(100000 + len(self._refs)))
+        return match.group(0).replace(match.group(1), ref)
+
+    def __call__(self, xml):
+        for original, replacement in self.replacements.items():
+            xml = xml.replace(original, replacement)
+        xml = self.REF_PATTERN.sub(self._ref, xml)
+        xml = self.PHONE_PATTERN.sub("+971 50 000 0000", xml)
+        xml = self.EMAIL_PATTERN.sub("user@example.com", xml)
+        return xml
+
+
+# ==================================================
+# SESSIONS AND EXPORT
+# ==================================================
+def read_session(directory, session_id):
+    path = os.path.join(directory, "sessions", session_id + ".jsonl")
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def list_sessions(directory):
+    sessions_dir = os.path.join(directory, "sessions")
+    if not os.path.isdir(sessions_dir):
+        return []
+    return sorted(name[:-len(".jsonl")] for name in os.listdir(sessions_dir) if name.endswith(".jsonl"))
+
+
+def command_latency(events):
+    """command -> count / p50 / p99 / max in ms"""
+    by_command = {}
+    for event in events:
+        if "cmd" in event:
+            by_command.setdefault(event["cmd"], []).append(event["ms"])
+    stats = {}
+    for command, samples in sorted(by_command.items()):
+        samples.sort()
+        stats[command] = {
+            "count": len(samples),
+            "p50_ms": statistics.median(samples),
+            "p99_ms": samples[min(len(samples) - 1, int(0.99 * len(samples)))],
+            "max_ms": samples[-1],
+        }
+    return stats
+
+
+def export_session(directory, session_id, out_dir, anonymizer=None):
+    """Write numbered dumps (screen order), manifest.json and timings.json; returns the step count"""
+    events = read_session(directory, session_id)
+    blobs = BlobStore(os.path.join(directory, "blobs"))
+    os.makedirs(out_dir, exist_ok=True)
+
+    steps = []
+    commands = []
+    for event in events:
+        if "cmd" in event:
+            commands.append({"cmd": event["cmd"], "ms": event["ms"]})
+        elif "screen" in event and event.get("same_step") and steps:
+            # Same replay step, newer screen / label
+            steps[-1].update(label=event["label"], screen=event["screen"])
+        elif "screen" in event:
+            if steps:
+                steps[-1]["commands_after"] = commands
+            commands = []
+            steps.append({"file": f"{len(steps):03d}.xml", "label": event["label"], "t": event["t"],
+                          "screen": event["screen"]})
+    if steps:
+        steps[-1]["commands_after"] = commands
+
+    for step in steps:
+        xml = blobs.get(step.pop("screen"))
+        if anonymizer:
+            xml = anonymizer(xml)
+        with open(os.path.join(out_dir, step["file"]), "w", encoding="utf-8") as f:
+            f.write(xml)
+
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"session": session_id, "anonymized": anonymizer is not None, "steps": steps}, f, indent=2)
+    with open(os.path.join(out_dir, "timings.json"), "w", encoding="utf-8") as f:
+        json.dump(command_latency(events), f, indent=2)
+    return len(steps)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and export recorded scraper sessions")
+    parser.add_argument("--dir", default=RECORDINGS_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Recorded sessions with their screen and command counts")
+    export_parser = sub.add_parser("export", help="Write a session as a replayable dump corpus")
+    export_parser.add_argument("session")
+    export_parser.add_argument("out_dir")
+    export_parser.add_argument("--raw", action="store_true", help="Don't anonymize")
+    export_parser.add_argument("--replace", action="append", default=[], metavar="TEXT=REPLACEMENT",
+                               help="Extra literal replacement (dealer names etc.); repeatable")
+    cli = parser.parse_args()
+
+    if cli.command == "list":
+        for session_id in list_sessions(cli.dir):
+            events = read_session(cli.dir, session_id)
+            screens = [e for e in events if "screen" in e and not e.get("same_step")]
+            print(f"  {session_id}  {sum(1 for e in events if 'cmd' in e):>6} commands  "
+                  f"{len(screens):>5} screens ({len({e['screen'] for e in screens})} distinct)")
+    elif cli.command == "export":
+        replacements = {}
+        for item in cli.replace:
+            original, _, replacement = item.partition("=")
+            replacements[original] = replacement
+        anonymizer = None if cli.raw else Anonymizer(replacements)
+        n = export_session(cli.dir, cli.session, cli.out_dir, anonymizer)
+        print(f"📦 Exported {n} screen(s) to {cli.out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
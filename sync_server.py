@@ -0,0 +1,143 @@
+"""
+Incremental sync endpoint for downstream consumers of the listing store.
+
+Serves listings added or changed since a sequence cursor, so a consumer only
+pulls what is new instead of copying and diffing the whole CSV after each run.
+
+    GET /listings?since=<seq>&limit=<n>
+
+Response (JSON, gzip if the client accepts it):
+    {"listings": [...], "next_cursor": 1234, "has_more": false}
+
+Every response carries an ETag derived from the cursor and the store's latest
+sequence number. A poller that sends it back in If-None-Match gets a bare 304
+when nothing changed - that costs one index lookup, no table scan.
+
+    GET /metrics
+
+Freshness-lag metrics (see freshness_metrics.py) in Prometheus text format.
+
+Usage:
+    python sync_server.py --port 8765
+    curl -s --compressed "http://127.0.0.1:8765/listings?since=0&limit=100"
+"""
+import argparse
+import gzip
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import freshness_metrics
+from listing_store import DB_FILENAME, current_seq, listings_since, open_store
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
+# Don't bother compressing tiny bodies (an empty page is ~50 bytes)
+GZIP_MIN_BYTES = 512
+
+
+def make_etag(since, limit, head_seq):
+    """ETag for a page: changes only when the store gets a newer sequence number"""
+    return f'"{since}-{limit}-{head_seq}"'
+
+
+class SyncHandler(BaseHTTPRequestHandler):
+    db_filename = DB_FILENAME
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/metrics":
+            self.send_metrics()
+            return
+        if url.path != "/listings":
+            self.send_error(404, "Use /listings?since=<seq>&limit=<n> or /metrics")
+            return
+
+        query = parse_qs(url.query)
+        try:
+            since = int(query.get("since", ["0"])[0])
+            limit = min(int(query.get("limit", [str(DEFAULT_PAGE_SIZE)])[0]), MAX_PAGE_SIZE)
+        except ValueError:
+            self.send_error(400, "since and limit must be integers")
+            return
+        if since < 0 or limit <= 0:
+            self.send_error(400, "since must be >= 0 and limit > 0")
+            return
+
+        conn = open_store(self.db_filename, create=False)
+        try:
+            etag = make_etag(since, limit, current_seq(conn))
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+
+            rows, next_cursor, has_more = listings_since(conn, since, limit)
+        finally:
+            conn.close()
+
+        body = json.dumps({
+            "listings": [dict(r) for r in rows],
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        }).encode("utf-8")
+
+        gzip_ok = "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzip_ok and len(body) >= GZIP_MIN_BYTES:
+            body = gzip.compress(body)
+        else:
+            gzip_ok = False
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        if gzip_ok:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_metrics(self):
+        conn = freshness_metrics.open_metrics(self.db_filename)
+        try:
+            metrics = freshness_metrics.compute_metrics(conn)
+        finally:
+            conn.close()
+        body = freshness_metrics.prometheus_text(metrics).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve incremental listing sync over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--db", default=DB_FILENAME)
+    cli = parser.parse_args()
+
+    # Create / migrate the store up front so requests never pay for it
+    open_store(cli.db).close()
+
+    SyncHandler.db_filename = cli.db
+    server = ThreadingHTTPServer((cli.host, cli.port), SyncHandler)
+    print(f"🔄 Sync endpoint on http://{cli.host}:{cli.port}/listings (db: {cli.db})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping sync endpoint")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+from adb_backend import BY_ANDROID_UIAUTOMATOR, BY_CLASS_NAME, AdbDriver, NoSuchElementException
+
+FAKE_ADB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks", "fake_adb.py")
+
+ALERTS_DUMP = """<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>
+<hierarchy rotation="0">
+  <node class="android.widget.FrameLayout" bounds="[0,0][720,1600]" text="" content-desc="">
+    <node class="android.view.ViewGroup" clickable="true" bounds="[0,200][720,400]" text=""
+          content-desc="2019 Lincoln MKZ is now Live Tuesday at 4:00 PM" />
+    <node class="android.view.ViewGroup" clickable="true" bounds="[0,400][720,600]" text=""
+          content-desc="2020 Toyota Corolla is now Live Tuesday at 3:41 PM" />
+    <node class="android.widget.TextView" bounds="[0,1500][720,1600]" text="Alerts" content-desc="" />
+  </node>
+</hierarchy>
+"""
+
+PDP_DUMP = """<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>
+<hierarchy rotation="0">
+  <node class="android.widget.FrameLayout" bounds="[0,0][720,1600]" text="" content-desc="">
+    <node class="android.widget.TextView" bounds="[0,100][720,150]" text="2019 Lincoln MKZ" content-desc="" />
+    <node class="android.widget.TextView" bounds="[0,150][720,200]" text="AED 49,050" content-desc="" />
+  </node>
+</hierarchy>
+"""
+
+CARDS = 'new UiSelector().className("android.view.ViewGroup").clickable(true)'
+
+
+@pytest.fixture
+def adb(tmp_path, monkeypatch):
+    dumps = tmp_path / "dumps"
+    dumps.mkdir()
+    (dumps / "00_alerts.xml").write_text(ALERTS_DUMP, encoding="utf-8")
+    (dumps / "01_pdp.xml").write_text(PDP_DUMP, encoding="utf-8")
+    monkeypatch.setenv("FAKE_ADB_DUMPS", str(dumps))
+    monkeypatch.setenv("FAKE_ADB_LOG", str(tmp_path / "adb.log"))
+    return AdbDriver(serial="emulator-5554", adb_path=FAKE_ADB)
+
+
+def logged(tmp_path):
+    return (tmp_path / "adb.log").read_text(encoding="utf-8").splitlines()
+
+
+def test_finds_elements_and_reads_attributes_locally(adb):
+    cards = adb.find_elements(BY_ANDROID_UIAUTOMATOR, CARDS)
+    assert [c.get_attribute("content-desc") for c in cards] == [
+        "2019 Lincoln MKZ is now Live Tuesday at 4:00 PM",
+        "2020 Toyota Corolla is now Live Tuesday at 3:41 PM",
+    ]
+    assert cards[0].rect == {"x": 0, "y": 200, "width": 720, "height": 200}
+    assert cards[0].get_attribute("text") is None
+    assert adb.get_window_size() == {"width": 720, "height": 1600}
+    with pytest.raises(NoSuchElementException):
+        adb.find_element(BY_ANDROID_UIAUTOMATOR, 'new UiSelector().text("Nope")')
+
+
+def test_click_taps_the_center_and_moves_to_the_next_screen(adb, tmp_path):
+    adb.find_elements(BY_ANDROID_UIAUTOMATOR, CARDS)[0].click()
+    assert "-s emulator-5554 shell input tap 360 300" in logged(tmp_path)
+
+    texts = [e.text for e in adb.find_elements(BY_CLASS_NAME, "android.widget.TextView")]
+    assert texts == ["2019 Lincoln MKZ", "AED 49,050"]
+
+    adb.back()
+    assert len(adb.find_elements(BY_ANDROID_UIAUTOMATOR, CARDS)) == 2
+
+
+def test_app_reported_installed_and_in_foreground(adb, monkeypatch):
+    assert adb.query_app_state("com.dubizzle.dealerapp") == 4
+    assert adb.query_app_state("com.example.other") == 0
+    monkeypatch.setenv("FAKE_ADB_PACKAGE", "com.example.other")
+    assert adb.query_app_state("com.example.other") == 4
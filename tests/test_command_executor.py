@@ -0,0 +1,116 @@
+import threading
+
+import pytest
+
+from command_executor import CommandTimeout, GuardedDriver, call_with_deadline
+
+# Short enough to keep the suite fast, long enough for an idle CI box
+DEADLINES = {name: 0.2 for name in ("find", "read", "click", "gesture", "navigation", "app", "default")}
+
+
+class FakeDriver:
+    """Driver whose commands hang (until released) while `hanging` is set"""
+
+    def __init__(self):
+        self.hanging = False
+        self.release = threading.Event()
+        self.calls = []
+
+    def _command(self, name):
+        self.calls.append(name)
+        if self.hanging:
+            self.release.wait(5)
+        return name
+
+    def find_elements(self, by, value):
+        return self._command("find_elements")
+
+    def swipe(self, *args):
+        return self._command("swipe")
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def fake():
+    driver = FakeDriver()
+    yield driver
+    driver.release.set()
+
+
+def guarded(driver, events):
+    return GuardedDriver(driver, deadlines=DEADLINES,
+                         rebuild_session=lambda: events.append("rebuild") or driver,
+                         restart_server=lambda: events.append("restart"))
+
+
+def test_calls_reuse_one_worker_thread():
+    names = [call_with_deadline(lambda: threading.current_thread().name, (), {}, 1) for _ in range(20)]
+    assert len(set(names)) == 1
+
+
+def test_hung_call_abandons_its_worker():
+    release = threading.Event()
+    first = call_with_deadline(threading.current_thread, (), {}, 1)
+    with pytest.raises(CommandTimeout):
+        call_with_deadline(release.wait, (5,), {}, 0.1)
+    assert call_with_deadline(threading.current_thread, (), {}, 1) is not first
+    release.set()
+
+
+def test_errors_are_raised_to_the_caller():
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        call_with_deadline(fail, (), {}, 1)
+
+
+def test_read_timeout_retries_then_restarts_then_rebuilds(fake):
+    events = []
+    driver = guarded(fake, events)
+    fake.hanging = True
+    with pytest.raises(CommandTimeout):
+        driver.find_elements("id", "x")
+    assert events == ["restart", "rebuild"]
+    assert fake.calls == ["find_elements"] * 3
+    assert driver.stats.recoveries == {"retry": 1, "server_restart": 1, "session_rebuild": 1}
+
+
+def test_gesture_timeout_restarts_server_without_rebuilding(fake):
+    events = []
+    driver = guarded(fake, events)
+    fake.hanging = True
+    with pytest.raises(CommandTimeout):
+        driver.swipe(1, 2, 3, 4, 600)
+    assert events == ["restart"]
+    assert fake.calls == ["swipe"]
+
+
+def test_server_restart_that_recovers_resets_the_ladder(fake):
+    events = []
+    driver = guarded(fake, events)
+    fake.hanging = True
+    with pytest.raises(CommandTimeout):
+        driver.swipe(1, 2, 3, 4, 600)
+    fake.hanging = False
+    fake.release.set()
+    assert driver.find_elements("id", "x") == "find_elements"
+
+    fake.release.clear()
+    fake.hanging = True
+    with pytest.raises(CommandTimeout):
+        driver.swipe(1, 2, 3, 4, 600)
+    assert events == ["restart", "restart"]
+
+
+def test_next_failure_after_a_restart_rebuilds(fake):
+    events = []
+    driver = guarded(fake, events)
+    fake.hanging = True
+    for _ in range(2):
+        with pytest.raises(CommandTimeout):
+            driver.swipe(1, 2, 3, 4, 600)
+    assert events == ["restart", "rebuild"]
+
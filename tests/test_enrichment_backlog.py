@@ -0,0 +1,101 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+from enrichment_backlog import (
+    CLAIM_TIMEOUT_MINUTES, MAX_ATTEMPTS, RETRY_BACKOFF_MINUTES, backlog_counts, claim_next, enqueue, mark_done,
+    mark_failed, open_backlog, release_claim,
+)
+
+NOW = datetime(2026, 1, 27, 12, 0)
+
+
+def item(n, position):
+    return {"cache_key": f"key_{n}", "title": f"Car {n}", "live_time": "Tuesday at 4:00 PM",
+            "alert_desc": f"Car {n} is now Live", "list_position": position}
+
+
+def backlog(tmp_path):
+    conn = open_backlog(str(tmp_path / "backlog.db"))
+    enqueue(conn, [item(1, 0), item(2, 1)], "sweep_1")
+    enqueue(conn, [item(3, 0)], "sweep_2")
+    return conn
+
+
+def test_claims_newest_sweep_first_and_once(tmp_path):
+    conn = backlog(tmp_path)
+    assert enqueue(conn, [item(3, 5)], "sweep_3") == 0
+    claimed = [claim_next(conn, "a", now=NOW)["cache_key"] for _ in range(3)]
+    assert claimed == ["key_3", "key_1", "key_2"]
+    assert claim_next(conn, "a", now=NOW) is None
+    for key in claimed:
+        mark_done(conn, key)
+    assert backlog_counts(conn) == {"done": 3}
+
+
+def test_abandoned_claim_is_reclaimed(tmp_path):
+    conn = backlog(tmp_path)
+    assert claim_next(conn, "a", now=NOW)["cache_key"] == "key_3"
+    assert claim_next(conn, "b", now=NOW)["cache_key"] == "key_1"
+    later = NOW + timedelta(minutes=CLAIM_TIMEOUT_MINUTES + 1)
+    row = claim_next(conn, "b", now=later)
+    assert (row["cache_key"], row["claimed_by"], row["attempts"]) == ("key_3", "b", 2)
+
+
+def test_failed_item_backs_off_before_retry(tmp_path):
+    conn = backlog(tmp_path)
+    assert claim_next(conn, "a", now=NOW)["cache_key"] == "key_3"
+    mark_failed(conn, "key_3", "PDP not scraped", now=NOW)
+
+    # Not retried straight away: the older items come first
+    assert claim_next(conn, "a", now=NOW)["cache_key"] == "key_1"
+    retry_at = NOW + timedelta(minutes=RETRY_BACKOFF_MINUTES)
+    assert claim_next(conn, "a", now=retry_at)["cache_key"] == "key_3"
+
+    # The wait doubles with every failure
+    mark_failed(conn, "key_3", "PDP not scraped", now=retry_at)
+    assert claim_next(conn, "a", now=retry_at + timedelta(minutes=2 * RETRY_BACKOFF_MINUTES - 1))["cache_key"] == "key_2"
+    assert claim_next(conn, "a", now=retry_at + timedelta(minutes=2 * RETRY_BACKOFF_MINUTES))["cache_key"] == "key_3"
+
+
+def test_skipped_keys_stay_pending_untried(tmp_path):
+    conn = backlog(tmp_path)
+    row = claim_next(conn, "a", now=NOW, skip={"key_3", "key_1"})
+    assert row["cache_key"] == "key_2"
+    assert claim_next(conn, "a", now=NOW, skip={"key_3", "key_1"}) is None
+    row = conn.execute("SELECT status, attempts FROM enrichment_backlog WHERE cache_key = 'key_3'").fetchone()
+    assert tuple(row) == ("pending", 0)
+
+
+def test_released_claim_does_not_use_an_attempt(tmp_path):
+    conn = backlog(tmp_path)
+    assert claim_next(conn, "a", now=NOW)["cache_key"] == "key_3"
+    release_claim(conn, "key_3")
+    row = claim_next(conn, "a", now=NOW)
+    assert (row["cache_key"], row["attempts"]) == ("key_3", 1)
+
+
+def test_gives_up_after_max_attempts(tmp_path):
+    conn = backlog(tmp_path)
+    now = NOW
+    for _ in range(MAX_ATTEMPTS):
+        row = claim_next(conn, "a", now=now)
+        assert row["cache_key"] == "key_3"
+        mark_failed(conn, "key_3", "not found on list", now=now)
+        now += timedelta(days=1)
+    row = conn.execute("SELECT status, last_error FROM enrichment_backlog WHERE cache_key = 'key_3'").fetchone()
+    assert tuple(row) == ("failed", "not found on list")
+    assert claim_next(conn, "a", now=now)["cache_key"] == "key_1"
+
+
+def test_old_backlog_gets_next_attempt_column(tmp_path):
+    db = str(tmp_path / "backlog.db")
+    old = sqlite3.connect(db)
+    old.execute("CREATE TABLE enrichment_backlog (cache_key TEXT PRIMARY KEY, title TEXT, live_time TEXT, "
+                "alert_desc TEXT, sweep_id TEXT, list_position INTEGER, discovered_at TEXT, "
+                "status TEXT NOT NULL DEFAULT 'pending', claimed_by TEXT, claimed_at TEXT, "
+                "attempts INTEGER NOT NULL DEFAULT 0, last_error TEXT, finished_at TEXT)")
+    old.execute("INSERT INTO enrichment_backlog (cache_key, sweep_id, list_position) VALUES ('key_1', 's', 0)")
+    old.commit()
+    old.close()
+    conn = open_backlog(db)
+    assert claim_next(conn, "a", now=NOW)["next_attempt_at"] is None
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from failure_ledger import (
+    BACKOFF_BASE_MINUTES, BACKOFF_MAX_HOURS, QUARANTINE_AFTER, backoff_delay, blocked_keys, is_blocked,
+    open_ledger, record_failure, record_success, release,
+)
+
+NOW = datetime(2026, 1, 27, 12, 0)
+
+
+def test_unknown_reason_is_rejected(tmp_path):
+    conn = open_ledger(str(tmp_path / "ledger.db"))
+    with pytest.raises(ValueError):
+        record_failure(conn, "key_1", "pdp_timeout")
+    assert not blocked_keys(conn, NOW)
+
+
+def test_backoff_doubles_up_to_the_cap():
+    assert backoff_delay(1) == timedelta(minutes=BACKOFF_BASE_MINUTES)
+    assert backoff_delay(2) == timedelta(minutes=2 * BACKOFF_BASE_MINUTES)
+    assert backoff_delay(20) == timedelta(hours=BACKOFF_MAX_HOURS)
+
+
+def test_blocked_during_backoff_then_retried(tmp_path):
+    conn = open_ledger(str(tmp_path / "ledger.db"))
+    row = record_failure(conn, "key_1", "wrong_pdp", "Car is now Live", now=NOW)
+    assert (row["attempts"], row["last_reason"], row["quarantined"]) == (1, "wrong_pdp", 0)
+    assert is_blocked(conn, "key_1", NOW)
+    assert blocked_keys(conn, NOW) == {"key_1"}
+
+    later = NOW + timedelta(minutes=BACKOFF_BASE_MINUTES + 1)
+    assert not is_blocked(conn, "key_1", later)
+    assert not is_blocked(conn, "key_2", NOW)
+
+
+def test_quarantined_until_released(tmp_path):
+    conn = open_ledger(str(tmp_path / "ledger.db"))
+    for n in range(QUARANTINE_AFTER):
+        row = record_failure(conn, "key_1", "blink" if n % 2 else "pdp_not_loaded", now=NOW + timedelta(days=n))
+    assert row["quarantined"] == 1
+    assert is_blocked(conn, "key_1", NOW + timedelta(days=365))
+
+    assert release(conn, ["key_1"]) == 1
+    assert not is_blocked(conn, "key_1", NOW)
+
+
+def test_success_clears_the_entry(tmp_path):
+    conn = open_ledger(str(tmp_path / "ledger.db"))
+    record_failure(conn, "key_1", "scrape_error", now=NOW)
+    record_success(conn, "key_1")
+    assert not blocked_keys(conn, NOW)
+    assert record_failure(conn, "key_1", "scrape_error", now=NOW)["attempts"] == 1
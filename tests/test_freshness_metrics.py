@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta, timezone
+
+from freshness_metrics import compute_metrics, open_metrics, record_persisted
+from listing_parsing import resolve_live_time
+
+GST = timezone(timedelta(hours=4))
+IST = timezone(timedelta(hours=5, minutes=30))
+
+
+def test_resolves_to_the_latest_past_occurrence():
+    reference = datetime(2026, 1, 27, 16, 30, tzinfo=GST)  # a Tuesday
+    assert resolve_live_time("Tuesday at 4:00 PM", reference) == datetime(2026, 1, 27, 16, 0, tzinfo=GST)
+    assert resolve_live_time("Monday at 11:59 PM", reference) == datetime(2026, 1, 26, 23, 59, tzinfo=GST)
+    assert resolve_live_time("Wednesday at 9:00 AM", reference) == datetime(2026, 1, 21, 9, 0, tzinfo=GST)
+    assert resolve_live_time("not a time", reference) is None
+
+
+def test_near_future_live_time_is_not_wrapped_to_last_week():
+    reference = datetime(2026, 1, 27, 16, 0, tzinfo=GST)
+    assert resolve_live_time("Tuesday at 4:03 PM", reference) == datetime(2026, 1, 27, 16, 3, tzinfo=GST)
+    assert resolve_live_time("Tuesday at 5:30 PM", reference) == datetime(2026, 1, 27, 17, 30, tzinfo=GST)
+    # Across midnight: a Monday 12:02 AM alert seen at 11:58 PM on Sunday is minutes ahead, not 7 days back
+    reference = datetime(2026, 1, 25, 23, 58, tzinfo=GST)  # Sunday
+    assert resolve_live_time("Monday at 12:02 AM", reference) == datetime(2026, 1, 26, 0, 2, tzinfo=GST)
+
+
+def listing(n, live_time, scraped_at):
+    return {"cache_key": f"key_{n}", "live_time": live_time, "scraped_at": scraped_at}
+
+
+def test_lags_with_the_right_timezone(tmp_path):
+    conn = open_metrics(str(tmp_path / "metrics.db"))
+    scraped_at = datetime(2026, 1, 27, 10, 45)  # UTC = 4:15 PM IST
+    lags = record_persisted(conn, [listing(1, "Tuesday at 4:00 PM", scraped_at)], IST,
+                            persisted_at=scraped_at + timedelta(minutes=1))
+    assert lags == [16 * 60]
+
+
+def test_wrong_timezone_lags_are_unresolved_not_a_week(tmp_path):
+    conn = open_metrics(str(tmp_path / "metrics.db"))
+    scraped_at = datetime(2026, 1, 27, 10, 45)
+    listings = [
+        listing(1, "Tuesday at 4:00 PM", scraped_at),   # 1h15 after the scrape on a UTC+4 clock
+        listing(2, "Tuesday at 2:40 PM", scraped_at),   # 5 min before it: resolves fine
+        listing(3, "Sunday at 2:40 PM", scraped_at),    # two days back: not a real lag
+    ]
+    lags = record_persisted(conn, listings, GST, persisted_at=scraped_at)
+    assert lags == [5 * 60]
+
+    metrics = compute_metrics(conn, now=scraped_at + timedelta(minutes=1))
+    assert metrics["listings_persisted"] == 3
+    assert metrics["lag_unresolved"] == 2
+    assert metrics["lag_max_seconds"] == 5 * 60
+
+
+def test_small_clock_skew_clamps_to_zero(tmp_path):
+    conn = open_metrics(str(tmp_path / "metrics.db"))
+    scraped_at = datetime(2026, 1, 27, 12, 0)  # 4:00 PM GST
+    lags = record_persisted(conn, [listing(1, "Tuesday at 4:02 PM", scraped_at)], GST, persisted_at=scraped_at)
+    assert lags == [0.0]
@@ -0,0 +1,104 @@
+from latency_model import LATENCY_MIN_SAMPLES, LatencyModel
+
+DEFAULTS = {"refresh": 6.0, "pdp_render": 5.0}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def wait(model, action, condition, **kwargs):
+    clock = FakeClock()
+    return model.wait_for(action, condition, clock=clock, sleep=clock.sleep, **kwargs), clock.now
+
+
+def test_defaults_until_enough_samples():
+    model = LatencyModel(DEFAULTS)
+    for _ in range(LATENCY_MIN_SAMPLES - 1):
+        model.record("refresh", 1.0)
+    assert model.deadline("refresh") == 6.0
+    assert model.expected("refresh") == 6.0
+    model.record("refresh", 1.0)
+    assert model.deadline("refresh") == 1.5
+    assert model.expected("refresh") == 1.0
+
+
+def test_deadline_capped_at_three_times_default():
+    model = LatencyModel(DEFAULTS, {"refresh": [100.0] * 10})
+    assert model.deadline("refresh") == 18.0
+
+
+def test_success_records_elapsed_time():
+    model = LatencyModel(DEFAULTS)
+    polls = iter([False, False, True])
+    done, _ = wait(model, "pdp_render", lambda: next(polls))
+    assert done
+    assert model.samples["pdp_render"] == [1.0]  # two sleeps at the default interval (5 / 2 / 5 = 0.5s)
+
+
+def test_condition_errors_count_as_not_done():
+    model = LatencyModel(DEFAULTS)
+
+    def flaky():
+        raise RuntimeError("stale element")
+
+    done, _ = wait(model, "pdp_render", flaky, censor_on_timeout=False)
+    assert not done
+
+
+def test_timeout_records_censored_sample():
+    model = LatencyModel(DEFAULTS)
+    done, _ = wait(model, "pdp_render", lambda: False)
+    assert not done
+    assert model.samples["pdp_render"] == [5.0]
+
+
+def test_timeout_without_censoring_records_nothing():
+    model = LatencyModel(DEFAULTS)
+    done, _ = wait(model, "refresh", lambda: False, censor_on_timeout=False)
+    assert not done
+    assert "refresh" not in model.samples
+
+
+def test_censored_timeouts_ratchet_the_deadline():
+    # Why idle waits must not censor: repeated timeouts climb to the cap
+    model = LatencyModel(DEFAULTS, {"refresh": [1.0] * LATENCY_MIN_SAMPLES})
+    for _ in range(20):
+        wait(model, "refresh", lambda: False)
+    assert model.deadline("refresh") == 18.0
+
+
+def test_idle_refresh_leaves_deadline_unchanged():
+    # Hot-top mode: most refreshes bring nothing new and time out
+    model = LatencyModel(DEFAULTS, {"refresh": [1.2, 1.0, 1.4, 1.1, 1.3]})
+    before = model.deadline("refresh")
+    for _ in range(50):
+        done, waited = wait(model, "refresh", lambda: False, censor_on_timeout=False)
+        assert not done
+        assert waited <= before
+    assert model.deadline("refresh") == before
+    assert model.expected("refresh") == 1.2
+
+
+def test_spinner_finishing_records_real_refresh_time():
+    model = LatencyModel(DEFAULTS)
+    spinner = iter([True, True, True, False])
+    seen = {"spinner": False}
+
+    def refresh_finished():
+        if next(spinner):
+            seen["spinner"] = True
+            return False
+        return seen["spinner"]
+
+    done, waited = wait(model, "refresh", refresh_finished, censor_on_timeout=False)
+    assert done
+    assert model.samples["refresh"] == [round(waited, 3)]
+    assert waited < DEFAULTS["refresh"]
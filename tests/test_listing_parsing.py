@@ -0,0 +1,69 @@
+from listing_parsing import merge_snapshot, normalize_countdowns, parse_alert_event, parse_alert_events
+
+
+def merge(merged, previous, snapshot):
+    merged = list(merged)
+    return merge_snapshot(merged, previous, snapshot), merged
+
+
+def test_scroll_appends_only_new_texts():
+    first = ["Title", "AED 10,000", "Mileage", "56,766 km", "Specs"]
+    added, merged = merge(first, first, ["56,766 km", "Specs", "GCC", "Transmission", "Automatic"])
+    assert added == 3
+    assert merged == first + ["GCC", "Transmission", "Automatic"]
+
+
+def test_unmoved_page_adds_nothing():
+    first = ["Title", "Mileage", "56,766 km"]
+    assert merge(first, first, list(first)) == (0, first)
+
+
+def test_sticky_header_and_footer_are_skipped():
+    # The footer is dropped from the merged texts too: a bar, not page content
+    first = ["Back", "Title", "Mileage", "56,766 km", "Place bid"]
+    added, merged = merge(first, first, ["Back", "56,766 km", "Specs", "GCC", "Place bid"])
+    assert added == 2
+    assert merged == ["Back", "Title", "Mileage", "56,766 km", "Specs", "GCC"]
+
+
+def test_ticking_countdown_is_not_new_content():
+    first = ["Title", "Ends in", "2h 10m 5s", "Mileage"]
+    added, merged = merge(first, first, ["Title", "Ends in", "2h 10m 3s", "Mileage"])
+    assert added == 0
+    assert merged == first
+
+
+def test_countdown_ticking_during_a_scroll_still_overlaps():
+    first = ["Title", "Ends in", "2h 10m 5s", "X", "Y"]
+    added, merged = merge(first, first, ["2h 10m 3s", "X", "Y", "Z", "W"])
+    assert added == 2
+    assert merged == first + ["Z", "W"]
+
+
+def test_ticking_countdown_in_a_sticky_bar():
+    first = ["Title", "Mileage", "56,766 km", "Ends in 0h 59m 59s"]
+    added, merged = merge(first, first, ["56,766 km", "Specs", "GCC", "Ends in 0h 59m 57s"])
+    assert added == 2
+    assert merged == ["Title", "Mileage", "56,766 km", "Specs", "GCC"]
+
+
+def test_normalize_countdowns_leaves_other_numbers_alone():
+    texts = ["1d 2h", "05m 03s", "Ends in 3h 2m", "56,766 km", "4 doors", "2019", None]
+    assert normalize_countdowns(texts) == ["#", "#", "Ends in #", "56,766 km", "4 doors", "2019", None]
+
+
+def test_alert_events_are_typed_with_title_and_amount():
+    live = parse_alert_event("2019 Lincoln MKZ is now Live Tuesday at 4:00 PM")
+    assert (live["type"], live["title"], live["live_time"]) == ("live", "2019 Lincoln MKZ", "Tuesday at 4:00 PM")
+
+    outbid = parse_alert_event("You have been outbid on 2020 Toyota Corolla. Current bid AED 49,050")
+    assert (outbid["type"], outbid["title"], outbid["amount"]) == ("outbid", "2020 Toyota Corolla", 49050)
+
+    assert parse_alert_event("2018 Nissan Patrol auction has ended")["type"] == "auction_ended"
+    assert parse_alert_event("Auction for 2018 Nissan Patrol ends in 10 minutes")["title"] == "2018 Nissan Patrol"
+    assert parse_alert_event("2017 BMW X5 price has been reduced to AED 80,000")["amount"] == 80000
+    assert parse_alert_event("2021 Kia Rio has a new highest bid")["type"] == "bid_update"
+
+    unknown = parse_alert_event("Welcome to the dealer app")
+    assert (unknown["type"], unknown["title"], unknown["amount"]) == ("unknown", None, None)
+    assert len(parse_alert_events(["2021 Kia Rio has a new bid", None, ""])) == 1
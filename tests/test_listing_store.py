@@ -0,0 +1,132 @@
+import csv
+import threading
+
+from listing_store import (
+    EVENT_OWNED_COLUMNS, LISTING_COLUMNS, apply_alert_events, current_seq, listings_since, open_store,
+    sync_from_csv, upsert_listings,
+)
+
+
+def listing(n, **fields):
+    row = {
+        "title": f"2020 Toyota Corolla {n}", "live_time": "Tuesday at 4:00 PM",
+        "cache_key": f"key_{n}", "current_bid": "AED 10,000", "location": "Dubai",
+    }
+    row.update(fields)
+    return row
+
+
+def test_seq_only_moves_for_inserted_or_changed_rows(tmp_path):
+    conn = open_store(str(tmp_path / "store.db"))
+    assert upsert_listings(conn, [listing(1), listing(2)]) == 2
+    assert current_seq(conn) == 2
+
+    assert upsert_listings(conn, [listing(1), listing(2)]) == 0
+    assert current_seq(conn) == 2
+
+    assert upsert_listings(conn, [listing(1, current_bid="AED 12,000")]) == 1
+    assert current_seq(conn) == 3
+    rows, next_cursor, has_more = listings_since(conn, 2)
+    assert [r["cache_key"] for r in rows] == ["key_1"]
+    assert next_cursor == 3
+    assert not has_more
+
+
+def test_aggregates_follow_updates(tmp_path):
+    conn = open_store(str(tmp_path / "store.db"))
+    upsert_listings(conn, [listing(1), listing(2, location="Sharjah")])
+    upsert_listings(conn, [listing(2, location="Dubai")])
+    row = conn.execute("SELECT listing_count FROM aggregates WHERE dimension = 'location' AND key = 'Dubai'").fetchone()
+    assert row[0] == 2
+    row = conn.execute("SELECT listing_count FROM aggregates WHERE dimension = 'location' AND key = 'Sharjah'").fetchone()
+    assert row[0] == 0
+
+
+def test_concurrent_writers_get_distinct_seqs(tmp_path):
+    db = str(tmp_path / "store.db")
+    open_store(db).close()
+    errors = []
+
+    def writer(offset):
+        conn = open_store(db)
+        try:
+            for i in range(30):
+                upsert_listings(conn, [listing(offset + i)])
+        except Exception as e:
+            errors.append(e)
+        finally:
+            conn.close()
+
+    threads = [threading.Thread(target=writer, args=(offset,)) for offset in (0, 1000, 2000, 3000)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    conn = open_store(db)
+    seqs = [r[0] for r in conn.execute("SELECT seq FROM listings ORDER BY seq")]
+    assert seqs == list(range(1, 121))
+
+
+def outbid(n, amount):
+    return {"type": "outbid", "amount": amount, "alert_desc": f"You have been outbid on car {n} ({amount})",
+            "title": f"2020 Toyota Corolla {n}", "live_time": None}
+
+
+def test_stale_rescrape_keeps_event_owned_columns(tmp_path):
+    conn = open_store(str(tmp_path / "store.db"))
+    upsert_listings(conn, [listing(1)])
+    assert apply_alert_events(conn, [outbid(1, 15000)]) == 1
+    seq = current_seq(conn)
+
+    # The flush after the event still carries the bid seen on the PDP
+    assert upsert_listings(conn, [listing(1)], preserve=EVENT_OWNED_COLUMNS) == 0
+    assert current_seq(conn) == seq
+    row = conn.execute("SELECT current_bid, current_bid_aed FROM listings WHERE cache_key = 'key_1'").fetchone()
+    assert tuple(row) == ("AED 15,000", 15000)
+
+    # Other columns still update, and new listings take their bid from the scrape
+    assert upsert_listings(conn, [listing(1, location="Sharjah"), listing(2)], preserve=EVENT_OWNED_COLUMNS) == 2
+    rows = {r["cache_key"]: r for r in conn.execute("SELECT * FROM listings")}
+    assert rows["key_1"]["location"] == "Sharjah"
+    assert rows["key_1"]["current_bid"] == "AED 15,000"
+    assert rows["key_2"]["current_bid"] == "AED 10,000"
+
+
+def test_csv_sync_does_not_revert_events(tmp_path):
+    csv_filename = str(tmp_path / "cache.csv")
+    with open(csv_filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=LISTING_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows([listing(1), listing(2)])
+
+    conn = open_store(str(tmp_path / "store.db"))
+    assert sync_from_csv(conn, csv_filename) == 2
+    apply_alert_events(conn, [outbid(2, 20000)])
+    seq = current_seq(conn)
+
+    assert sync_from_csv(conn, csv_filename) == 0
+    assert current_seq(conn) == seq
+    assert conn.execute("SELECT current_bid FROM listings WHERE cache_key = 'key_2'").fetchone()[0] == "AED 20,000"
+
+
+def test_resync_keeps_price_update_events(tmp_path):
+    csv_filename = str(tmp_path / "cache.csv")
+    with open(csv_filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=LISTING_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerow(listing(1, seller_expectation="AED 97,520"))
+
+    conn = open_store(str(tmp_path / "store.db"))
+    sync_from_csv(conn, csv_filename)
+    event = {"type": "price_update", "amount": 12345, "alert_desc": "2020 Toyota Corolla 1 price has been reduced",
+             "title": "2020 Toyota Corolla 1", "live_time": None}
+    assert apply_alert_events(conn, [event]) == 1
+    seq = current_seq(conn)
+
+    assert sync_from_csv(conn, csv_filename) == 0
+    assert upsert_listings(conn, [listing(1, seller_expectation="AED 97,520")], preserve=EVENT_OWNED_COLUMNS) == 0
+    assert current_seq(conn) == seq
+    row = conn.execute("SELECT seller_expectation, seller_expectation_aed FROM listings").fetchone()
+    assert tuple(row) == ("AED 12,345", 12345)
@@ -0,0 +1,23 @@
+from listing_store import EVENT_OWNED_COLUMNS, open_store, upsert_listings
+from pdp_archive import REEXTRACT_DEFAULT_FIELDS, archive_snapshot, open_archive, reextract
+
+TEXTS = ["2020 Toyota Corolla", "Ref 1234", "Sharjah", "AED 97,520", "Seller Expectation"]
+
+
+def test_defaults_leave_event_owned_columns_alone():
+    assert not set(REEXTRACT_DEFAULT_FIELDS) & set(EVENT_OWNED_COLUMNS)
+
+
+def test_reextract_keeps_event_updated_expectation(tmp_path):
+    db = str(tmp_path / "store.db")
+    store = open_store(db)
+    upsert_listings(store, [{"title": "2020 Toyota Corolla", "cache_key": "key_1", "location": None,
+                             "seller_expectation": "AED 12,345", "live_time": "Tuesday at 4:00 PM"}])
+    conn, blobs = open_archive(db, str(tmp_path / "archive"))
+    archive_snapshot(conn, blobs, "key_1", TEXTS, "Tuesday at 4:00 PM", "2026-01-27T12:00:00")
+
+    parsed, changed, field_changes = reextract(conn, store, blobs, workers=1)
+    assert (parsed, changed) == (1, 1)
+    assert field_changes["location"] == 1
+    row = store.execute("SELECT location, seller_expectation FROM listings").fetchone()
+    assert tuple(row) == ("Sharjah", "AED 12,345")
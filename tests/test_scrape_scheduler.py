@@ -0,0 +1,34 @@
+from datetime import timedelta, timezone
+
+from scrape_scheduler import burst_threshold, build_arrival_model, live_time_to_week_minute, load_history
+
+
+def test_week_minute_from_live_time():
+    assert live_time_to_week_minute("Monday at 12:05 AM") == 5
+    assert live_time_to_week_minute("Tuesday at 4:00 PM") == 1440 + 16 * 60
+    assert live_time_to_week_minute("not a time") is None
+
+
+def test_burst_threshold_follows_median_occupied_rate():
+    rates = [0, 1, 1, 2, 3, 0, 8]
+    assert burst_threshold(rates, 1.0) == 2
+    assert burst_threshold(rates, 2.0) == 4
+    assert burst_threshold([0, 0], 1.0) == float("inf")
+
+
+def test_weeks_counted_on_the_local_clock(tmp_path):
+    # Sunday 11:30 PM local (UTC+4) is Sunday 19:30 UTC - same ISO week either way,
+    # but Monday 1:00 AM local is still Sunday in UTC: it must count as the next week
+    csv_path = tmp_path / "history.csv"
+    csv_path.write_text(
+        "title,live_time,scraped_at\n"
+        "A,Sunday at 11:30 PM,2026-02-01 19:40:00\n"
+        "B,Monday at 1:00 AM,2026-02-01 21:10:00\n",
+        encoding="utf-8",
+    )
+    arrivals, scraped, weeks = load_history(str(csv_path), timezone(timedelta(hours=4)))
+    assert len(arrivals) == 2
+    assert len(weeks) == 2
+    rates, n_weeks = build_arrival_model(arrivals, weeks, 15)
+    assert n_weeks == 2
+    assert sum(rates) == 1.0
@@ -0,0 +1,135 @@
+import json
+import os
+
+from adb_backend import BY_CLASS_NAME, AdbDriver
+from session_recorder import SessionRecorder, export_session
+
+FAKE_ADB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks", "fake_adb.py")
+
+ALERTS = '<hierarchy><node content-desc="Alerts" /><node content-desc="Car is now Live" /></hierarchy>'
+PDP = '<hierarchy><node text="Ref 1234" /></hierarchy>'
+
+
+class FakeDriver:
+    def __init__(self):
+        self.screens = [ALERTS, PDP]
+        self.index = 0
+        self.dumps = 0
+
+    @property
+    def page_source(self):
+        self.dumps += 1
+        return self.screens[self.index]
+
+    def find_elements(self, by, value):
+        return []
+
+    def back(self):
+        self.index = (self.index + 1) % len(self.screens)
+
+    def swipe(self, *args):
+        raise RuntimeError("gesture failed")
+
+    def quit(self):
+        pass
+
+
+def events(recorder):
+    with open(recorder.log_path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_polling_an_unchanged_screen_captures_once(tmp_path):
+    fake = FakeDriver()
+    recorder = SessionRecorder(fake, directory=str(tmp_path), session_id="s1")
+    for _ in range(10):
+        recorder.find_elements("id", "x")
+    assert fake.dumps == 1
+
+    recorder.back()
+    recorder.find_elements("id", "x")
+    recorder.find_elements("id", "x")
+    assert fake.dumps == 2
+    assert [e["label"] for e in events(recorder) if "screen" in e] == ["alerts_list", "pdp"]
+
+
+def test_failed_gesture_does_not_trigger_a_capture(tmp_path):
+    fake = FakeDriver()
+    recorder = SessionRecorder(fake, directory=str(tmp_path), session_id="s1")
+    recorder.find_elements("id", "x")
+    try:
+        recorder.swipe(1, 2, 3, 4, 600)
+    except RuntimeError:
+        pass
+    recorder.find_elements("id", "x")
+    assert fake.dumps == 1
+    swipe = [e for e in events(recorder) if e.get("cmd") == "swipe"]
+    assert swipe[0]["error"] == "RuntimeError"
+
+
+def test_log_is_readable_before_quit(tmp_path):
+    recorder = SessionRecorder(FakeDriver(), directory=str(tmp_path), session_id="s1")
+    recorder.find_elements("id", "x")
+    logged = events(recorder)
+    assert logged[0]["session"] == "s1"
+    assert [e.get("cmd") for e in logged if "cmd" in e] == ["find_elements"]
+
+
+def screen(*texts):
+    nodes = "".join(f'<node class="android.widget.TextView" bounds="[0,{i * 100}][720,{i * 100 + 100}]" '
+                    f'text="{text}" content-desc="" />' for i, text in enumerate(texts))
+    return f'<hierarchy rotation="0"><node class="android.widget.FrameLayout" bounds="[0,0][720,1600]">{nodes}</node></hierarchy>'
+
+
+class ListDriver(FakeDriver):
+    """Alerts list whose end-of-list swipe changes nothing; a click opens the PDP"""
+
+    def __init__(self):
+        super().__init__()
+        self.screens = [screen("Car A", "Car B"), screen("Ref 1234")]
+
+    def swipe(self, *args):
+        pass
+
+    def click(self):
+        self.index = 1
+
+
+def texts(driver):
+    return [e.text for e in driver.find_elements(BY_CLASS_NAME, "android.widget.TextView")]
+
+
+def test_noop_swipe_is_a_replay_step(tmp_path, monkeypatch):
+    recorder = SessionRecorder(ListDriver(), directory=str(tmp_path), session_id="s1")
+    recorder.find_elements("id", "x")
+    recorder.swipe(360, 1200, 360, 400, 600)
+    recorder.find_elements("id", "x")
+    recorder.click()
+    recorder.find_elements("id", "x")
+    recorder.quit()
+
+    corpus = tmp_path / "corpus"
+    assert export_session(str(tmp_path), "s1", str(corpus)) == 3
+
+    monkeypatch.setenv("FAKE_ADB_DUMPS", str(corpus))
+    adb = AdbDriver(adb_path=FAKE_ADB)
+    recorded = [texts(adb)]
+    adb.swipe(360, 1200, 360, 400, 600)
+    recorded.append(texts(adb))
+    adb.tap_point(360, 50)
+    recorded.append(texts(adb))
+    assert recorded == [["Car A", "Car B"], ["Car A", "Car B"], ["Ref 1234"]]
+
+
+def test_screen_changing_without_input_updates_the_step(tmp_path):
+    fake = FakeDriver()
+    recorder = SessionRecorder(fake, directory=str(tmp_path), session_id="s1")
+    recorder.find_elements("id", "x")
+    fake.index = 1                      # loading finished by itself
+    recorder.mark("wrong_pdp")
+    recorder.quit()
+
+    assert export_session(str(tmp_path), "s1", str(tmp_path / "corpus")) == 1
+    manifest = json.loads((tmp_path / "corpus" / "manifest.json").read_text(encoding="utf-8"))
+    assert [step["label"] for step in manifest["steps"]] == ["wrong_pdp"]
+    assert (tmp_path / "corpus" / "000.xml").read_text(encoding="utf-8") == PDP
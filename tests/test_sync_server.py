@@ -0,0 +1,86 @@
+import gzip
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from listing_store import open_store, upsert_listings
+from sync_server import SyncHandler
+
+from test_listing_store import listing
+
+
+@pytest.fixture
+def server(tmp_path):
+    db = str(tmp_path / "store.db")
+    open_store(db).close()
+    handler = type("Handler", (SyncHandler,), {"db_filename": db, "log_message": lambda self, *args: None})
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield db, f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get(url, **headers):
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def add(db, listings):
+    conn = open_store(db)
+    upsert_listings(conn, listings)
+    conn.close()
+
+
+def test_unchanged_store_answers_304(server):
+    db, base = server
+    add(db, [listing(1), listing(2)])
+    status, headers, body = get(f"{base}/listings?since=0&limit=10")
+    assert status == 200
+    page = json.loads(body)
+    assert [r["cache_key"] for r in page["listings"]] == ["key_1", "key_2"]
+    assert (page["next_cursor"], page["has_more"]) == (2, False)
+
+    etag = headers["ETag"]
+    status, headers, body = get(f"{base}/listings?since=0&limit=10", **{"If-None-Match": etag})
+    assert (status, headers["ETag"], body) == (304, etag, b"")
+
+
+def test_new_listing_changes_the_etag(server):
+    db, base = server
+    add(db, [listing(1)])
+    _, headers, _ = get(f"{base}/listings?since=1")
+    etag = headers["ETag"]
+
+    add(db, [listing(2)])
+    status, headers, body = get(f"{base}/listings?since=1", **{"If-None-Match": etag})
+    assert status == 200
+    assert headers["ETag"] != etag
+    assert [r["cache_key"] for r in json.loads(body)["listings"]] == ["key_2"]
+
+
+def test_large_pages_are_gzipped_on_request(server):
+    db, base = server
+    add(db, [listing(n) for n in range(20)])
+    status, headers, body = get(f"{base}/listings?since=0&limit=5", **{"Accept-Encoding": "gzip"})
+    assert headers["Content-Encoding"] == "gzip"
+    page = json.loads(gzip.decompress(body))
+    assert (len(page["listings"]), page["next_cursor"], page["has_more"]) == (5, 5, True)
+
+    _, headers, body = get(f"{base}/listings?since=20", **{"Accept-Encoding": "gzip"})
+    assert headers["Content-Encoding"] is None
+    assert json.loads(body)["listings"] == []
+
+
+def test_bad_parameters(server):
+    _, base = server
+    assert get(f"{base}/listings?since=x")[0] == 400
+    assert get(f"{base}/listings?limit=0")[0] == 400
+    assert get(f"{base}/nope")[0] == 404